@@ -0,0 +1,218 @@
+"""Workers and handler time per mouse move while dragging songs in dragging.py.
+
+Three songs are selected, then dragged from the playlist onto the recipient
+`--drags` times, in `--steps` moves each, posted as raw events at `--rate` per
+second like a terminal would report them. Each mode is timed until everything
+settled:
+
+    before   the app as it was, a worker per move that queries for the popup
+             and may mount it, and hit-tests on every press
+    after    the playlist in a DragController, which captures the mouse on
+             press, mounts its ghost once and moves it at most once a frame
+
+"workers" counts the workers started, "mounts" the widgets mounted and
+"handler ms" the time inside message dispatch, as in suite.py. "layouts"
+counts `Screen._refresh_layout` calls and "layout ms" their time, which runs
+on the screen's update timer rather than in a handler. "dropped" is what the
+recipient shows once all is done.
+
+Handler ms per move barely moves between the modes. Of its ~1.8-2 ms, the
+DragController's own handling is ~0.15 ms. The rest is Textual routing each
+raw move before any handler sees it, which both modes pay: the screen renders
+the line under the pointer to find the style there (~0.45 ms), hit-tests it
+for hover (~0.2 ms), and dispatches Enter, Leave and MouseMove through the
+widgets the pointer crosses and to the SelectionList holding the mouse. The
+ghost still lays the screen out once a frame, as the popup did, so layouts
+barely move either.
+
+Run from the repository root:
+    python -m benchmarks.dragging
+    python -m benchmarks.dragging --drags 50 --rate 500
+"""
+
+import asyncio
+import contextlib
+import time
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+
+from textual import events, on, work
+from textual.app import App
+from textual.css.query import NoMatches
+from textual.message import Message
+from textual.message_pump import MessagePump
+from textual.screen import Screen
+from textual.widget import AwaitMount, Widget
+from textual.widgets import SelectionList, Static
+from textual.worker import Worker
+from textual.worker_manager import WorkerManager
+
+from benchmarks.gestures import Storm
+from benchmarks.suite import ROOT, settle
+from patching import Patches
+from restyle.analyzer import load_module
+
+dragging = load_module(ROOT / "dragging.py")
+_dispatch_depth: ContextVar[int] = ContextVar("_dispatch_depth", default=0)
+
+
+class Before(dragging.Application):
+    CSS = """
+    #popup {
+        layer: overlay;
+        width: auto;
+        border: round $accent
+    }
+    """
+
+    was_mouse_down_on_playlist: bool = False
+
+    async def on_mount(self) -> None:
+        # the playlist straight in the row again, out of the DragController
+        controller = self.query_one(dragging.DragController)
+        options = self.query_one("#playlist", SelectionList).options
+        await controller.remove()
+        await self.query_one("#root").mount(
+            SelectionList(*options, id="playlist"), before=0
+        )
+
+    @on(events.MouseDown)
+    def on_mouse_down_on_playlist(self, event: events.MouseDown) -> None:
+        if (
+            (self.screen.get_widget_at(event.screen_x, event.screen_y)[0]).id
+            == "playlist"
+        ):
+            self.was_mouse_down_on_playlist = True
+
+    @on(events.MouseUp)
+    @work
+    async def on_mouse_up_on_anything(self, event: events.MouseUp) -> None:
+        self.was_mouse_down_on_playlist = False
+        with contextlib.suppress(NoMatches):
+            await self.query_one("#popup", Static).remove()
+        self.call_after_refresh(self.handle_drop, event)
+
+    def handle_drop(self, event: events.MouseUp) -> None:
+        if (
+            self.screen.get_widget_at(event.screen_x, event.screen_y)[0].id
+            == "recipient"
+        ):
+            self.query_one("#recipient > Static", Static).update(
+                f"{len(self.query_one('#playlist', SelectionList).selected)} songs",
+            )
+
+    @on(events.MouseMove)
+    @work
+    async def on_mouse_move(self, event: events.MouseMove) -> None:
+        if self.was_mouse_down_on_playlist:
+            if not self.query("#popup"):
+                playlist = self.query_one("#playlist", SelectionList)
+                if len(songs := playlist.selected) < 1:
+                    return
+                await self.mount(popup := Static(f"{len(songs)} songs", id="popup"))
+                self.songs_to_drop = songs
+            else:
+                popup = self.query_one("#popup", Static)
+            popup.offset = (event.screen_x, event.screen_y)
+
+
+MODES: dict[str, type[App]] = {"before": Before, "after": dragging.Application}
+
+
+async def measure(mode: str, drags: int, steps: int, rate: int) -> None:
+    app = MODES[mode]()
+    workers = mounts = layouts = 0
+    handler = layout = 0.0
+
+    def counted_new_worker(
+        new_worker: Callable[..., Worker], manager: WorkerManager, *args, **kwargs
+    ) -> Worker:
+        nonlocal workers
+        workers += 1
+        return new_worker(manager, *args, **kwargs)
+
+    def counted_mount(
+        mount: Callable[..., AwaitMount], widget: Widget, *widgets: Widget, **kwargs
+    ) -> AwaitMount:
+        nonlocal mounts
+        mounts += len(widgets)
+        return mount(widget, *widgets, **kwargs)
+
+    def timed_refresh_layout(
+        refresh_layout: Callable[..., None], screen: Screen, *args, **kwargs
+    ) -> None:
+        nonlocal layouts, layout
+        start = time.perf_counter()
+        refresh_layout(screen, *args, **kwargs)
+        layouts += 1
+        layout += time.perf_counter() - start
+
+    async def timed_dispatch(
+        dispatch_message: Callable[..., Awaitable[None]],
+        pump: MessagePump,
+        message: Message,
+    ) -> None:
+        nonlocal handler
+        depth = _dispatch_depth.get()
+        token = _dispatch_depth.set(depth + 1)
+        start = time.perf_counter()
+        try:
+            await dispatch_message(pump, message)
+        finally:
+            _dispatch_depth.reset(token)
+            if not depth:
+                handler += time.perf_counter() - start
+
+    patches = Patches(
+        (WorkerManager, "_new_worker", counted_new_worker),
+        (Widget, "mount", counted_mount),
+        (MessagePump, "_dispatch_message", timed_dispatch),
+        (Screen, "_refresh_layout", timed_refresh_layout),
+    )
+    try:
+        async with app.run_test(size=(120, 40)) as pilot:
+            await settle(pilot)
+            await pilot.pause(0.2)
+            storm = Storm(app, rate)
+            playlist = app.query_one("#playlist").scrollable_content_region
+            for row in range(3):
+                await storm.click(playlist.x + 1, playlist.y + row)
+            await settle(pilot)
+            start = (playlist.x + 1, playlist.y)
+            end = tuple(app.query_one("#recipient").region.center)
+            patches.start()
+            for _ in range(drags):
+                await storm.drag(start, end, steps)
+            await settle(pilot)
+            await pilot.pause(0.2)
+            moves = drags * steps
+            dropped = str(app.query_one("#recipient > Static", Static).render())
+            print(
+                f"{mode:<7} {moves:>6} {workers:>8} {mounts:>7}"
+                f" {handler * 1000:>11.1f} {handler * 1000 / moves:>8.3f}"
+                f" {layouts:>8} {layout * 1000:>10.1f}  {dropped}"
+            )
+    finally:
+        patches.stop()
+
+
+async def main(drags: int, steps: int, rate: int) -> None:
+    print(
+        f"{'mode':<7} {'moves':>6} {'workers':>8} {'mounts':>7}"
+        f" {'handler ms':>11} {'ms/move':>8} {'layouts':>8} {'layout ms':>10}  dropped"
+    )
+    for mode in MODES:
+        await measure(mode, drags, steps, rate)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Drag and drop handler cost")
+    parser.add_argument("--drags", type=int, default=20, help="Drags to make")
+    parser.add_argument("--steps", type=int, default=48, help="Moves per drag")
+    parser.add_argument(
+        "--rate", type=int, default=100, help="Raw events posted per second"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.drags, args.steps, args.rate))
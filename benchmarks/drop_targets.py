@@ -0,0 +1,225 @@
+"""Finding the drop target under the mouse on a board with hundreds of them.
+
+A kanban board of 8 columns, each scrolling through `--cards` cards, has every
+card and column registered as a drop target. For every screen cell, the
+target under it is looked up, before and after scrolling the columns:
+
+    hit-test   `get_widget_at`, then up its ancestors to the first target,
+               as dragging.py did for its single recipient
+    index      `DropTargets.target_at`, after one warm-up lookup
+
+"build ms" is what the index took to build for the board, and "µs/lookup"
+the mean over every cell. "mismatches" counts the cells where the two
+disagree, which also checks that scrolling invalidates the index.
+
+Then a card is dragged zigzagging across the board, `--rate` raw events a
+second, with the index invalidated in one of two ways:
+
+    every layout   whenever the screen is laid out, which moving the ghost
+                   does every frame
+    geometry       when targets are resized, shown or hidden, their
+                   containers scroll or the app is resized, as DragController
+                   does
+
+"flush µs" is the mean time of `DragController.flush_move`, which moves the
+ghost, looks up the target and posts messages, once a frame at most. The
+run also reports how many of each message the targets got, and how often the
+index was rebuilt.
+
+Run from the repository root:
+    python -m benchmarks.drop_targets
+    python -m benchmarks.drop_targets --cards 10 100 1000
+"""
+
+import asyncio
+import time
+from collections import Counter
+from collections.abc import Callable
+
+from textual import events
+from textual.app import App, ComposeResult
+from textual.containers import Horizontal, VerticalScroll
+from textual.geometry import Offset
+from textual.widget import Widget
+from textual.widgets import Static
+
+from benchmarks.gestures import Storm
+from benchmarks.suite import settle
+from drag import DragController, DropTargets
+from patching import Patches
+
+MODES = {"every layout": True, "geometry": False}
+
+
+class Card(Static):
+    DEFAULT_CSS = """
+    Card {
+        height: 3;
+        border: round $primary;
+    }
+    """
+
+
+class Column(VerticalScroll):
+    DEFAULT_CSS = """
+    Column {
+        width: 1fr;
+    }
+    """
+
+
+class Board(App):
+    CSS = """
+    DragController {
+        width: 12;
+    }
+    """
+
+    def __init__(self, cards: int, every_layout: bool) -> None:
+        super().__init__()
+        self.cards = cards
+        self.every_layout = every_layout
+        self.targets = DropTargets()
+        self.received: Counter[str] = Counter()
+
+    def compose(self) -> ComposeResult:
+        with Horizontal():
+            with DragController(payload=lambda: "card", targets=self.targets):
+                yield Static("new card", id="source")
+            for column in range(8):
+                with Column():
+                    for card in range(self.cards):
+                        yield Card(f"#{column}.{card}")
+
+    def on_mount(self) -> None:
+        self.targets.register(*self.query(Column), *self.query(Card))
+        if self.every_layout:
+            self.screen.screen_layout_refresh_signal.subscribe(
+                self, lambda screen: self.targets.invalidate(), immediate=True
+            )
+
+    def on_drag_controller_entered(self, event: DragController.Entered) -> None:
+        self.received["entered"] += 1
+
+    def on_drag_controller_left(self, event: DragController.Left) -> None:
+        self.received["left"] += 1
+
+    def on_drag_controller_over(self, event: DragController.Over) -> None:
+        self.received["over"] += 1
+
+    def on_drag_controller_dropped(self, event: DragController.Dropped) -> None:
+        self.received["dropped"] += 1
+
+
+def hit_test(app: Board, x: int, y: int) -> Widget | None:
+    """Find the target under a cell by hit-testing.
+
+    Returns:
+        The first registered target among the widget at `x`, `y` and its ancestors.
+    """
+    widget: Widget | None = app.screen.get_widget_at(x, y)[0]
+    while widget is not None and widget not in app.targets.widgets:
+        parent = widget.parent
+        widget = parent if isinstance(parent, Widget) else None
+    return widget
+
+
+def lookups(app: Board) -> tuple[float, float, float, int]:
+    """Look up the target under every cell right of the source, both ways.
+
+    Returns:
+        Build ms, hit-test and index µs per lookup, and the cells they disagree on.
+    """
+    cells = [Offset(x, y) for y in range(app.size.height) for x in range(12, 120)]
+    started = time.perf_counter()
+    hit = [hit_test(app, x, y) for x, y in cells]
+    hit_us = (time.perf_counter() - started) * 1e6 / len(cells)
+    started = time.perf_counter()
+    app.targets.target_at(app.screen, cells[0])
+    build_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    found = [app.targets.target_at(app.screen, cell) for cell in cells]
+    index_us = (time.perf_counter() - started) * 1e6 / len(cells)
+    return build_ms, hit_us, index_us, sum(a is not b for a, b in zip(hit, found))
+
+
+async def measure(cards: int, rate: int, mode: str) -> None:
+    app = Board(cards, MODES[mode])
+    flushes = 0
+    flush_seconds = 0.0
+
+    def timed_flush_move(
+        flush_move: Callable[[DragController], None], controller: DragController
+    ) -> None:
+        nonlocal flushes, flush_seconds
+        start = time.perf_counter()
+        flush_move(controller)
+        flushes += 1
+        flush_seconds += time.perf_counter() - start
+
+    async with app.run_test(size=(120, 40)) as pilot:
+        await settle(pilot)
+        build_ms, hit_us, index_us, mismatches = lookups(app)
+        for column in app.query(Column):
+            column.scroll_to(y=10, animate=False)
+        await settle(pilot)
+        mismatches += lookups(app)[3]
+
+        rebuilds = app.targets.rebuilds
+        storm = Storm(app, rate)
+        source = app.query_one("#source").region
+        x, y = source.x + 1, source.y
+        with Patches((DragController, "flush_move", timed_flush_move)):
+            await storm.post(
+                events.MouseDown(None, x, y, 0, 0, 1, False, False, False, x, y)
+            )
+            moves = 0
+            for row in range(1, app.size.height - 1, 2):
+                sweep = range(12, 120, 3) if row % 4 == 1 else range(117, 11, -3)
+                for x in sweep:
+                    await storm.move(x, row, 1)
+                    moves += 1
+            x, y = 60, app.size.height // 2
+            await storm.post(
+                events.MouseUp(None, x, y, 0, 0, 1, False, False, False, x, y)
+            )
+            await settle(pilot)
+            await pilot.pause(0.2)
+        received = app.received
+        print(
+            f"{cards * 8 + 8:>8} {mode:<13} {build_ms:>9.2f} {hit_us:>10.2f}"
+            f" {index_us:>10.2f} {mismatches:>10} {moves:>6} {flushes:>8}"
+            f" {flush_seconds * 1e6 / (flushes or 1):>9.1f}"
+            f" {app.targets.rebuilds - rebuilds:>9} {received['entered']:>8}"
+            f" {received['left']:>5} {received['over']:>5} {received['dropped']:>8}"
+        )
+
+
+async def main(cards: list[int], rate: int) -> None:
+    print(
+        f"{'targets':>8} {'mode':<13} {'build ms':>9} {'hit-test':>10} {'index':>10}"
+        f" {'mismatches':>10} {'moves':>6} {'flushes':>8} {'flush µs':>9}"
+        f" {'rebuilds':>9} {'entered':>8} {'left':>5} {'over':>5} {'dropped':>8}"
+    )
+    print(f"{'':>8} {'':<13} {'':>9} {'µs/lookup':>10} {'µs/lookup':>10}")
+    for count in cards:
+        for mode in MODES:
+            await measure(count, rate, mode)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Drop target lookup cost")
+    parser.add_argument(
+        "--cards",
+        type=int,
+        nargs="+",
+        default=[5, 50, 200],
+        help="Cards per column, of the 8 on the board",
+    )
+    parser.add_argument(
+        "--rate", type=int, default=200, help="Raw events posted per second"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.cards, args.rate))
@@ -0,0 +1,86 @@
+"""Replay input storms into a running app the way the driver delivers them.
+
+Events are posted to the App as raw messages at a fixed rate, so they go
+through the same hit testing and forwarding as a real terminal's reports.
+"""
+
+import asyncio
+import time
+
+from textual import events
+from textual.app import App
+from textual.geometry import Region
+from textual.keys import _character_to_key
+
+
+class Storm:
+    """Posts input events to `app`, at most `rate` per second.
+
+    Args:
+        app: A running app, e.g. from `App.run_test`.
+        rate: Events per second to pace posting at.
+    """
+
+    def __init__(self, app: App, rate: int) -> None:
+        self.app = app
+        self.rate = rate
+        self.posted = 0
+        self.started = time.monotonic()
+        self.last_posted = self.started
+
+    async def post(self, event: events.Event) -> None:
+        """Post one event, then wait until the next one is due."""
+        self.app.post_message(event)
+        self.posted += 1
+        self.last_posted = time.monotonic()
+        wait = self.started + self.posted / self.rate - self.last_posted
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def move(self, x: int, y: int, button: int = 0) -> None:
+        """Report the mouse at screen offset `(x, y)`."""
+        await self.post(
+            events.MouseMove(None, x, y, 1, 0, button, False, False, False, x, y)
+        )
+
+    async def sweep(self, region: Region, count: int) -> None:
+        """Move the mouse `count` times, row by row, back and forth across `region`."""
+        width = max(1, region.width)
+        for n in range(count):
+            row, column = divmod(n, width)
+            if row % 2:
+                column = width - 1 - column
+            await self.move(region.x + column, region.y + row % max(1, region.height))
+
+    async def click(self, x: int, y: int) -> None:
+        """Press and release at `(x, y)`, which the App turns into a Click."""
+        await self.post(
+            events.MouseDown(None, x, y, 0, 0, 1, False, False, False, x, y)
+        )
+        await self.post(events.MouseUp(None, x, y, 0, 0, 1, False, False, False, x, y))
+
+    async def drag(
+        self, start: tuple[int, int], end: tuple[int, int], steps: int
+    ) -> None:
+        """Press at `start`, move in `steps` straight steps to `end` and release."""
+        (x1, y1), (x2, y2) = start, end
+        await self.post(
+            events.MouseDown(None, x1, y1, 0, 0, 1, False, False, False, x1, y1)
+        )
+        for step in range(1, steps + 1):
+            await self.move(
+                x1 + (x2 - x1) * step // steps, y1 + (y2 - y1) * step // steps, 1
+            )
+        await self.post(
+            events.MouseUp(None, x2, y2, 0, 0, 1, False, False, False, x2, y2)
+        )
+
+    async def type(self, text: str) -> None:
+        """Press a key for each character of `text`."""
+        for character in text:
+            await self.post(events.Key(_character_to_key(character), character))
+
+    async def press(self, *keys: str) -> None:
+        """Press named keys, such as `"backspace"` or `"down"`."""
+        for key in keys:
+            await self.post(events.Key(key, None))
@@ -0,0 +1,163 @@
+"""Keystroke-to-paint latency of narrow_options_with_input.py's picker.
+
+The picker is opened with 1k, 10k and 100k options, then a phrase is typed
+into it and erased again, one raw key event at a time. Typing extends the
+query, so each keystroke only searches the previous matches; erasing doesn't,
+so each backspace searches every option. A keystroke's latency runs from
+posting the key to the end of the first screen refresh showing its matches.
+Where the picker ranks in a thread, that's the refresh showing the best few.
+
+"before" is the picker as it was, lowercasing every prompt and adding matches
+one `add_option` at a time on each keystroke. "after" ranks fuzzy matches, in
+a thread once there are more than `THREAD_THRESHOLD` options to search.
+
+Run from the repository root:
+    python -m benchmarks.narrowing
+    python -m benchmarks.narrowing --sizes 50000 --modes after
+"""
+
+import asyncio
+import statistics
+import time
+from collections.abc import Callable, Iterable
+from itertools import cycle
+
+from textual import events
+from textual.app import App, ComposeResult
+from textual.screen import Screen
+from textual.widgets import Input, Label, OptionList
+from textual.widgets.option_list import Option
+
+from benchmarks.suite import ROOT
+from patching import Patches
+from restyle.analyzer import load_module
+
+narrowing = load_module(ROOT / "narrow_options_with_input.py")
+PHRASE = "keep me afloat"
+
+
+class Before(narrowing.NarrowOptionsWithInput):
+    def on_input_changed(self, event: Input.Changed) -> None:
+        # keep the picker's own handler out of it
+        event.prevent_default()
+        value = event.value
+        optionlist: OptionList = self.query_one(OptionList)
+        optionlist.clear_options()
+        for option in self.options:
+            prompt = option.prompt if isinstance(option, Option) else option
+            if value.lower() in prompt.lower():
+                optionlist.add_option(option)
+        if optionlist.option_count == 0:
+            optionlist.add_option(Option("--no matches--", disabled=True))
+        optionlist.highlighted = 0
+        self.shown_query = value.lower()
+
+
+MODES = {"before": Before, "after": narrowing.NarrowOptionsWithInput}
+
+
+class PickerApp(App):
+    def __init__(self, picker: narrowing.NarrowOptionsWithInput) -> None:
+        super().__init__()
+        self.picker = picker
+
+    def compose(self) -> ComposeResult:
+        yield Label("Behind the picker")
+
+    def on_mount(self) -> None:
+        self.push_screen(self.picker)
+
+
+async def measure(mode: str, size: int) -> dict[str, list[float]]:
+    """Type and erase `PHRASE` in a picker of `size` options.
+
+    Returns:
+        Latencies in milliseconds, for typing and for erasing.
+    """
+    options = [
+        f"{line} #{n}" for n, line in zip(range(size), cycle(narrowing.starlight))
+    ]
+    picker = MODES[mode](options)
+    app = PickerApp(picker)
+    painted = updated = 0.0
+
+    def timed_compositor_refresh(
+        compositor_refresh: Callable[[Screen], None], screen: Screen
+    ) -> None:
+        nonlocal painted
+        compositor_refresh(screen)
+        painted = time.perf_counter()
+
+    def timed_add_options(
+        add_options: Callable[..., OptionList],
+        option_list: OptionList,
+        new_options: Iterable[Option],
+    ) -> OptionList:
+        nonlocal updated
+        add_options(option_list, new_options)
+        updated = time.perf_counter()
+        return option_list
+
+    latencies: dict[str, list[float]] = {"type": [], "erase": []}
+    with Patches(
+        (Screen, "_compositor_refresh", timed_compositor_refresh),
+        (OptionList, "add_options", timed_add_options),
+    ):
+        async with app.run_test(size=(120, 40)) as pilot:
+            await pilot.pause(0.2)
+            keys = [("type", character) for character in PHRASE]
+            keys += [("erase", "backspace")] * len(PHRASE)
+            for kind, key in keys:
+                event = (
+                    events.Key("backspace", None)
+                    if key == "backspace"
+                    else events.Key(key if key != " " else "space", key)
+                )
+                posted = time.perf_counter()
+                app.post_message(event)
+                while (
+                    picker.shown_query != picker.query_one(Input).value.lower()
+                    or painted < max(posted, updated)
+                    or not app._message_queue.empty()
+                    or not app.screen._message_queue.empty()
+                ):
+                    await asyncio.sleep(0.001)
+                latencies[kind].append((painted - posted) * 1000)
+    return latencies
+
+
+async def main(sizes: list[int], modes: list[str]) -> None:
+    print(
+        f"{'options':>8} {'mode':<7}"
+        + "".join(
+            f"{heading:>12}"
+            for heading in ("type med", "type max", "erase med", "erase max")
+        )
+    )
+    for size in sizes:
+        for mode in modes:
+            latencies = await measure(mode, size)
+            cells = [
+                function(latencies[kind])
+                for kind in ("type", "erase")
+                for function in (statistics.median, max)
+            ]
+            print(
+                f"{size:>8} {mode:<7}" + "".join(f"{cell:>9.1f} ms" for cell in cells)
+            )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Narrowing picker latency")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1_000, 10_000, 100_000],
+        help="Numbers of options to open the picker with",
+    )
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES))
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.modes))
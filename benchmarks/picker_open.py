@@ -0,0 +1,163 @@
+"""Open time and memory of narrow_options_with_input.py's picker on huge lists.
+
+The picker is opened with 10k, 100k and 1M string options, each size and mode
+in a process of its own so its peak RSS is its own. A run reports:
+
+    open_ms      from making the picker until the first refresh showing it
+    end_ms       from highlighting the last option until the refresh showing it
+    select_ms    from pressing enter until the picker is dismissed
+    peak_rss_mb  peak resident set size of the process, the options included
+
+"options" shows an Option for every string, as the picker did before.
+"virtual" packs the strings into one and makes Options only for shown rows.
+
+Run from the repository root:
+    python -m benchmarks.picker_open
+    python -m benchmarks.picker_open --sizes 1000000 --modes virtual
+"""
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from itertools import cycle
+from typing import Any
+
+from textual.app import App, ComposeResult
+from textual.screen import Screen
+from textual.widgets import Label, OptionList
+
+from benchmarks.suite import ROOT, peak_rss_mb
+from patching import Patches
+from restyle.analyzer import load_module
+
+narrowing = load_module(ROOT / "narrow_options_with_input.py")
+MODES = {"options": False, "virtual": True}
+METRICS = ("open_ms", "end_ms", "select_ms", "peak_rss_mb")
+
+
+class PickerApp(App):
+    def compose(self) -> ComposeResult:
+        yield Label("Behind the picker")
+
+
+async def measure(mode: str, size: int) -> dict[str, Any]:
+    """Open a picker of `size` options, jump to the last one and pick it.
+
+    Returns:
+        The metrics of the run, peak RSS aside.
+    """
+    options = [
+        f"{line} #{n}" for n, line in zip(range(size), cycle(narrowing.starlight))
+    ]
+    app = PickerApp()
+    painted = 0.0
+    picked: list[str] = []
+
+    def timed_compositor_refresh(
+        compositor_refresh: Callable[[Screen], None], screen: Screen
+    ) -> None:
+        nonlocal painted
+        compositor_refresh(screen)
+        painted = time.perf_counter()
+
+    async def refreshed_after(started: float) -> float:
+        while painted < started or not app.screen._message_queue.empty():
+            await asyncio.sleep(0.001)
+        return (painted - started) * 1000
+
+    result: dict[str, Any] = {}
+    with Patches((Screen, "_compositor_refresh", timed_compositor_refresh)):
+        async with app.run_test(size=(120, 40)) as pilot:
+            await pilot.pause(0.2)
+            started = time.perf_counter()
+            picker = narrowing.NarrowOptionsWithInput(options, virtual=MODES[mode])
+            app.push_screen(picker, picked.append)
+            result["open_ms"] = await refreshed_after(started)
+            option_list = picker.query_one(OptionList)
+            started = time.perf_counter()
+            option_list.action_last()
+            result["end_ms"] = await refreshed_after(started)
+            started = time.perf_counter()
+            await pilot.press("enter")
+            while not picked:
+                await asyncio.sleep(0.001)
+            result["select_ms"] = (time.perf_counter() - started) * 1000
+            if picked != [options[-1]]:
+                result["error"] = f"picked {picked}, not {options[-1]!r}"
+    return result
+
+
+def run_child(mode: str, size: int) -> None:
+    """Measure one run in this process and print its result as JSON."""
+    result = asyncio.run(measure(mode, size))
+    result["peak_rss_mb"] = peak_rss_mb()
+    print(json.dumps(result), flush=True)
+    # don't wait for ranking threads the picker left running
+    os._exit(0)
+
+
+def run(mode: str, size: int, timeout: float) -> dict[str, Any]:
+    """Measure one run in a process of its own.
+
+    Returns:
+        The child's result, or `{"error": reason}`.
+    """
+    command = [sys.executable, "-m", "benchmarks.picker_open", "--child", mode]
+    command += ["--sizes", str(size)]
+    try:
+        completed = subprocess.run(
+            command, cwd=ROOT, capture_output=True, text=True, timeout=timeout
+        )
+    except subprocess.TimeoutExpired:
+        return {"error": f"timed out after {timeout:g}s"}
+    lines = completed.stdout.strip().splitlines()
+    if completed.returncode or not lines:
+        errors = completed.stderr.strip().splitlines() or ["no output"]
+        return {"error": errors[-1]}
+    return json.loads(lines[-1])
+
+
+def main(sizes: list[int], modes: list[str], timeout: float) -> None:
+    print(f"{'options':>8} {'mode':<8}" + "".join(f"{m:>12}" for m in METRICS))
+    for size in sizes:
+        for mode in modes:
+            result = run(mode, size, timeout)
+            if "error" in result:
+                print(f"{size:>8} {mode:<8} {result['error']}")
+                continue
+            cells = [result.get(metric) for metric in METRICS]
+            print(
+                f"{size:>8} {mode:<8}"
+                + "".join(
+                    f"{'-':>12}" if cell is None else f"{cell:>12.1f}" for cell in cells
+                )
+            )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Huge picker open time and memory")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10_000, 100_000, 1_000_000],
+        help="Numbers of options to open the picker with",
+    )
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES))
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=600,
+        help="Seconds before a run is abandoned",
+    )
+    parser.add_argument("--child", default="", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        run_child(args.child, args.sizes[0])
+    main(args.sizes, args.modes, args.timeout)
@@ -0,0 +1,162 @@
+"""Frame cost of shaking a button, with sleep loops and with offset_animation.
+
+A button sits in a row of labels, among a column of them, and is shaken
+`--shakes` times, one after another. A last shake is started three times
+over, 0.1 s apart, to check that restarting ends where it started.
+
+    margin loop   shake.py as it was, writing `margin` in `await sleep` loops
+    offset loop   block_failed_input.py's shake as it was, writing `offset` likewise
+    animator      `offset_animation.shake`, on the animator's clock
+
+"layouts" counts `Screen._refresh_layout` calls, "arranges" the containers
+laid out again by them and "update ms" the time spent updating the screen.
+"moved" is how far the button is from where it started, once all is done.
+
+Run from the repository root:
+    python -m benchmarks.shake
+    python -m benchmarks.shake --shakes 10
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+
+from textual import widget as textual_widget
+from textual._arrange import DockArrangeResult
+from textual.app import App, ComposeResult
+from textual.containers import HorizontalGroup, VerticalGroup
+from textual.screen import Screen
+from textual.widgets import Button, Label
+
+import offset_animation
+from patching import Patches
+
+
+async def margin_loop(app: App) -> None:
+    app.query_one(Button).styles.margin = (0, 0, 0, 11)
+    await asyncio.sleep(0.1)
+    app.query_one(Button).styles.margin = (0, 0, 0, 10)
+    await asyncio.sleep(0.1)
+    app.query_one(Button).styles.margin = (0, 0, 0, 11)
+    await asyncio.sleep(0.1)
+    app.query_one(Button).styles.margin = (0, 0, 0, 10)
+
+
+async def offset_loop(app: App) -> None:
+    button = app.query_one(Button)
+    for _ in range(3):
+        button.styles.offset = (1, 0)
+        await asyncio.sleep(0.1)
+        button.styles.offset = (0, 0)
+        await asyncio.sleep(0.1)
+
+
+async def animator(app: App) -> None:
+    offset_animation.shake(app.query_one(Button))
+    await asyncio.sleep(0.6)
+
+
+MODES: dict[str, Callable[[App], Awaitable[None]]] = {
+    "margin loop": margin_loop,
+    "offset loop": offset_loop,
+    "animator": animator,
+}
+
+
+class ShakeApp(App):
+    CSS = """
+    Button {
+        margin-left: 10
+    }
+    """
+
+    def compose(self) -> ComposeResult:
+        with VerticalGroup():
+            for n in range(15):
+                yield Label(f"Above the button #{n}")
+            with HorizontalGroup():
+                yield Button("Shake me!")
+                for n in range(3):
+                    yield Label(f"Beside the button #{n}")
+            for n in range(15):
+                yield Label(f"Below the button #{n}")
+
+
+async def measure(mode: str, shakes: int) -> None:
+    layouts = arranges = 0
+    layout_seconds = update_seconds = 0.0
+
+    def timed_refresh_layout(
+        refresh_layout: Callable[..., None], screen: Screen, *args, **kwargs
+    ) -> None:
+        nonlocal layouts, layout_seconds
+        start = time.perf_counter()
+        refresh_layout(screen, *args, **kwargs)
+        layouts += 1
+        layout_seconds += time.perf_counter() - start
+
+    def timed_compositor_refresh(
+        compositor_refresh: Callable[[Screen], None], screen: Screen
+    ) -> None:
+        nonlocal update_seconds
+        start = time.perf_counter()
+        compositor_refresh(screen)
+        update_seconds += time.perf_counter() - start
+
+    def counted_arrange(
+        arrange: Callable[..., DockArrangeResult], *args, **kwargs
+    ) -> DockArrangeResult:
+        nonlocal arranges
+        arranges += 1
+        return arrange(*args, **kwargs)
+
+    app = ShakeApp()
+    patches = Patches(
+        (Screen, "_refresh_layout", timed_refresh_layout),
+        (Screen, "_compositor_refresh", timed_compositor_refresh),
+        (textual_widget, "arrange", counted_arrange),
+    )
+    try:
+        async with app.run_test(size=(80, 40)) as pilot:
+            await pilot.pause(0.3)
+            button = app.query_one(Button)
+            start_region = button.region
+            patches.start()
+            for _ in range(shakes):
+                await MODES[mode](app)
+                await pilot.pause(0.05)
+            # shaken again before the last shake ended, and again before that one did
+            restarts = [asyncio.create_task(MODES[mode](app))]
+            for _ in range(2):
+                await asyncio.sleep(0.1)
+                restarts.append(asyncio.create_task(MODES[mode](app)))
+            await asyncio.gather(*restarts)
+            await pilot.pause(0.3)
+            moved = button.region.offset - start_region.offset
+            print(
+                f"{mode:<12} {layouts:>8} {arranges:>9}"
+                f" {layout_seconds * 1000:>10.1f} {update_seconds * 1000:>10.1f}"
+                f" {moved.x:>4},{moved.y}"
+            )
+    finally:
+        patches.stop()
+
+
+async def main(shakes: int) -> None:
+    print(
+        f"{'mode':<12} {'layouts':>8} {'arranges':>9} {'layout ms':>10}"
+        f" {'update ms':>10} {'moved':>6}"
+    )
+    for mode in MODES:
+        await measure(mode, shakes)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Shake animation frame cost")
+    parser.add_argument(
+        "--shakes", type=int, default=5, help="Shakes to run one after another"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.shakes))
@@ -0,0 +1,368 @@
+"""Headless input-storm benchmarks for the apps in this repo.
+
+Every poe task that runs a script, plus a few scripts without a task, is loaded
+with `restyle.analyzer.load_module`, run under `App.run_test()` and fed a storm
+of raw input events (see gestures.py). Each scenario runs in a process of its
+own, so its peak RSS is its own and a stuck app can only time out itself.
+
+Reported per scenario:
+    events       input events posted
+    frames       screen refreshes, `Screen._compositor_refresh` calls
+    handler_ms   time inside message dispatch, outermost dispatch per message pump
+    cpu_s        process CPU time from the first post until everything settled
+    drain_s      time from the last post until every queue was empty
+    wall_s       time from the first post until every queue was empty
+    peak_rss_mb  peak resident set size of the scenario's process
+
+The JSON report records the Textual and Python versions, so reports from two
+environments can be compared with `--compare`.
+
+Run from the repository root:
+    python -m benchmarks.suite
+    python -m benchmarks.suite lagging-mouse dragging --count 2000 --json storms.json
+    python -m benchmarks.suite --compare storms.json
+"""
+
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tomllib
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from importlib.metadata import version
+from pathlib import Path
+from typing import Any
+
+from textual.message import Message
+from textual.message_pump import MessagePump
+from textual.pilot import Pilot
+from textual.screen import Screen
+
+from benchmarks.gestures import Storm
+from patching import Patches
+from restyle.analyzer import app_classes, load_module
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+ROOT = Path(__file__).parent.parent
+METRICS = (
+    "events",
+    "frames",
+    "handler_ms",
+    "cpu_s",
+    "drain_s",
+    "wall_s",
+    "peak_rss_mb",
+)
+
+StormFunction = Callable[[Pilot, Storm, int], Awaitable[None]]
+
+# how deep the current message pump's task is in nested dispatches
+_dispatch_depth: ContextVar[int] = ContextVar("dispatch_depth", default=0)
+
+
+async def sweep_screen(pilot: Pilot, storm: Storm, count: int) -> None:
+    """Sweep the mouse over the whole screen."""
+    await storm.sweep(pilot.app.screen.region, count)
+
+
+def sweep(selector: str) -> StormFunction:
+    """Sweep the mouse over the content of the first widget matching `selector`.
+
+    Returns:
+        A storm function.
+    """
+
+    async def sweep_widget(pilot: Pilot, storm: Storm, count: int) -> None:
+        region = pilot.app.query_one(selector).scrollable_content_region
+        await storm.sweep(region, count)
+
+    return sweep_widget
+
+
+def type_into(button: str = "Button") -> StormFunction:
+    """Click `button` to open a dialog, then type and erase a phrase in it.
+
+    Returns:
+        A storm function.
+    """
+
+    async def type_and_erase(pilot: Pilot, storm: Storm, count: int) -> None:
+        await storm.click(*pilot.app.query_one(button).region.center)
+        await pilot.pause()
+        phrase = "keep me afloat"
+        while storm.posted < count:
+            await storm.type(phrase)
+            await storm.press(*["backspace"] * len(phrase))
+
+    return type_and_erase
+
+
+async def drag_songs(pilot: Pilot, storm: Storm, count: int) -> None:
+    """Select three songs in dragging.py's playlist, then drag them onto the recipient over and over."""
+    playlist = pilot.app.query_one("#playlist").scrollable_content_region
+    for row in range(3):
+        await storm.click(playlist.x + 1, playlist.y + row)
+    start = (playlist.x + 1, playlist.y)
+    end = tuple(pilot.app.query_one("#recipient").region.center)
+    steps = 48
+    for _ in range(max(1, count // (steps + 2))):
+        await storm.drag(start, end, steps)
+
+
+STORMS: dict[str, StormFunction] = {
+    "lagging-mouse": sweep("OptionList"),
+    "dragging": drag_songs,
+    "throttled": sweep("MouseArea"),
+    "no-throttle": sweep("MouseArea"),
+    "coalesced": sweep("MouseArea"),
+    "narrow-options-with-input": type_into(),
+    "block-failed-input": type_into(),
+}
+# scripts worth a storm that have no poe task
+EXTRA_SCRIPTS = {"lagging-mouse": "lagging-mouse.py", "dragging": "dragging.py"}
+
+
+def scenarios() -> dict[str, str]:
+    """Every poe task that runs a script, plus `EXTRA_SCRIPTS`.
+
+    Returns:
+        Script paths relative to the repository root, by scenario name.
+    """
+    tasks = tomllib.loads((ROOT / "pyproject.toml").read_text())["tool"]["poe"]["tasks"]
+    found = {
+        name: task
+        for name, task in tasks.items()
+        if isinstance(task, str) and (ROOT / task).is_file()
+    }
+    return found | EXTRA_SCRIPTS
+
+
+async def settle(pilot: Pilot) -> None:
+    """Wait until the app and its screen have handled everything posted so far."""
+    app = pilot.app
+    while True:
+        await pilot.pause()
+        if app._message_queue.empty() and app.screen._message_queue.empty():
+            return
+
+
+async def measure(
+    script: str, storm_function: StormFunction, count: int, rate: int
+) -> dict[str, Any]:
+    """Run the first app a script defines and replay a storm of about `count` events into it.
+
+    Returns:
+        The metrics, or `{"skipped": reason}` for scripts without an app.
+    """
+    apps = app_classes(load_module(ROOT / script))
+    if not apps:
+        return {"skipped": "no App subclass"}
+    app = apps[0]()
+    frames = 0
+    handler = 0.0
+
+    def counted_refresh(
+        compositor_refresh: Callable[[Screen], None], screen: Screen
+    ) -> None:
+        nonlocal frames
+        frames += 1
+        compositor_refresh(screen)
+
+    async def timed_dispatch(
+        dispatch_message: Callable[..., Awaitable[None]],
+        pump: MessagePump,
+        message: Message,
+    ) -> None:
+        nonlocal handler
+        depth = _dispatch_depth.get()
+        token = _dispatch_depth.set(depth + 1)
+        start = time.perf_counter()
+        try:
+            await dispatch_message(pump, message)
+        finally:
+            _dispatch_depth.reset(token)
+            if not depth:
+                handler += time.perf_counter() - start
+
+    with Patches(
+        (Screen, "_compositor_refresh", counted_refresh),
+        (MessagePump, "_dispatch_message", timed_dispatch),
+    ):
+        async with app.run_test(size=(120, 40)) as pilot:
+            await settle(pilot)
+            frames = 0
+            handler = 0.0
+            cpu = time.process_time()
+            storm = Storm(app, rate)
+            await storm_function(pilot, storm, count)
+            await settle(pilot)
+            settled = time.monotonic()
+            return {
+                "events": storm.posted,
+                "frames": frames,
+                "handler_ms": handler * 1000,
+                "cpu_s": time.process_time() - cpu,
+                "drain_s": settled - storm.last_posted,
+                "wall_s": settled - storm.started,
+            }
+
+
+def peak_rss_mb() -> float | None:
+    """Peak resident set size of this process.
+
+    Returns:
+        Megabytes, or None where `resource` is unavailable.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def run_child(name: str, count: int, rate: int) -> None:
+    """Measure one scenario in this process and print its result as JSON."""
+    storm_function = STORMS.get(name, sweep_screen)
+    result = asyncio.run(measure(scenarios()[name], storm_function, count, rate))
+    if "skipped" not in result:
+        result["peak_rss_mb"] = peak_rss_mb()
+    print(json.dumps(result), flush=True)
+    # don't wait for threads the app left running
+    os._exit(0)
+
+
+def run_scenario(name: str, count: int, rate: int, timeout: float) -> dict[str, Any]:
+    """Measure one scenario in a process of its own.
+
+    Returns:
+        The child's result, or `{"error": reason}`.
+    """
+    command = [sys.executable, "-m", "benchmarks.suite", "--child", name]
+    command += ["--count", str(count), "--rate", str(rate)]
+    try:
+        completed = subprocess.run(
+            command, cwd=ROOT, capture_output=True, text=True, timeout=timeout
+        )
+    except subprocess.TimeoutExpired:
+        return {"error": f"timed out after {timeout:g}s"}
+    lines = completed.stdout.strip().splitlines()
+    if completed.returncode or not lines:
+        errors = completed.stderr.strip().splitlines() or ["no output"]
+        return {"error": errors[-1]}
+    return json.loads(lines[-1])
+
+
+def print_results(results: dict[str, dict[str, Any]]) -> None:
+    """Print one row of metrics per scenario."""
+    print(f"{'scenario':<28}" + "".join(f"{metric:>12}" for metric in METRICS))
+    for name, result in results.items():
+        if "error" in result or "skipped" in result:
+            print(f"{name:<28} {result.get('error') or result.get('skipped')}")
+            continue
+        cells = []
+        for metric in METRICS:
+            value = result.get(metric)
+            if value is None:
+                cells.append(f"{'-':>12}")
+            elif isinstance(value, int):
+                cells.append(f"{value:>12}")
+            else:
+                cells.append(f"{value:>12.2f}")
+        print(f"{name:<28}" + "".join(cells))
+
+
+def compare(old: dict[str, Any], new: dict[str, Any]) -> None:
+    """Print each metric of `new` as a ratio of the same metric in `old`."""
+    print(
+        f"textual {old['textual']} -> {new['textual']}, "
+        f"python {old['python']} -> {new['python']} (ratios new/old)"
+    )
+    if (old["count"], old["rate"]) != (new["count"], new["rate"]):
+        print("warning: the reports used different --count/--rate")
+    print(f"{'scenario':<28}" + "".join(f"{metric:>12}" for metric in METRICS))
+    for name, result in new["results"].items():
+        before = old["results"].get(name)
+        if before is None:
+            continue
+        cells = []
+        for metric in METRICS:
+            value, previous = result.get(metric), before.get(metric)
+            if value is None or not previous:
+                cells.append(f"{'-':>12}")
+            else:
+                cells.append(f"{'x' + format(value / previous, '.2f'):>12}")
+        print(f"{name:<28}" + "".join(cells))
+
+
+def main(
+    names: list[str],
+    count: int,
+    rate: int,
+    timeout: float,
+    json_path: str,
+    compare_path: str,
+) -> None:
+    available = scenarios()
+    unknown = set(names) - available.keys()
+    if unknown:
+        sys.exit(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    results = {}
+    for name in names or available:
+        print(f"running {name}...", file=sys.stderr)
+        results[name] = run_scenario(name, count, rate, timeout)
+    report = {
+        "textual": version("textual"),
+        "python": platform.python_version(),
+        "platform": sys.platform,
+        "count": count,
+        "rate": rate,
+        "results": results,
+    }
+    print_results(results)
+    if json_path:
+        Path(json_path).write_text(json.dumps(report, indent=2))
+    if compare_path:
+        compare(json.loads(Path(compare_path).read_text()), report)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Headless input-storm benchmarks")
+    parser.add_argument(
+        "names", nargs="*", help="Scenarios to run, all of them by default"
+    )
+    parser.add_argument(
+        "--count", type=int, default=10_000, help="Input events per scenario"
+    )
+    parser.add_argument(
+        "--rate", type=int, default=2000, help="Input events per second"
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=300,
+        help="Seconds before a scenario is abandoned",
+    )
+    parser.add_argument(
+        "--json", default="", metavar="PATH", help="Write the report as JSON"
+    )
+    parser.add_argument(
+        "--compare",
+        default="",
+        metavar="PATH",
+        help="Compare against an earlier JSON report",
+    )
+    parser.add_argument("--child", default="", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        run_child(args.child, args.count, args.rate)
+    main(args.names, args.count, args.rate, args.timeout, args.json, args.compare)
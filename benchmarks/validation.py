@@ -0,0 +1,188 @@
+"""Typing into block_failed_input.py's dialog with a costly validator.
+
+The dialog gets a slow validator on top of its own two, spinning the CPU for
+`--cost` ms like a lookup would. A phrase is then typed into it and erased
+again `--rounds` times, one raw key event every `--interval` ms, which is
+faster than the slow validator. Each mode is timed until everything settled:
+
+    before   the dialog as it was, the input running every validator on each
+             change and the dialog starting a worker to restyle itself
+    after    cheap validators first, stopping at the first failure, with
+             results kept per value and the slow validator in a thread
+
+"restyles" counts `update_node_styles` calls, "slow calls" the slow
+validator's runs and "workers" the workers started.
+
+Run from the repository root:
+    python -m benchmarks.validation
+    python -m benchmarks.validation --cost 20 --interval 5
+"""
+
+import asyncio
+import contextlib
+import time
+from collections.abc import Callable
+
+from textual import events, work
+from textual.app import App, ComposeResult
+from textual.containers import HorizontalGroup
+from textual.dom import DOMNode
+from textual.validation import Function, Validator
+from textual.widgets import Input, Label
+from textual.worker import Worker
+from textual.worker_manager import WorkerManager
+
+from benchmarks.suite import ROOT
+from patching import Patches
+from restyle.analyzer import load_module
+
+block = load_module(ROOT / "block_failed_input.py")
+PHRASE = "hi there, how is it going"
+
+
+class Before(block.ModalInput):
+    def __init__(self, *args, slow_validators: list[Validator] = [], **kwargs) -> None:
+        super().__init__(*args, slow_validators=slow_validators, **kwargs)
+        self.slow_validators = slow_validators
+
+    def compose(self) -> ComposeResult:
+        with HorizontalGroup():
+            yield Input(
+                id="input",
+                compact=True,
+                valid_empty=False,
+                validators=[*self.validators, *self.slow_validators],
+                validate_on=["changed", "submitted"],
+            )
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        # keep the dialog's own handler out of it
+        event.prevent_default()
+        self.restyle(event)
+
+    def check(self, value: str) -> None:
+        inp = self.query_one(Input)
+        inp.validate(value)
+        self.restyle(inp.Changed(inp, value))
+
+    @work(exclusive=True)
+    async def restyle(self, event: Input.Changed) -> None:
+        if self.query_one(Input).is_valid:
+            self.horizontal_group.classes = "valid"
+            self.horizontal_group.border_subtitle = self.border_subtitle
+        else:
+            self.horizontal_group.classes = "invalid"
+            if event.validation_result is None or event.value == "":
+                self.horizontal_group.border_subtitle = "The word cannot be empty!"
+                return
+            # `is_valid` is read after the result, and may be newer
+            with contextlib.suppress(IndexError):
+                self.horizontal_group.border_subtitle = str(
+                    event.validation_result.failure_descriptions[0]
+                )
+
+
+MODES = {"before": Before, "after": block.ModalInput}
+
+
+class DialogApp(App):
+    def __init__(self, dialog: block.ModalInput) -> None:
+        super().__init__()
+        self.dialog = dialog
+
+    def compose(self) -> ComposeResult:
+        yield Label("Behind the dialog")
+
+    def on_mount(self) -> None:
+        self.push_screen(self.dialog)
+
+
+async def measure(mode: str, cost: float, rounds: int, interval: float) -> None:
+    slow_calls = 0
+
+    def lookup(value: str) -> bool:
+        nonlocal slow_calls
+        slow_calls += 1
+        until = time.perf_counter() + cost / 1000
+        while time.perf_counter() < until:
+            pass
+        return "e" in value
+
+    slow = Function(lookup, "The word has no 'e' in it!")
+    dialog = MODES[mode]("Greeting", "Hello!", slow_validators=[slow])
+    app = DialogApp(dialog)
+    restyles = workers = 0
+
+    def counted_update_node_styles(
+        update_node_styles: Callable[..., None], node: DOMNode, animate: bool = True
+    ) -> None:
+        nonlocal restyles
+        restyles += 1
+        update_node_styles(node, animate=animate)
+
+    def counted_new_worker(
+        new_worker: Callable[..., Worker], manager: WorkerManager, *args, **kwargs
+    ) -> Worker:
+        nonlocal workers
+        workers += 1
+        return new_worker(manager, *args, **kwargs)
+
+    patches = Patches(
+        (DOMNode, "update_node_styles", counted_update_node_styles),
+        (WorkerManager, "_new_worker", counted_new_worker),
+    )
+    try:
+        async with app.run_test(size=(120, 20)) as pilot:
+            await pilot.pause(0.2)
+            patches.start()
+            keys = [*PHRASE, *["backspace"] * len(PHRASE)] * rounds
+            started = time.perf_counter()
+            for n, key in enumerate(keys):
+                app.post_message(
+                    events.Key("backspace", None)
+                    if key == "backspace"
+                    else events.Key(key if key != " " else "space", key)
+                )
+                wait = started + (n + 1) * interval / 1000 - time.perf_counter()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            while not (
+                app._message_queue.empty()
+                and dialog._message_queue.empty()
+                and not any(worker.is_running for worker in app.workers)
+            ):
+                await asyncio.sleep(0.001)
+            elapsed = time.perf_counter() - started
+            patches.stop()
+            print(
+                f"{mode:<7} {len(keys):>6} {elapsed * 1000:>10.1f}"
+                f" {restyles:>9} {slow_calls:>10} {workers:>8}"
+            )
+    finally:
+        patches.stop()
+
+
+async def main(cost: float, rounds: int, interval: float) -> None:
+    print(
+        f"{'mode':<7} {'keys':>6} {'ms':>10} {'restyles':>9}"
+        f" {'slow calls':>10} {'workers':>8}"
+    )
+    for mode in MODES:
+        await measure(mode, cost, rounds, interval)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Dialog validation benchmark")
+    parser.add_argument(
+        "--cost", type=float, default=10, help="Milliseconds per slow validation"
+    )
+    parser.add_argument(
+        "--rounds", type=int, default=4, help="Times to type and erase the phrase"
+    )
+    parser.add_argument(
+        "--interval", type=float, default=5, help="Milliseconds between keys"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.cost, args.rounds, args.interval))
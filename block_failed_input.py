@@ -1,11 +1,103 @@
-from asyncio import sleep
+from collections.abc import Callable, Iterable
 
 from textual import events, work
 from textual.app import App, ComposeResult
 from textual.containers import HorizontalGroup
 from textual.screen import ModalScreen
-from textual.validation import Function
+from textual.validation import Function, ValidationResult, Validator
 from textual.widgets import Input, Button
+from textual.worker import get_current_worker
+
+from offset_animation import shake
+
+
+class ValidationPipeline:
+    """Validators run in order until one fails, with the result kept per value.
+
+    `validators` are cheap enough to run on every keystroke. `slow_validators`
+    only run once all of those pass, through `validate_slow`, which is meant to
+    be called from a thread. Results of the last `keep` values are kept, so
+    erasing back to an earlier value doesn't run anything.
+    """
+
+    def __init__(
+        self,
+        validators: Iterable[Validator],
+        slow_validators: Iterable[Validator] = (),
+        keep: int = 256,
+    ) -> None:
+        self.validators = tuple(validators)
+        self.slow_validators = tuple(slow_validators)
+        self.keep = keep
+        self.results: dict[str, ValidationResult] = {}
+
+    def cached(self, value: str) -> ValidationResult | None:
+        """The result kept for `value`.
+
+        Returns:
+            The result, or None if `value` hasn't been validated in full.
+        """
+        # moved to the end on every lookup, so the first one is the least recent
+        result = self.results.pop(value, None)
+        if result is not None:
+            self.results[value] = result
+        return result
+
+    def remember(self, value: str, result: ValidationResult) -> ValidationResult:
+        """Keep `result` as the result for `value`.
+
+        Returns:
+            `result`.
+        """
+        self.results[value] = result
+        if len(self.results) > self.keep:
+            del self.results[next(iter(self.results))]
+        return result
+
+    def validate(self, value: str) -> ValidationResult | None:
+        """Validate `value` with the cheap validators, unless its result is kept.
+
+        Returns:
+            The result, or None if the cheap validators pass and it's up to the
+            slow ones.
+        """
+        result = self.cached(value)
+        if result is not None:
+            return result
+        result = self.run(value, self.validators)
+        if result.is_valid and self.slow_validators:
+            return None
+        return self.remember(value, result)
+
+    def validate_slow(
+        self, value: str, cancelled: Callable[[], bool] = lambda: False
+    ) -> ValidationResult | None:
+        """Validate `value` with the slow validators, without keeping the result.
+
+        Returns:
+            The result, or None if `cancelled` returned True before it was done.
+        """
+        return self.run(value, self.slow_validators, cancelled)
+
+    @staticmethod
+    def run(
+        value: str,
+        validators: Iterable[Validator],
+        cancelled: Callable[[], bool] = lambda: False,
+    ) -> ValidationResult | None:
+        """Run `validators` on `value`, stopping at the first failure.
+
+        Returns:
+            That failure, success if there is none, or None if `cancelled`
+            returned True before a validator.
+        """
+        for validator in validators:
+            if cancelled():
+                return None
+            result = validator.validate(value)
+            if not result.is_valid:
+                return result
+        return ValidationResult.success()
 
 
 class ModalInput(ModalScreen):
@@ -13,43 +105,90 @@ class ModalInput(ModalScreen):
         self,
         border_title: str,
         border_subtitle: str = "",
+        validators: list[Validator] | None = None,
+        slow_validators: Iterable[Validator] = (),
         **kwargs,
     ) -> None:
+        """
+        Args:
+            border_title: Title of the dialog.
+            border_subtitle: Subtitle of the dialog while the input is valid.
+            validators: Validators run on every change, in order. By default,
+                the input has to contain an 'h' and an 'i'.
+            slow_validators: Validators run in a thread once all of
+                `validators` pass, such as ones doing lookups.
+        """
         super().__init__(**kwargs)
         self.border_title = border_title
         self.border_subtitle = border_subtitle
-        self.validators = [
-            Function(lambda x: "h" in x, "The character 'h' isnt in the string!"),
-            Function(lambda x: "i" in x, "The character 'i' isnt in the string!"),
-        ]
+        if validators is None:
+            validators = [
+                Function(lambda x: "h" in x, "The character 'h' isnt in the string!"),
+                Function(lambda x: "i" in x, "The character 'i' isnt in the string!"),
+            ]
+        self.validators = validators
+        self.validation = ValidationPipeline(
+            [Function(bool, "The word cannot be empty!"), *validators],
+            slow_validators,
+        )
+        # whether the input was last shown as valid, None before the first check
+        self.valid: bool | None = None
+        # a value submitted while the slow validators were still running on it
+        self.submitting: str | None = None
 
     def compose(self) -> ComposeResult:
         with HorizontalGroup():
-            yield Input(
-                id="input",
-                compact=True,
-                valid_empty=False,
-                validators=self.validators,
-                validate_on=["changed", "submitted"]
-            )
-
-    @work(exclusive=True)
-    async def on_input_changed(self, event: Input.Changed) -> None:
-        if self.query_one(Input).is_valid:
-            self.horizontal_group.classes = "valid"
-            self.horizontal_group.border_subtitle = self.border_subtitle
-        else:
-            self.horizontal_group.classes = "invalid"
-            if event.validation_result is None or event.value == "":
-                self.horizontal_group.border_subtitle = "The word cannot be empty!"
-                return
-            try:
-                self.horizontal_group.border_subtitle = str(
-                    event.validation_result.failure_descriptions[0]
-                )
-            except AttributeError:
-                # valid_empty = False
-                self.horizontal_group.border_subtitle = "The word cannot be empty!"
+            # validated here instead, so the input doesn't run every validator itself
+            yield Input(id="input", compact=True, validate_on=[])
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        # a submission waits on the value it was made with, not on later edits
+        self.submitting = None
+        self.check(event.value)
+
+    def check(self, value: str) -> None:
+        """Validate `value`, handing it to a thread if it needs the slow validators."""
+        result = self.validation.validate(value)
+        if result is None:
+            self.validate_in_thread(value)
+            return
+        self.workers.cancel_group(self, "validate")
+        self.show_result(value, result)
+
+    @work(thread=True, exclusive=True, group="validate")
+    def validate_in_thread(self, value: str) -> None:
+        """Run the slow validators, giving up once a newer value cancels this worker.
+
+        A validator that was already running when the worker got cancelled still
+        finishes, and its result is kept even though it isn't shown.
+        """
+        worker = get_current_worker()
+        result = self.validation.validate_slow(value, lambda: worker.is_cancelled)
+        if result is not None:
+            self.app.call_from_thread(self.show_result, value, result)
+
+    def show_result(self, value: str, result: ValidationResult) -> None:
+        """Keep the result for `value`, and show it unless the input has moved on.
+
+        The dialog is only restyled when validity flips, and the subtitle only
+        changes with the failure it describes.
+        """
+        self.validation.remember(value, result)
+        if value != self.query_one(Input).value:
+            return
+        if result.is_valid != self.valid:
+            self.valid = result.is_valid
+            # restyling the group restyles the input in it, so that's one restyle
+            self.query_one(Input).set_class(not self.valid, "-invalid", update=False)
+            self.horizontal_group.set_classes("valid" if self.valid else "invalid")
+        self.horizontal_group.border_subtitle = (
+            self.border_subtitle
+            if result.is_valid
+            else str(result.failure_descriptions[0])
+        )
+        if self.submitting == value:
+            self.submitting = None
+            self.submit(value, result)
 
     def on_mount(self) -> None:
         self.horizontal_group: HorizontalGroup = self.query_one(HorizontalGroup)
@@ -58,21 +197,23 @@ class ModalInput(ModalScreen):
         if self.border_subtitle != "":
             self.horizontal_group.border_subtitle = self.border_subtitle
         inp.focus()
-        inp.validate(inp.value)
-        self.on_input_changed(inp.Changed(inp, inp.value))
+        self.check(inp.value)
 
-    @work
-    async def on_input_submitted(self, event: Input.Submitted) -> None:
+    def on_input_submitted(self, event: Input.Submitted) -> None:
         """Handle input submission."""
-        if not self.query_one(Input).is_valid:
-            # shake
-            for i in range(3):
-                self.horizontal_group.styles.offset = (1, 0)
-                await sleep(0.1)
-                self.horizontal_group.styles.offset = (0, 0)
-                await sleep(0.1)
+        result = self.validation.cached(event.value)
+        if result is None:
+            # the slow validators are still at it, so submit once they're done
+            self.submitting = event.value
             return
-        self.dismiss(event.input.value)
+        self.submit(event.value, result)
+
+    def submit(self, value: str, result: ValidationResult) -> None:
+        """Dismiss with `value` if it's valid, shake the dialog if not."""
+        if result.is_valid:
+            self.dismiss(value)
+        else:
+            shake(self.horizontal_group)
 
     def on_key(self, event: events.Key) -> None:
         """Handle escape key to dismiss the dialog."""
@@ -0,0 +1,435 @@
+"""Drag something out of a widget, with a ghost following the mouse.
+
+Wrap the widget drags start from in a `DragController`, and tell it what a
+drag carries:
+
+    def compose(self) -> ComposeResult:
+        with DragController(payload=self.selected_songs):
+            yield SelectionList(...)
+
+    def on_drag_controller_dropped(self, event: DragController.Dropped) -> None:
+        ...
+
+The controller follows the mouse as the app handles it, from its
+`message_signal`, while its screen is on top. A press is hit-tested once, and
+if the topmost widget under it is in a wrapped widget, that one captures the
+mouse there and then, before the app routes whatever comes next. Moves are not
+hit-tested here, though Textual's own routing of each one, which hit-tests it
+and renders the line under it, is most of what a move costs. The first move
+with something to carry shows the ghost, mounted once along with the
+controller. After that each move only books the ghost's offset, which is
+applied at most once per frame, laying the screen out. The widget under the
+release is found with one hit-test, skipping the ghost, and posted in a
+`Dropped` message.
+
+The wrapped widget still gets its clicks, as it has the mouse captured.
+
+Given `DropTargets`, a drag only ends on the widgets registered with them,
+found in their index instead of by hit-testing. The target under the mouse is
+looked up once a frame, and gets `Entered` and `Left` when the drag moves onto
+and off it, `Over` when it moves to another cell of it and `Dropped` when it
+ends on it:
+
+    self.targets = DropTargets()
+    with DragController(payload=self.selected_cards, targets=self.targets):
+        ...
+
+    def on_mount(self) -> None:
+        self.targets.register(*self.query(Column))
+"""
+
+from bisect import bisect_right, insort
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import partial
+from typing import Any
+from weakref import WeakKeyDictionary, WeakSet
+
+from textual import events
+from textual.errors import NoWidget
+from textual.geometry import Offset, Region
+from textual.message import Message
+from textual.screen import Screen
+from textual.widget import Widget
+from textual.widgets import Static
+
+Row = tuple[list[int], list[tuple[int, Widget]]]
+"""The starts of a screen row's runs, and the end and target of each."""
+
+
+class DropTargets:
+    """Widgets a drag can end on, indexed by where they are on screen.
+
+    For every screen row, the index keeps the runs of cells each target shows
+    on it, sorted and without overlaps, so finding the target at a point is a
+    dict lookup and a bisect. Where targets overlap, the one drawn on top owns
+    the cells, which makes a card the target rather than the column it is in.
+
+    The index is rebuilt on the first lookup after a target is registered,
+    unregistered, resized, shown or hidden, after anything a target is in
+    scrolls, and after the app is resized. Anything else that moves targets,
+    such as removing a widget above them, needs a call to `invalidate`.
+    Moving the ghost lays the screen out every frame, and doesn't count.
+    """
+
+    def __init__(self) -> None:
+        self.widgets: WeakSet[Widget] = WeakSet()
+        self.rows: dict[int, Row] = {}
+        self.rebuilds = 0
+        """Times the rows were rebuilt, for benchmarks."""
+        # containers of targets, watched for scrolling, and the targets in each
+        self._scrollers: WeakKeyDictionary[Widget, WeakSet[Widget]] = (
+            WeakKeyDictionary()
+        )
+        self._stale = True
+
+    def register(self, *widgets: Widget) -> None:
+        """Let drags end on `widgets`, which have to be mounted."""
+        for widget in widgets:
+            if widget in self.widgets:
+                continue
+            self.widgets.add(widget)
+            widget.message_signal.subscribe(widget, self.target_handled, immediate=True)
+            for ancestor in widget.ancestors:
+                if not isinstance(ancestor, Widget):
+                    continue
+                served = self._scrollers.get(ancestor)
+                if served is None:
+                    served = self._scrollers[ancestor] = WeakSet()
+                    scrolled = partial(self.scrolled, ancestor)
+                    ancestor.watch(ancestor, "scroll_x", scrolled, init=False)
+                    ancestor.watch(ancestor, "scroll_y", scrolled, init=False)
+                served.add(widget)
+        self._stale = True
+
+    def unregister(self, *widgets: Widget) -> None:
+        """Stop drags from ending on `widgets`, and stop watching what they were in."""
+        for widget in widgets:
+            if widget in self.widgets:
+                self.widgets.discard(widget)
+                widget.message_signal.unsubscribe(widget)
+        for container, served in list(self._scrollers.items()):
+            for widget in widgets:
+                served.discard(widget)
+            if not served:
+                del self._scrollers[container]
+                self._unwatch(container)
+        self._stale = True
+
+    def _unwatch(self, container: Widget) -> None:
+        """Take out the scroll watchers `register` added to `container`."""
+        # Textual has no unwatch, so they come out of its list of the container's watchers
+        watchers = getattr(container, "__watchers", {})
+        for name in ("scroll_x", "scroll_y"):
+            if name in watchers:
+                watchers[name] = [
+                    (node, callback)
+                    for node, callback in watchers[name]
+                    if not (
+                        isinstance(callback, partial) and callback.func == self.scrolled
+                    )
+                ]
+
+    def invalidate(self) -> None:
+        """Check where the targets are on the next lookup."""
+        self._stale = True
+
+    def target_handled(self, message: Message) -> None:
+        """Invalidate the index when a target was laid out anew."""
+        if isinstance(message, (events.Resize, events.Show, events.Hide)):
+            self._stale = True
+
+    def scrolled(self, container: Widget) -> None:
+        """Invalidate the index when a target's container scrolls, and once it is drawn."""
+        self._stale = True
+        # a lookup before the next frame would find the targets where they were
+        container.call_after_refresh(self.invalidate)
+
+    def target_at(self, screen: Screen, offset: Offset) -> Widget | None:
+        """Find the target at a point, rebuilding the index first if it is stale.
+
+        Returns:
+            The target shown at `offset` on `screen`, if any.
+        """
+        if self._stale:
+            self.update(screen)
+        row = self.rows.get(offset.y)
+        if row is None:
+            return None
+        starts, runs = row
+        index = bisect_right(starts, offset.x) - 1
+        if index < 0:
+            return None
+        end, widget = runs[index]
+        return widget if offset.x < end else None
+
+    def update(self, screen: Screen) -> None:
+        """Rebuild the rows from where the targets were last drawn."""
+        self._stale = False
+        self.rebuilds += 1
+        # topmost first, and only what was drawn in the last update
+        visible = screen._compositor.visible_widgets
+        placements: dict[Widget, Region] = {}
+        for widget in self.widgets:
+            if widget in visible:
+                region, clip = visible[widget]
+                placements[widget] = region.intersection(clip)
+        rows: dict[int, list[tuple[int, int, Widget]]] = {}
+        depth = {widget: depth for depth, widget in enumerate(visible)}
+        # painted bottom up, each target cutting into the runs it covers
+        for widget in sorted(placements, key=depth.__getitem__, reverse=True):
+            x, y, width, height = placements[widget]
+            for row in range(y, y + height):
+                _paint(rows.setdefault(row, []), x, x + width, widget)
+        self.rows = {
+            row: ([start for start, _, _ in runs], [(end, w) for _, end, w in runs])
+            for row, runs in rows.items()
+        }
+
+
+def _paint(
+    runs: list[tuple[int, int, Widget]], start: int, end: int, widget: Widget
+) -> None:
+    """Give `widget` the cells from `start` to `end` of a row's sorted `runs`."""
+    index = bisect_right(runs, start, key=lambda run: run[0])
+    if index and runs[index - 1][1] > start:
+        index -= 1
+    covered = index
+    while covered < len(runs) and runs[covered][0] < end:
+        covered += 1
+    kept = []
+    for run_start, run_end, run_widget in runs[index:covered]:
+        if run_start < start:
+            kept.append((run_start, start, run_widget))
+        if run_end > end:
+            kept.append((end, run_end, run_widget))
+    runs[index:covered] = kept
+    insort(runs, (start, end, widget), key=lambda run: run[0])
+
+
+@dataclass
+class DragMessage(Message):
+    """Base for the messages a `DragController` posts."""
+
+    controller: "DragController"
+    payload: Any
+    """What `payload` returned when the drag started."""
+    target: Widget | None
+
+    @property
+    def control(self) -> "DragController":
+        return self.controller
+
+
+class DragGhost(Static):
+    """What is being dragged, shown under the mouse."""
+
+    DEFAULT_CSS = """
+    DragGhost {
+        overlay: screen;
+        position: absolute;
+        constrain: none;
+        display: none;
+        width: auto;
+        border: round $accent;
+    }
+    """
+
+
+class DragController(Widget):
+    """Lets what the widgets inside it hold be dragged out of them."""
+
+    DEFAULT_CSS = """
+    DragController {
+        width: 1fr;
+        height: 1fr;
+    }
+    """
+
+    GHOST_OFFSET = Offset(1, 1)
+    """Where the ghost's corner is from the pointer."""
+
+    @dataclass
+    class Entered(DragMessage):
+        """Posted to a drop target when a drag moves onto it."""
+
+    @dataclass
+    class Over(DragMessage):
+        """Posted to a drop target when a drag moves to another cell within it."""
+
+        offset: Offset
+        """Where the mouse is, relative to the target."""
+
+    @dataclass
+    class Left(DragMessage):
+        """Posted to a drop target when a drag moves off it, or ends elsewhere."""
+
+    @dataclass
+    class Dropped(DragMessage):
+        """Posted when a drag ends, to its target if there is one.
+
+        `target` is the drop target under the mouse when it was released, or
+        without drop targets, the topmost widget under it. A drag released
+        within a frame of starting gets no `Entered` before it.
+        """
+
+    def __init__(
+        self,
+        *children: Widget,
+        payload: Callable[[], Any],
+        label: Callable[[Any], str] = str,
+        targets: DropTargets | None = None,
+        id: str | None = None,
+        classes: str | None = None,
+    ) -> None:
+        """
+        Args:
+            children: The widgets drags start from.
+            payload: Returns what a drag starting now would carry, or something
+                falsy if there is nothing to drag.
+            label: What the ghost shows for a payload.
+            targets: The only widgets drags end on, if given.
+        """
+        super().__init__(*children, id=id, classes=classes)
+        self.payload_factory = payload
+        self.label = label
+        self.targets = targets
+        self.ghost = DragGhost()
+        self.payload: Any = None
+        """What is being dragged, None between drags."""
+        self.source: Widget | None = None
+        """The child the mouse was pressed on, which has it captured."""
+        self.hovered: Widget | None = None
+        """The drop target the drag is over."""
+        self.over: Offset | None = None
+        """Where the last `Over` had the mouse, relative to `hovered`."""
+        # mouse events that bubbled up through here, on their way to the app
+        self._bubbled: WeakSet[events.MouseEvent] = WeakSet()
+        # where the mouse is on screen next frame, and whether a frame is booked for it
+        self.pointer: Offset | None = None
+        self._move_scheduled = False
+        self.moves = 0
+        """Moves seen while the mouse was down, for benchmarks."""
+
+    def on_mount(self) -> None:
+        self.mount(self.ghost)
+        self.app.message_signal.subscribe(self, self.app_handled, immediate=True)
+
+    def app_handled(self, message: Message) -> None:
+        """Follow the mouse as the app handles it, before it handles anything else."""
+        if isinstance(message, events.Resize) and self.targets is not None:
+            # targets may have moved once the screen is laid out for the new size
+            self.call_after_refresh(self.targets.invalidate)
+            return
+        if not isinstance(message, events.MouseEvent) or message in self._bubbled:
+            # not input, or forwarded by the app already and handled when it was
+            return
+        if not self.screen.is_active:
+            # meant for a screen on top of this one
+            return
+        if self.source is None:
+            if isinstance(message, events.MouseDown):
+                self.press(message.screen_offset)
+        elif isinstance(message, events.MouseMove):
+            if message.button:
+                self.move(message.screen_offset)
+        elif isinstance(message, events.MouseUp):
+            self.end_drag(message.screen_offset)
+
+    def on_mouse_down(self, event: events.MouseDown) -> None:
+        self._bubbled.add(event)
+
+    def on_mouse_move(self, event: events.MouseMove) -> None:
+        self._bubbled.add(event)
+
+    def on_mouse_up(self, event: events.MouseUp) -> None:
+        self._bubbled.add(event)
+
+    def press(self, offset: Offset) -> None:
+        """Have the child pressed at `offset` capture the mouse, if any is."""
+        try:
+            widget, _ = self.screen.get_widget_at(*offset)
+        except NoWidget:
+            return
+        # the child the topmost widget under the mouse is in, if it is in one
+        self.source = next(
+            (
+                node
+                for node in widget.ancestors_with_self
+                if node.parent is self and node is not self.ghost
+            ),
+            None,
+        )
+        if self.source is not None:
+            self.source.capture_mouse()
+
+    def move(self, offset: Offset) -> None:
+        """Carry the payload to `offset`, starting the drag if it is yet to start."""
+        self.moves += 1
+        if self.payload is None:
+            self.payload = self.payload_factory() or None
+            if self.payload is None:
+                return
+            # the screen began selecting text on the press, and would go on
+            # selecting everything the drag passes over
+            self.screen.clear_selection()
+            self.ghost.update(self.label(self.payload))
+            self.ghost.display = True
+        self.pointer = offset
+        if not self._move_scheduled:
+            self._move_scheduled = True
+            self.call_after_refresh(self.flush_move)
+
+    def flush_move(self) -> None:
+        """Move the ghost to the latest position of the drag, and tell targets."""
+        self._move_scheduled = False
+        if self.pointer is None or self.payload is None:
+            return
+        pointer, self.pointer = self.pointer, None
+        # relative to the controller's content, and off the pointer, or the
+        # mouse would be over the ghost after each move and leave what's beneath
+        self.ghost.styles.offset = (
+            pointer - self.content_region.offset + self.GHOST_OFFSET
+        )
+        if self.targets is None:
+            return
+        target = self.targets.target_at(self.screen, pointer)
+        if target is not self.hovered:
+            if self.hovered is not None:
+                self.hovered.post_message(self.Left(self, self.payload, self.hovered))
+            self.hovered = target
+            self.over = None
+            if target is not None:
+                target.post_message(self.Entered(self, self.payload, target))
+        if target is not None:
+            offset = pointer - target.region.offset
+            if offset != self.over:
+                self.over = offset
+                target.post_message(self.Over(self, self.payload, target, offset))
+
+    def end_drag(self, offset: Offset) -> None:
+        """Release the mouse and drop what is being dragged at `offset`, if anything."""
+        self.source.release_mouse()
+        self.source = None
+        payload, self.payload = self.payload, None
+        self.pointer = None
+        hovered, self.hovered = self.hovered, None
+        self.over = None
+        if payload is None:
+            return
+        self.ghost.display = False
+        if self.targets is None:
+            target = next(
+                (
+                    widget
+                    for widget, _ in self.screen.get_widgets_at(*offset)
+                    if widget is not self.ghost
+                ),
+                None,
+            )
+            self.post_message(self.Dropped(self, payload, target))
+            return
+        target = self.targets.target_at(self.screen, offset)
+        if hovered is not None and hovered is not target:
+            hovered.post_message(self.Left(self, payload, hovered))
+        (target or self).post_message(self.Dropped(self, payload, target))
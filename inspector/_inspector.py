@@ -1,15 +1,34 @@
-from typing import cast
+import contextlib
+import time
+import weakref
+from collections.abc import Callable
+from typing import Literal, cast
+
+from overlay import Overlay
+from performance import PerformanceSampler, queue_depths, report
+from resizebar import ResizeBar
+from rich.style import Style
 from rich.text import TextType
 from textual import events, on
 from textual.app import ComposeResult
+from textual.await_remove import AwaitRemove
+from textual.binding import Binding
+from textual.color import Color
 from textual.containers import HorizontalGroup, VerticalGroup, VerticalScroll
 from textual.css.query import NoMatches, QueryType
+from textual.css.styles import RulesMap, Styles
 from textual.dom import BadIdentifier, DOMNode, check_identifiers
+from textual.errors import NoWidget
+from textual.geometry import Region
+from textual.message import Message
+from textual.timer import Timer
 from textual.validation import ValidationResult, Validator
-from textual.widgets import Input, Label, TabbedContent, TextArea, Tree
+from textual.widget import Widget
+from textual.widgets import Input, Label, Static, TabbedContent, TextArea, Tree
 from textual.widgets.tree import TreeDataType, TreeNode
 
-from resizebar import HorizontalResizeBar, VerticalResizeBar
+from patching import Patches
+from selector_index import SelectorIndex
 
 
 class CheckID(Validator):
@@ -24,6 +43,58 @@ class CheckID(Validator):
             return self.failure(str(exc))
 
 
+class CheckClasses(Validator):
+    def validate(self, value: str) -> ValidationResult:
+        try:
+            check_identifiers("class name", *value.split())
+            return self.success()
+        except BadIdentifier as exc:
+            return self.failure(str(exc))
+
+
+def outline(region: Region) -> tuple[Region, Region, Region, Region]:
+    """Split the edges of `region` into top, bottom, left and right strips.
+
+    Returns:
+        The four strips, some of them empty for regions one cell high or wide.
+    """
+    x, y, width, height = region
+    if not region:
+        return Region(), Region(), Region(), Region()
+    top = Region(x, y, width, 1)
+    bottom = Region(x, y + height - 1, width, 1) if height > 1 else Region()
+    left = Region(x, y + 1, 1, height - 2) if height > 2 else Region()
+    right = Region(x + width - 1, y + 1, 1, height - 2) if height > 2 else Region()
+    return top, bottom, left, right
+
+
+def css_block(selector: str, declarations: str) -> str:
+    """Format CSS declarations as a rule for `selector`.
+
+    Returns:
+        The rule, one declaration per indented line.
+    """
+    body = "".join(f"    {line}\n" for line in declarations.splitlines())
+    return f"{selector} {{\n{body}}}"
+
+
+def declarations(styles: Styles) -> str:
+    """The CSS of a rule's styles, including rules reset with `initial`.
+
+    Returns:
+        One declaration per line.
+    """
+    rules = styles.get_rules()
+    initial = [name for name, value in rules.items() if value is None]
+    if not initial:
+        return styles.css
+    # Styles.css can't render a None value
+    kept = {name: value for name, value in rules.items() if value is not None}
+    css = Styles(_rules=cast(RulesMap, kept), important=styles.important).css
+    resets = [f"{name.replace('_', '-')}: initial;" for name in initial]
+    return "\n".join([css, *resets] if css else resets)
+
+
 class DOMTree(Tree):
     DEFAULT_CSS = """
     DOMTree {
@@ -31,6 +102,20 @@ class DOMTree(Tree):
         height: 1fr
     }
     """
+    BINDINGS = [Binding("asterisk", "expand_all", "Expand all", show=False)]
+
+    class HoverChanged(Message):
+        """Posted when the mouse moves to a line showing another DOMNode, or off them."""
+
+        def __init__(self, tree: "DOMTree", dom_node: DOMNode | None) -> None:
+            super().__init__()
+            self.tree = tree
+            self.dom_node = dom_node
+            """The DOMNode now under the mouse, or None."""
+
+        @property
+        def control(self) -> "DOMTree":
+            return self.tree
 
     def __init__(
         self,
@@ -45,7 +130,209 @@ class DOMTree(Tree):
         super().__init__(
             label, data, name=name, id=id, classes=classes, disabled=disabled
         )
-        self.prev_hovered_index = -1
+        # the DOMNode shown on each line, rebuilt along with the tree's lines
+        self.line_data: list[DOMNode | None] = []
+        self.hovered: DOMNode | None = None
+        # the DOM being shown, and the tree node showing each DOMNode in it
+        self.dom_root: DOMNode | None = None
+        self.ignore: DOMNode | None = None
+        self.tree_nodes: dict[DOMNode, TreeNode] = {}
+        self.labels: dict[DOMNode, str] = {}
+        # DOMNodes whose children have been added, on their first expand
+        self.loaded: set[DOMNode] = set()
+        # DOMNodes whose children may have changed since the last sync
+        self.dirty: set[DOMNode] = set()
+        # sync as soon as the DOM changes, rather than on the next sync() call
+        self.live = False
+        self._sync_scheduled = False
+
+    @staticmethod
+    def make_label(dom_node: DOMNode) -> str:
+        label = f"[bold]{type(dom_node).__name__}[/bold]"
+        if dom_node.id:
+            label += f' [cyan]id="{dom_node.id}"[/cyan]'
+        if dom_node.classes:
+            label += f' [green]class="{" ".join(dom_node.classes)}"[/green]'
+        return label
+
+    def attach(self, dom_root: DOMNode, ignore: DOMNode | None = None) -> None:
+        """Show the DOM under `dom_root`, leaving out `ignore` and its children.
+
+        Nothing is built until the next `sync()`, and then only the children of
+        `dom_root`; the children of every other node are added when it is expanded.
+        """
+        self.clear()
+        self.dom_root = dom_root
+        self.ignore = ignore
+        self.tree_nodes = {dom_root: self.root}
+        self.labels = {}
+        self.loaded = {dom_root}
+        self.dirty = {dom_root}
+
+    def dom_node_of(self, tree_node: TreeNode) -> DOMNode | None:
+        return self.dom_root if tree_node is self.root else tree_node.data
+
+    def load(self, tree_node: TreeNode) -> None:
+        """Add the children of `tree_node`, unless they already were."""
+        dom_node = self.dom_node_of(tree_node)
+        if dom_node is None or dom_node in self.loaded:
+            return
+        self.loaded.add(dom_node)
+        self.sync_children(dom_node, tree_node)
+
+    def _toggle_node(self, node: TreeNode) -> None:
+        # load before expanding, so the children show up in the same frame
+        if not node.is_expanded:
+            self.load(node)
+        super()._toggle_node(node)
+
+    @on(Tree.NodeExpanded)
+    def load_expanded(self, event: Tree.NodeExpanded) -> None:
+        # anything expanded some other way, e.g. TreeNode.expand()
+        self.load(event.node)
+
+    def action_expand_all(self) -> None:
+        """Load and expand everything under the cursor node, or the whole DOM."""
+        node = self.cursor_node or self.root
+
+        def load_all(tree_node: TreeNode) -> None:
+            self.load(tree_node)
+            for child_node in tree_node.children:
+                load_all(child_node)
+
+        load_all(node)
+        node.expand_all()
+
+    def _build(self) -> None:
+        super()._build()
+        self.line_data = [line.node.data for line in self._tree_lines_cached or ()]
+        # lines may have moved under a mouse that didn't
+        self.update_hovered()
+
+    def _invalidate(self) -> None:
+        # Tree also lays out the screen here, on every node added or expanded and
+        # every restyle. The size of the lines only changes in _build, where
+        # setting virtual_size lays out by itself when it does.
+        self._clear_line_cache()
+        self._updates += 1
+        self.root._reset()
+        self.refresh()
+
+    def watch_hover_line(self, previous_hover_line: int, hover_line: int) -> None:
+        super().watch_hover_line(previous_hover_line, hover_line)
+        self.update_hovered()
+
+    def update_hovered(self) -> None:
+        """Post `HoverChanged` if the DOMNode under the mouse is another one."""
+        line = self.hover_line
+        dom_node = self.line_data[line] if 0 <= line < len(self.line_data) else None
+        if dom_node is not self.hovered:
+            self.hovered = dom_node
+            self.post_message(self.HoverChanged(self, dom_node))
+
+    def mark(self, dom_node: DOMNode) -> None:
+        """Note that the children of `dom_node` may have changed."""
+        tree_node = self.tree_nodes.get(dom_node)
+        if tree_node is None:
+            # not shown, so it gets built along with its shown ancestor
+            return
+        if dom_node not in self.loaded:
+            # only whether it can be expanded is shown
+            tree_node.allow_expand = bool(self.shown_children(dom_node))
+            return
+        self.dirty.add(dom_node)
+        if self.live and not self._sync_scheduled:
+            self._sync_scheduled = True
+            self.call_after_refresh(self.sync)
+
+    def sync(self) -> None:
+        """Bring the children of every marked DOMNode up to date."""
+        self._sync_scheduled = False
+        dirty, self.dirty = self.dirty, set()
+        for dom_node in dirty:
+            tree_node = self.tree_nodes.get(dom_node)
+            if tree_node is not None:
+                self.sync_children(dom_node, tree_node)
+
+    def shown_children(self, dom_node: DOMNode) -> list[DOMNode]:
+        """The children of `dom_node`, leaving out `ignore` and any being removed.
+
+        Returns:
+            The children the tree shows, in order.
+        """
+        return [
+            child
+            for child in dom_node.children
+            if child is not self.ignore and not child._pruning
+        ]
+
+    def sync_children(self, dom_node: DOMNode, tree_node: TreeNode) -> None:
+        """Add, remove and reorder the children of `tree_node` to match `dom_node`."""
+        children = self.shown_children(dom_node)
+        wanted = set(children)
+        existing: dict[DOMNode, TreeNode] = {}
+        for child_node in list(tree_node.children):
+            if child_node.data in wanted:
+                existing[child_node.data] = child_node
+            else:
+                self.forget(child_node)
+                child_node.remove()
+        if list(existing) != [child for child in children if child in existing]:
+            # moved around, rare enough to just rebuild this level
+            for child_node in existing.values():
+                self.forget(child_node)
+                child_node.remove()
+            existing = {}
+        previous: TreeNode | None = None
+        for child in children:
+            child_node = existing.get(child)
+            if child_node is None:
+                if (moved := self.tree_nodes.get(child)) is not None:
+                    self.forget(moved)
+                    moved.remove()
+                siblings = tree_node.children
+                if previous is None and siblings:
+                    position = {"before": 0}
+                elif previous is None or previous is siblings[-1]:
+                    position = {}
+                else:
+                    position = {"after": previous}
+                label = self.labels[child] = self.make_label(child)
+                child_node = tree_node.add(
+                    label,
+                    data=child,
+                    allow_expand=bool(child.children),
+                    **position,
+                )
+                self.tree_nodes[child] = child_node
+            else:
+                self.relabel_node(child, child_node)
+                if child_node.allow_expand != bool(child.children):
+                    child_node.allow_expand = bool(child.children)
+            previous = child_node
+
+    def forget(self, tree_node: TreeNode) -> None:
+        """Drop `tree_node` and everything under it from the DOMNode mapping."""
+        dom_node = tree_node.data
+        if self.tree_nodes.get(dom_node) is tree_node:
+            del self.tree_nodes[dom_node]
+            self.labels.pop(dom_node, None)
+            self.loaded.discard(dom_node)
+        for child_node in tree_node.children:
+            self.forget(child_node)
+
+    def relabel_node(self, dom_node: DOMNode, tree_node: TreeNode) -> None:
+        """Update the label of `tree_node` if the id or classes of `dom_node` changed."""
+        label = self.make_label(dom_node)
+        if self.labels.get(dom_node) != label:
+            self.labels[dom_node] = label
+            tree_node.set_label(label)
+
+    def relabel(self) -> None:
+        """Update every label whose DOMNode's id or classes changed."""
+        for dom_node, tree_node in self.tree_nodes.items():
+            if tree_node is not self.root:
+                self.relabel_node(dom_node, tree_node)
 
 
 class Inspector(HorizontalGroup):
@@ -53,9 +340,6 @@ class Inspector(HorizontalGroup):
     Inspector {
         dock: right;
         width: 0.25fr;
-        &.-hide {
-            width: 0;
-        }
         #tabcontentwrapper {
             height: 0.5fr
         }
@@ -93,32 +377,61 @@ class Inspector(HorizontalGroup):
                 width: 1fr;
             }
         }
-        &:focus HorizontalResizeBar,
-        &:focus-within HorizontalResizeBar {
+        &:focus-within ResizeBar.-horizontal {
             border-left: outer $border
         }
-        &:focus VerticalResizeBar,
-        &:focus-within VerticalResizeBar {
+        &:focus-within ResizeBar.-vertical {
             border-top: outer $border
         }
     }
     """
 
-    def __init__(self) -> None:
-        super().__init__(classes="-hide")
+    CSS_DELAY = 0.05
+    """Seconds the tree cursor has to rest before the CSS tab follows it."""
+    EDIT_DELAY = 0.3
+    """Seconds after the last keystroke in the ID or classes input before it applies."""
+
+    def __init__(self, highlight: Literal["overlay", "fill"] = "overlay") -> None:
+        """
+        Args:
+            highlight: How to show the widget hovered in the DOM tree, "overlay"
+                draws a box around it, "fill" tints all of it with the accent.
+        """
+        super().__init__()
+        self.is_open = False
         self.visible = False
-        self.forced_width = None
+        # hidden takes no room, and shown keeps the width its ResizeBar gave it
+        self.display = False
+        self.highlight_mode = highlight
+        self.highlighted: DOMNode | None = None
+        self.highlight_box = Overlay()
+        # the CSS of each DOMNode, and the version of its styles it was made from
+        self.css_cache: weakref.WeakKeyDictionary[DOMNode, tuple[int, str]] = (
+            weakref.WeakKeyDictionary()
+        )
+        self.shown_css: str | None = None
+        self.shown_rules: str | None = None
+        # the DOMNode the CSS and Rules tabs show
+        self.styled: DOMNode | None = None
+        self.selector_index: SelectorIndex | None = None
+        # only counts while the inspector is shown
+        self.sampler = PerformanceSampler()
+        self.css_timer: Timer | None = None
+        self.last_highlighted = 0.0
+        # ID and class edits not applied yet, and the DOMNode they are for
+        self.pending_edit: tuple[DOMNode, dict[str, str]] | None = None
+        self.edit_timer: Timer | None = None
 
     def compose(self) -> ComposeResult:
-        yield HorizontalResizeBar(self)
+        yield ResizeBar(self, minimum=20, persist="inspector-width")
         with VerticalGroup():
             tree = DOMTree("Application")
             tree.guide_depth = 1
             yield tree
             tabarea = VerticalGroup(id="tabcontentwrapper")
             with tabarea:
-                yield VerticalResizeBar(tabarea)
-                with TabbedContent("CSS", "ID & Classes"):
+                yield ResizeBar(tabarea, "vertical", persist="inspector-tabs-height")
+                with TabbedContent("CSS", "ID & Classes", "Rules", "Performance"):
                     with VerticalGroup(id="css"):
                         yield TextArea(
                             language="css",
@@ -141,18 +454,42 @@ class Inspector(HorizontalGroup):
                             yield Label("Classes")
                             yield Input(
                                 placeholder="No Classes",
+                                validators=[CheckClasses()],
                                 validate_on=["changed"],  # ty: ignore[invalid-argument-type]
                                 valid_empty=True,
                             )
+                    with VerticalGroup(id="rules"):
+                        yield TextArea(
+                            language="css",
+                            read_only=True,
+                            soft_wrap=False,
+                            compact=True,
+                            placeholder="No rules",
+                        )
+                    with VerticalScroll(id="performance"):
+                        yield Static(markup=False)
 
     def on_mount(self) -> None:
-        self.app.DEFAULT_CSS += """
-/* .-highlight *, */
-.-highlight {
-  /* hatch: "╲" skyblue !important; */
-  background: $accent 50% !important;
-}
-"""
+        self.watch_dom()
+        self.sample_timer = self.set_interval(1, self.show_performance, pause=True)
+
+    def on_unmount(self) -> None:
+        # leave the app and the screen's compositor as they were
+        self.dom_patches.stop()
+        self.app.screen_change_signal.unsubscribe(self)
+        self.highlight_box.clear()
+
+    @property
+    def visible(self) -> bool:
+        return Widget.visible.fget(self)  # ty: ignore[call-non-callable]
+
+    @visible.setter
+    def visible(self, visible: bool) -> None:
+        changed = visible != self.visible
+        Widget.visible.fset(self, visible)  # ty: ignore[call-non-callable]
+        if changed:
+            # Textual doesn't send Show to a widget that isn't displayed
+            self.post_message(events.Show() if visible else events.Hide())
 
     def has_child(self, child: type[QueryType] | str | None = None) -> bool:
         if child is None:
@@ -168,9 +505,61 @@ class Inspector(HorizontalGroup):
 
     @on(events.Hide)
     def on_hide(self, _: events.Hide | None = None) -> None:
-        self.forced_width = self.styles.width
-        self.styles.width = 0
-        self.add_class("-hide")
+        if not self.is_open:
+            return
+        self.is_open = False
+        self.display = False
+        self.query_one(DOMTree).live = False
+        self.highlight(None)
+        self.sampler.stop()
+        self.sample_timer.pause()
+        self.apply_edit()
+
+    def watch_dom(self) -> None:
+        """Mark the DOMTree for a sync whenever widgets are mounted or removed.
+
+        Textual has no event for either that reaches anything but the widgets
+        themselves, so the app's `_register` and `_prune` are wrapped until the
+        Inspector is unmounted.
+        """
+        app = self.app
+
+        def watched_register(
+            register: Callable[..., list[Widget]],
+            parent: DOMNode,
+            *widgets: Widget,
+            **kwargs,
+        ) -> list[Widget]:
+            registered = register(parent, *widgets, **kwargs)
+            self.dom_changed(parent)
+            return registered
+
+        def watched_prune(
+            prune: Callable[..., AwaitRemove],
+            *widgets: Widget,
+            parent: DOMNode | None = None,
+        ) -> AwaitRemove:
+            parents = (
+                {widget.parent for widget in widgets} if parent is None else {parent}
+            )
+            await_remove = prune(*widgets, parent=parent)
+            # the widgets are still children until their tasks end, but are pruning
+            for removed_from in parents:
+                if removed_from is not None:
+                    self.dom_changed(removed_from)
+            return await_remove
+
+        self.dom_patches = Patches(
+            (app, "_register", watched_register), (app, "_prune", watched_prune)
+        )
+        self.dom_patches.start()
+        app.screen_change_signal.subscribe(self, lambda _: self.dom_changed(app))
+
+    def dom_changed(self, parent: DOMNode) -> None:
+        if parent is self or self in parent.ancestors:
+            return
+        with contextlib.suppress(NoMatches):
+            self.query_one(DOMTree).mark(parent)
 
     async def make_tree(self) -> DOMTree:
         try:
@@ -178,55 +567,145 @@ class Inspector(HorizontalGroup):
         except NoMatches:
             tree = DOMTree("Application")
             await self.mount(tree)
-        tree: DOMTree = tree.clear()
-
-        def build_textual_tree(parent_node: TreeNode, dom_node: DOMNode) -> None:
-            for child in dom_node.query_children("*"):
-                if child is self:
-                    continue
-                node_type = type(child).__name__
-                label = f"[bold]{node_type}[/bold]"
-                if child.id:
-                    label += f' [cyan]id="{child.id}"[/cyan]'
-                if child.classes:
-                    label += f' [green]class="{" ".join(child.classes)}"[/green]'
-                if not child.query_children("*"):
-                    parent_node.add_leaf(label, data=child)
-                else:
-                    child_tree_node = parent_node.add(label, data=child)
-                    build_textual_tree(child_tree_node, child)
-
-        build_textual_tree(tree.root, self.app)
+        if tree.dom_root is not self.app:
+            tree.attach(self.app, ignore=self)
+        tree.sync()
+        tree.relabel()
         return tree
 
     @on(events.Show)
     async def on_show(self, _: events.Show | None = None) -> None:
-        self.remove_class("-hide")
+        if self.is_open:
+            return
+        self.is_open = True
         tree = await self.make_tree()
-        tree.focus()
-        tree.action_toggle_expand_all()
-        tree.action_toggle_expand_all()
-        tree.action_toggle_expand_all()
-        self.styles.width = self.forced_width
+        # one layout for showing the Inspector, moving the focus and growing the tree
+        with self.app.batch_update():
+            self.display = True
+            tree.live = True
+            tree.focus()
+            # show the top-level widgets of each screen, press * to expand the rest
+            tree.root.expand()
+            for screen_node in tree.root.children:
+                tree.load(screen_node)
+                screen_node.expand()
+            # the tree sizes itself when it builds its lines, which it would do on idle
+            tree._build()
+        self.sampler.start()
+        self.sample_timer.resume()
 
     @on(DOMTree.NodeHighlighted)
     async def on_tree_node_highlighted(self, event: DOMTree.NodeHighlighted) -> None:
+        # edits belong to the node they were typed for
+        self.apply_edit()
         if isinstance(event.node.data, DOMNode):
-            # first id and classes
-            if event.node.data.id is None:
-                self.query_one("#id > Input", Input).value = ""
-            else:
-                self.query_one("#id > Input", Input).value = event.node.data.id
-            if event.node.data.id is None:
-                self.query_one("#classes > Input", Input).value = ""
-            else:
+            # first id and classes, without their Changed writing them back
+            with self.prevent(Input.Changed):
+                self.query_one("#id > Input", Input).value = event.node.data.id or ""
                 self.query_one("#classes > Input", Input).value = " ".join(
                     event.node.data.classes
                 )
-            # then css dump
-            self.query_one("#css > TextArea", TextArea).load_text(
-                event.node.data.styles.base.css
+            # then css dump, once the cursor stops if it is moving fast
+            dom_node = event.node.data
+            now = time.monotonic()
+            if self.css_timer is not None:
+                self.css_timer.stop()
+                self.css_timer = None
+            if now - self.last_highlighted > self.CSS_DELAY:
+                self.show_css(dom_node)
+            else:
+                self.css_timer = self.set_timer(
+                    self.CSS_DELAY, lambda: self.show_css(dom_node)
+                )
+            self.last_highlighted = now
+
+    def node_css(self, dom_node: DOMNode) -> str:
+        """The CSS of `dom_node`'s base styles, generated again only if they changed.
+
+        Returns:
+            The CSS text.
+        """
+        base = dom_node.styles.base
+        cached = self.css_cache.get(dom_node)
+        # Styles._updates goes up on every change to the rules
+        if cached is None or cached[0] != base._updates:
+            cached = self.css_cache[dom_node] = (base._updates, base.css)
+        return cached[1]
+
+    def show_css(self, dom_node: DOMNode) -> None:
+        """Load the CSS of `dom_node` into the CSS tab, unless it is already there."""
+        self.css_timer = None
+        self.styled = dom_node
+        css = self.node_css(dom_node)
+        if css != self.shown_css:
+            self.shown_css = css
+            self.query_one("#css > TextArea", TextArea).load_text(css)
+        self.show_rules()
+
+    def rules_text(self, dom_node: DOMNode) -> str:
+        """The computed styles of `dom_node`, then the rules behind them.
+
+        Returns:
+            CSS, with a comment above each rule saying where it is from and how
+            specific it is. The winning rule comes last.
+        """
+        stylesheet = self.app.stylesheet
+        index = self.selector_index
+        if index is None or not index.is_current(stylesheet):
+            index = self.selector_index = SelectorIndex(stylesheet)
+        restyled_on = [
+            pseudo_class
+            for pseudo_class, flag in (
+                ("hover", dom_node._has_hover_style),
+                ("focus-within", dom_node._has_focus_within),
             )
+            if flag
+        ]
+        heading = "computed"
+        if restyled_on:
+            heading += f", restyled on {' and '.join(restyled_on)}"
+        blocks = [
+            f"/* {heading} */\n"
+            + css_block(
+                dom_node.css_identifier
+                + "".join(f".{name}" for name in sorted(dom_node.classes)),
+                dom_node.styles.css,
+            )
+        ]
+        for match in index.matches(dom_node):
+            notes = [match.source, f"specificity {match.selector_set.specificity}"]
+            if match.sensitive:
+                notes.append(" ".join(f":{name}" for name in sorted(match.sensitive)))
+            if not match.matched:
+                notes.append("not matching now")
+            blocks.append(
+                f"/* {', '.join(notes)} */\n"
+                + css_block(match.selector_set.css, declarations(match.rule.styles))
+            )
+        return "\n\n".join(blocks)
+
+    def show_rules(self) -> None:
+        """Fill the Rules tab for the styled DOMNode, if the tab is open."""
+        rules = self.query_one("#rules", VerticalGroup)
+        if self.styled is None or (
+            self.query_one(TabbedContent).active_pane is not rules.parent
+        ):
+            return
+        text = self.rules_text(self.styled)
+        if text != self.shown_rules:
+            self.shown_rules = text
+            rules.query_one(TextArea).load_text(text)
+
+    def show_performance(self) -> None:
+        """Show what the sampler counted in the last second, if the tab is open."""
+        sample = self.sampler.take()
+        performance = self.query_one("#performance", VerticalScroll)
+        if self.query_one(TabbedContent).active_pane is performance.parent:
+            performance.query_one(Static).update(report(sample, queue_depths(self.app)))
+
+    @on(TabbedContent.TabActivated)
+    def on_tab_activated(self, _: TabbedContent.TabActivated) -> None:
+        self.show_rules()
 
     @on(Input.Changed, "#id > Input")
     @on(Input.Changed, "#classes > Input")
@@ -235,37 +714,100 @@ class Inspector(HorizontalGroup):
         domtree: DOMTree = self.query_one(DOMTree)
         if domtree.cursor_node is None or not event.input.is_valid:
             return
-        if not isinstance(domtree.cursor_node.data, DOMNode):
+        dom_node = domtree.cursor_node.data
+        if not isinstance(dom_node, DOMNode):
             return
-        if event.input.parent.id == "id":
-            domtree.cursor_node.data._nodes.updated()
-            domtree.cursor_node.data._id = event.value
-        elif event.input.parent.id == "classes":
-            domtree.cursor_node.data.classes = frozenset(event.value.split())
-
-    @on(events.MouseMove)
-    async def on_mouse_move(self, event: events.MouseMove) -> None:
-        if isinstance(event.widget, DOMTree) and event.widget.hover_line != -1:
-            node = event.widget.get_node_at_line(event.widget.hover_line)
-            if node is not None and isinstance(node.data, DOMNode):
-                async with self.batch():
-                    if event.widget.prev_hovered_index != -1:
-                        prev_hovered_node = event.widget.get_node_at_line(
-                            event.widget.prev_hovered_index
-                        )
-                        if prev_hovered_node is not None and isinstance(
-                            prev_hovered_node.data, DOMNode
-                        ):
-                            if prev_hovered_node.data is node.data:
-                                return
-                            prev_hovered_node.data.remove_class("-highlight")
-                    node.data.add_class("-highlight")
-                    event.widget.prev_hovered_index = event.widget.hover_line
+        if self.pending_edit is not None and self.pending_edit[0] is not dom_node:
+            self.apply_edit()
+        if self.pending_edit is None:
+            self.pending_edit = (dom_node, {})
+        self.pending_edit[1][event.input.parent.id or ""] = event.value
+        if self.edit_timer is not None:
+            self.edit_timer.stop()
+        self.edit_timer = self.set_timer(self.EDIT_DELAY, self.apply_edit)
+
+    @on(Input.Submitted, "#id > Input")
+    @on(Input.Submitted, "#classes > Input")
+    def submit_class_or_id(self) -> None:
+        self.apply_edit()
+
+    def apply_edit(self) -> None:
+        """Apply the pending ID and class edits together, restyling their node once."""
+        if self.edit_timer is not None:
+            self.edit_timer.stop()
+            self.edit_timer = None
+        edit, self.pending_edit = self.pending_edit, None
+        if edit is None:
+            return
+        dom_node, values = edit
+        restyle = False
+        if "id" in values and (values["id"] or None) != dom_node.id:
+            restyle = self.rename(dom_node, values["id"] or None)
+        if "classes" in values:
+            classes = set(values["classes"].split())
+            if classes != dom_node._classes:
+                dom_node._classes = classes
+                restyle = True
+        if not restyle:
+            return
+        # the node and its descendants, which is what the id and classes can affect
+        dom_node.update_node_styles()
+        domtree = self.query_one(DOMTree)
+        tree_node = domtree.tree_nodes.get(dom_node)
+        if tree_node is not None:
+            domtree.relabel_node(dom_node, tree_node)
+
+    def rename(self, dom_node: DOMNode, new_id: str | None) -> bool:
+        """Change the ID of `dom_node`, keeping its parent's index of IDs in step.
+
+        `DOMNode.id` can only be set once, so this does what it does, and also
+        moves the node in the parent's `NodeList` index used by `get_widget_by_id`.
+
+        Returns:
+            False if a sibling already has the ID, and nothing was changed.
+        """
+        siblings = None if dom_node._parent is None else dom_node._parent._nodes
+        if siblings is not None and new_id is not None:
+            existing = siblings._get_by_id(new_id)
+            if existing is not None and existing is not dom_node:
+                self.notify(
+                    f"{existing!r} already has the ID {new_id!r}", severity="error"
+                )
+                return False
+        if siblings is not None and dom_node.id is not None:
+            siblings._nodes_by_id.pop(dom_node.id, None)
+        dom_node._id = new_id
+        if siblings is not None and new_id is not None:
+            siblings._nodes_by_id[new_id] = dom_node  # ty: ignore[invalid-assignment]
+        # cached queries of its ancestors
+        dom_node._nodes.updated()
+        return True
+
+    def highlight(self, dom_node: DOMNode | None) -> None:
+        """Show `dom_node` as hovered, or nothing."""
+        if dom_node is self.highlighted:
+            return
+        region = Region()
+        if isinstance(dom_node, Widget):
+            # only the part that is on screen, widgets elsewhere get no box
+            with contextlib.suppress(NoWidget):
+                region = self.screen.find_widget(dom_node).visible_region
+        accent = Color.parse(self.app.theme_variables["accent"])
+        if self.highlight_mode == "fill":
+            self.highlight_box.cover(self.screen, [region], accent.with_alpha(0.5))
+        else:
+            self.highlight_box.cover(
+                self.screen, outline(region), Style(bgcolor=accent.rich_color)
+            )
+        self.highlighted = dom_node
+
+    @on(DOMTree.HoverChanged)
+    def on_hover_changed(self, event: DOMTree.HoverChanged) -> None:
+        self.highlight(event.dom_node)
 
     @on(events.Leave)
-    def on_mouse_leave(self, event: events.Leave) -> None:
-        domtree: DOMTree = self.query_one(DOMTree)
-        if domtree.prev_hovered_index != -1 and hasattr(
-            node := domtree.get_node_at_line(domtree.prev_hovered_index), "data"
-        ):
-            cast(DOMNode, node.data).remove_class("-highlight")
+    def on_mouse_leave(self, _: events.Leave) -> None:
+        if isinstance(self.app.mouse_over, DOMTree):
+            # the tree posts HoverChanged for itself
+            return
+        self.highlight(None)
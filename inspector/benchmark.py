@@ -0,0 +1,177 @@
+"""Time the Inspector's DOM tree against a synthetic app with 5k widgets.
+
+"open" is the whole toggle, from hidden to the tree on screen, which only
+builds the nodes it shows. "reopen" is the same with nothing changed and
+"reopen churned" after widgets were mounted and removed while hidden.
+"sync ms" is the part of each spent bringing the tree up to date with the DOM,
+"layouts" the relayouts of the screen during it and "layout ms" their time.
+"expand all" loads and expands every node, and "rebuild" builds and expands
+the whole tree from scratch, which is what every open used to cost.
+"cursor down" sends 2k down arrows at once, like a held key outrunning the
+app, moving the cursor through the expanded tree while the ID, classes and
+CSS tabs follow it.
+
+Run:
+    python benchmark.py
+    python benchmark.py --groups 100 --per-group 99
+"""
+
+import asyncio
+import sys
+import time
+from collections import Counter
+from collections.abc import Callable
+from pathlib import Path
+
+# the modules shared with the rest of the repository, such as patching, are at its root
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from _inspector import DOMTree, Inspector
+from textual import events
+from textual.app import App, ComposeResult
+from textual.binding import Binding
+from textual.containers import Vertical, VerticalScroll
+from textual.screen import Screen
+from textual.widgets import Label, TextArea
+
+from patching import Patches, Wrapper, patch
+
+
+class Content(VerticalScroll, can_focus=False):
+    """Non focusable, so opening the inspector doesn't restyle 5k widgets on blur."""
+
+
+class BigApp(App):
+    CSS = """
+    .group {
+        height: auto;
+        border-left: wide $primary;
+    }
+    .item {
+        padding: 0 1;
+    }
+    """
+    BINDINGS = [Binding("ctrl+d", "toggle_devtools_inspector")]
+
+    def __init__(self, groups: int, per_group: int) -> None:
+        super().__init__()
+        self.groups = groups
+        self.per_group = per_group
+
+    def compose(self) -> ComposeResult:
+        with Content(id="content"):
+            for group in range(self.groups):
+                with Vertical(id=f"group-{group}", classes="group"):
+                    for n in range(self.per_group):
+                        yield Label(f"label {group}.{n}", classes="item")
+        yield Inspector()
+
+    def action_toggle_devtools_inspector(self) -> None:
+        devtool = self.query_one(Inspector)
+        devtool.visible = not devtool.visible
+
+
+spent: Counter[str] = Counter()
+"""Seconds spent in each method timed by `timed_method`, during the current step."""
+calls: Counter[str] = Counter()
+"""And the number of calls to each."""
+
+
+def timed_method(name: str) -> Wrapper:
+    def timed_call(method: Callable[..., object], *args, **kwargs) -> object:
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            spent[name] += time.perf_counter() - start
+            calls[name] += 1
+
+    return timed_call
+
+
+async def timed(label: str, coroutine: object) -> None:
+    spent.clear()
+    calls.clear()
+    start = time.perf_counter()
+    await coroutine  # ty: ignore[invalid-await]
+    print(
+        f"{label:<14} {(time.perf_counter() - start) * 1000:>9.1f} ms"
+        f" {spent['sync'] * 1000:>9.1f} sync ms {calls['layout']:>4} layouts"
+        f" {spent['layout'] * 1000:>9.1f} layout ms"
+    )
+
+
+async def main(groups: int, per_group: int) -> None:
+    app = BigApp(groups, per_group)
+    with Patches(
+        (DOMTree, "sync", timed_method("sync")),
+        (Screen, "_refresh_layout", timed_method("layout")),
+    ):
+        async with app.run_test(size=(160, 50)) as pilot:
+            inspector = app.query_one(Inspector)
+            tree = inspector.query_one(DOMTree)
+            print(f"{len(list(app.screen.walk_children()))} widgets")
+
+            async def rebuild() -> None:
+                tree.attach(app, ignore=inspector)
+                await inspector.make_tree()
+                tree.action_expand_all()
+                await pilot.pause()
+
+            async def churn() -> None:
+                content = app.query_one("#content")
+                await content.mount_all(Label(f"new {n}") for n in range(100))
+                await app.query(".group").first().remove()
+
+            async def toggle() -> None:
+                await pilot.press("ctrl+d")
+                await pilot.pause()
+
+            async def expand_all() -> None:
+                tree.move_cursor(tree.root)
+                tree.action_expand_all()
+                await pilot.pause()
+
+            async def cursor_down() -> None:
+                tree.move_cursor(tree.root)
+                await pilot.pause()
+                for _ in range(2000):
+                    app.post_message(events.Key("down", None))
+                await pilot.pause()
+                # let the CSS tab catch up with where the cursor stopped
+                await pilot.pause(Inspector.CSS_DELAY * 2)
+
+            # the app's own first layout, which isn't the inspector's
+            await pilot.pause()
+            await timed("open", toggle())
+            print(f"{'':<14} {len(tree.tree_nodes):>9} tree nodes")
+            await toggle()
+            await timed("reopen", toggle())
+            await toggle()
+            await churn()
+            await timed("reopen churned", toggle())
+            await timed("expand all", expand_all())
+            print(f"{'':<14} {len(tree.tree_nodes):>9} tree nodes")
+            loads = 0
+
+            def counted_load_text(load_text: Callable[[str], None], text: str) -> None:
+                nonlocal loads
+                loads += 1
+                load_text(text)
+
+            patch(inspector.query_one(TextArea), "load_text", counted_load_text)
+            await timed("cursor down", cursor_down())
+            print(f"{'':<14} {loads:>9} CSS loads")
+            await timed("rebuild", rebuild())
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspector DOM tree benchmark")
+    parser.add_argument("--groups", type=int, default=50, help="Containers in the app")
+    parser.add_argument(
+        "--per-group", type=int, default=99, help="Labels per container"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.groups, args.per_group))
@@ -0,0 +1,143 @@
+"""Count the layouts it takes to highlight what the mouse hovers in the DOM tree.
+
+The Inspector is opened over a synthetic app with `--groups` containers of
+`--per-group` labels, its tree is expanded, and the mouse is moved down the
+tree one line at a time, resting on each line like a hand would. Each
+highlight mode is measured:
+
+    overlay     a box painted around the widget by the screen's compositor
+    fill        the whole widget tinted with the accent, the same way
+
+"layouts" counts `Screen._refresh_layout` calls, each a relayout of the screen,
+and "hovers" the highlights that changed.
+
+Run:
+    python highlight_benchmark.py
+    python highlight_benchmark.py --groups 100 --hovers 100
+"""
+
+import asyncio
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Literal
+
+# the modules shared with the rest of the repository, such as patching, are at its root
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from _inspector import DOMTree, Inspector
+from textual import events
+from textual.app import App, ComposeResult
+from textual.containers import Vertical, VerticalScroll
+from textual.dom import DOMNode
+from textual.screen import Screen
+from textual.widgets import Label
+
+from patching import Patches
+
+HOVER_DELAY = 0.1
+"""Seconds the mouse rests on each line, long enough for the highlight to follow."""
+
+
+class HoverApp(App):
+    CSS = """
+    .group {
+        height: auto;
+        border-left: wide $primary;
+    }
+    """
+
+    def __init__(
+        self, groups: int, per_group: int, highlight: Literal["overlay", "fill"]
+    ) -> None:
+        super().__init__()
+        self.groups = groups
+        self.per_group = per_group
+        self.highlight = highlight
+
+    def compose(self) -> ComposeResult:
+        with VerticalScroll(can_focus=False):
+            for group in range(self.groups):
+                with Vertical(classes="group"):
+                    for n in range(self.per_group):
+                        yield Label(f"label {group}.{n}")
+        yield Inspector(self.highlight)
+
+
+def mouse_move(x: int, y: int) -> events.MouseMove:
+    return events.MouseMove(None, x, y, 0, 0, 0, False, False, False, x, y)
+
+
+async def measure(
+    highlight: Literal["overlay", "fill"], groups: int, per_group: int, hovers: int
+) -> None:
+    layouts = 0
+    layout_seconds = 0.0
+    changes = 0
+
+    def timed_refresh_layout(
+        refresh_layout: Callable[..., None], screen: Screen, *args, **kwargs
+    ) -> None:
+        nonlocal layouts, layout_seconds
+        start = time.perf_counter()
+        refresh_layout(screen, *args, **kwargs)
+        layouts += 1
+        layout_seconds += time.perf_counter() - start
+
+    def counted_highlight(
+        highlight: Callable[[Inspector, DOMNode | None], None],
+        inspector: Inspector,
+        dom_node: DOMNode | None,
+    ) -> None:
+        nonlocal changes
+        changes += dom_node is not inspector.highlighted
+        highlight(inspector, dom_node)
+
+    app = HoverApp(groups, per_group, highlight)
+    patches = Patches(
+        (Screen, "_refresh_layout", timed_refresh_layout),
+        (Inspector, "highlight", counted_highlight),
+    )
+    try:
+        async with app.run_test(size=(160, 50)) as pilot:
+            inspector = app.query_one(Inspector)
+            inspector.visible = True
+            await pilot.pause(0.5)
+            tree = inspector.query_one(DOMTree)
+            tree.action_expand_all()
+            await pilot.pause(0.5)
+            region = tree.content_region
+            patches.start()
+            for n in range(hovers):
+                app.post_message(
+                    mouse_move(region.x + 4, region.y + 1 + n % (region.height - 1))
+                )
+                # not pilot.pause(), which waits on every widget of the app in turn
+                await asyncio.sleep(HOVER_DELAY)
+            patches.stop()
+            print(
+                f"{highlight:<8} {changes:>7} hovers {layouts:>7} layouts"
+                f" {layouts / max(changes, 1):>6.2f} per hover"
+                f" {layout_seconds * 1000:>9.1f} layout ms"
+            )
+    finally:
+        patches.stop()
+
+
+async def main(groups: int, per_group: int, hovers: int) -> None:
+    for highlight in ("overlay", "fill"):
+        await measure(highlight, groups, per_group, hovers)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspector highlight benchmark")
+    parser.add_argument("--groups", type=int, default=20, help="Containers in the app")
+    parser.add_argument(
+        "--per-group", type=int, default=99, help="Labels per container"
+    )
+    parser.add_argument("--hovers", type=int, default=40, help="Lines to hover")
+    args = parser.parse_args()
+    asyncio.run(main(args.groups, args.per_group, args.hovers))
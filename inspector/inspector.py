@@ -2,7 +2,12 @@ from __future__ import annotations
 
 import asyncio
 import inspect
+import sys
 from importlib.metadata import version
+from pathlib import Path
+
+# the modules shared with the rest of the repository, such as patching, are at its root
+sys.path.append(str(Path(__file__).resolve().parent.parent))
 
 try:
     import httpx  # ty: ignore  # noqa
@@ -11,6 +16,7 @@ try:
 except ImportError:
     HTTPX_AVAILABLE = False
 
+from _inspector import Inspector
 from textual import work
 from textual.app import App, ComposeResult
 from textual.binding import Binding
@@ -19,8 +25,6 @@ from textual.demo.page import CodeScreen
 from textual.reactive import reactive
 from textual.widgets import Collapsible, Digits, Footer, Label, Markdown
 
-from _inspector import Inspector
-
 WHAT_IS_TEXTUAL_MD = """\
 # What is Textual?
 
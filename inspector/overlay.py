@@ -0,0 +1,118 @@
+"""Boxes painted over a screen by its compositor, which move without a layout.
+
+A widget placed with `styles.offset`, `width` or `height` is laid out again
+every time it moves, and Textual lays out the whole screen to do it. On an app
+with a few thousand widgets that is most of a frame per move. An `Overlay`
+isn't a widget: it patches the screen's compositor to paint its regions over
+whatever was rendered under them, so moving it only repaints the cells it
+leaves and the ones it covers.
+
+Being no widget, it never takes the mouse, and it is painted over everything
+on the screen, overlays and tooltips included.
+
+Its regions are painted either blank in a style, or as a tint blended over the
+background of the cells under them, which keeps their text.
+"""
+
+from collections.abc import Callable, Iterable
+
+from rich.segment import Segment
+from rich.style import Style
+from textual.color import Color
+from textual.geometry import Region
+from textual.screen import Screen
+from textual.strip import Strip
+
+from patching import patch
+
+Chops = list[dict[int, Strip | None]]
+"""A rendered screen, per line the strip starting at each cut, or None if not rendered."""
+
+
+class Overlay:
+    """Regions of one screen painted in one fill, until `cover` moves them."""
+
+    def __init__(self) -> None:
+        self.screen: Screen | None = None
+        self.regions: list[Region] = []
+        self.fill: Style | Color = Style()
+        self._unpatch: Callable[[], None] | None = None
+
+    def cover(
+        self, screen: Screen, regions: Iterable[Region], fill: Style | Color
+    ) -> None:
+        """Paint `regions` of `screen`, and take away what was painted before.
+
+        Args:
+            screen: The screen to paint on.
+            regions: Where to paint, in screen coordinates.
+            fill: A style to paint blank cells in, or a color to tint the cells
+                under the regions with, by its alpha.
+        """
+        previous, previous_regions = self.screen, self.regions
+        self.screen = screen
+        self.regions = [region for region in regions if region]
+        self.fill = fill
+        # the compositor is patched only while something is painted on it
+        if self._unpatch is not None and (screen is not previous or not self.regions):
+            self._unpatch()
+            self._unpatch = None
+        if self.regions and self._unpatch is None:
+            self._unpatch = patch(screen._compositor, "_render_chops", self.paint)
+        if previous is not None and previous_regions:
+            previous.refresh(*previous_regions)
+        if self.regions:
+            screen.refresh(*self.regions)
+
+    def clear(self) -> None:
+        """Take away what is painted."""
+        if self.screen is not None:
+            self.cover(self.screen, (), self.fill)
+
+    def paint(
+        self,
+        render_chops: Callable[[Region, Callable[[int], bool]], Chops],
+        crop: Region,
+        is_rendered_line: Callable[[int], bool],
+    ) -> Chops:
+        """Render the screen's update, then paint the regions over it.
+
+        Returns:
+            The chops, with every rendered cell of the regions replaced.
+        """
+        chops = render_chops(crop, is_rendered_line)
+        assert self.screen is not None
+        cuts = self.screen._compositor.cuts
+        fill = self.fill
+        for x1, y1, x2, y2 in (region.corners for region in self.regions):
+            for line, line_cuts in zip(chops[y1:y2], cuts[y1:y2], strict=False):
+                for cut, end in zip(line_cuts, line_cuts[1:]):
+                    strip = line.get(cut)
+                    start, stop = max(cut, x1), min(end, x2)
+                    if strip is None or start >= stop:
+                        continue
+                    if isinstance(fill, Color):
+                        painted = tint(strip.crop(start - cut, stop - cut), fill)
+                    else:
+                        painted = Strip([Segment(" " * (stop - start), fill)])
+                    line[cut] = Strip.join([
+                        strip.crop(0, start - cut),
+                        painted,
+                        strip.crop(stop - cut),
+                    ])
+        return chops
+
+
+def tint(strip: Strip, color: Color) -> Strip:
+    """Blend `color` over the background of every cell of `strip`, by its alpha.
+
+    Returns:
+        The strip with the same text and foreground, on the tinted background.
+    """
+    segments = []
+    for text, style, control in strip:
+        style = style or Style()
+        background = Color.from_rich_color(style.bgcolor, foreground=False)
+        tinted = Style.from_color(bgcolor=(background + color).rich_color)
+        segments.append(Segment(text, style + tinted, control))
+    return Strip(segments, strip.cell_length)
@@ -0,0 +1,177 @@
+"""Live counters for the Inspector's Performance tab.
+
+`PerformanceSampler` patches Textual while started, counting frames, restyles
+and the time spent in layout, compositing and each widget's `render_lines`.
+The Inspector starts it when it is shown and stops it when it is hidden, so a
+hidden Inspector leaves Textual untouched. `take()` returns what was counted
+since the last call, which the Inspector does once a second.
+"""
+
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from textual.app import App
+from textual.css.stylesheet import Stylesheet
+from textual.dom import DOMNode
+from textual.geometry import Region
+from textual.screen import Screen
+from textual.strip import Strip
+from textual.widget import Widget
+
+from patching import Patches
+
+
+@dataclass
+class Sample:
+    """What happened between two `PerformanceSampler.take()` calls."""
+
+    seconds: float = 0.0
+    frames: int = 0
+    restyles: int = 0
+    """`update_node_styles` calls, each restyling a node and its descendants."""
+    applies: int = 0
+    """Nodes the stylesheet was applied to by those restyles."""
+    layouts: int = 0
+    layout_seconds: float = 0.0
+    compositor_seconds: float = 0.0
+    """Time spent updating the screen, which includes rendering widgets."""
+    render_seconds: Counter[Widget] = field(default_factory=Counter)
+
+
+class PerformanceSampler:
+    """Counts what the app does, from `start()` until `stop()`."""
+
+    def __init__(self) -> None:
+        self.sample = Sample()
+        self.started = time.perf_counter()
+        self._patches: Patches | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._patches is not None
+
+    def start(self) -> None:
+        """Patch Textual so frames, restyles and render times get counted."""
+        if self._patches is not None:
+            return
+        sampler = self
+
+        def counted_update_node_styles(
+            update_node_styles: Callable[..., None], node: DOMNode, animate: bool = True
+        ) -> None:
+            sampler.sample.restyles += 1
+            update_node_styles(node, animate=animate)
+
+        def counted_apply(
+            apply: Callable[..., None], stylesheet: Stylesheet, node: DOMNode, **kwargs
+        ) -> None:
+            sampler.sample.applies += 1
+            apply(stylesheet, node, **kwargs)
+
+        def timed_refresh_layout(
+            refresh_layout: Callable[..., None], screen: Screen, *args, **kwargs
+        ) -> None:
+            start = time.perf_counter()
+            refresh_layout(screen, *args, **kwargs)
+            sampler.sample.layouts += 1
+            sampler.sample.layout_seconds += time.perf_counter() - start
+
+        def timed_compositor_refresh(
+            compositor_refresh: Callable[[Screen], None], screen: Screen
+        ) -> None:
+            start = time.perf_counter()
+            compositor_refresh(screen)
+            sampler.sample.frames += 1
+            sampler.sample.compositor_seconds += time.perf_counter() - start
+
+        def timed_render_lines(
+            render_lines: Callable[[Widget, Region], list[Strip]],
+            widget: Widget,
+            crop: Region,
+        ) -> list[Strip]:
+            start = time.perf_counter()
+            lines = render_lines(widget, crop)
+            sampler.sample.render_seconds[widget] += time.perf_counter() - start
+            return lines
+
+        self._patches = Patches(
+            (DOMNode, "update_node_styles", counted_update_node_styles),
+            (Stylesheet, "apply", counted_apply),
+            (Screen, "_refresh_layout", timed_refresh_layout),
+            (Screen, "_compositor_refresh", timed_compositor_refresh),
+            (Widget, "render_lines", timed_render_lines),
+        )
+        self._patches.start()
+        self.take()
+
+    def stop(self) -> None:
+        """Undo the patches from `start`."""
+        if self._patches is not None:
+            self._patches.stop()
+            self._patches = None
+
+    def take(self) -> Sample:
+        """Return what was counted since the last call, and start counting afresh.
+
+        Returns:
+            The finished sample.
+        """
+        now = time.perf_counter()
+        sample, self.sample = self.sample, Sample()
+        sample.seconds = now - self.started
+        self.started = now
+        return sample
+
+
+def queue_depths(app: App) -> Counter[DOMNode]:
+    """Messages waiting in the queue of the app and every widget on its screen.
+
+    Returns:
+        Queue depth by node, for nodes with anything queued.
+    """
+    depths: Counter[DOMNode] = Counter()
+    for node in (app, app.screen, *app.screen.walk_children(Widget)):
+        depth = node._message_queue.qsize()
+        if depth:
+            depths[node] = depth
+    return depths
+
+
+def describe(node: DOMNode) -> str:
+    """A short name for `node`, its type and id.
+
+    Returns:
+        e.g. `Label#title`.
+    """
+    return type(node).__name__ + (f"#{node.id}" if node.id else "")
+
+
+def report(sample: Sample, depths: Counter[DOMNode], top: int = 5) -> str:
+    """Format a sample and the current queue depths for the Performance tab.
+
+    Returns:
+        Plain text, one figure per line.
+    """
+    seconds = sample.seconds or 1.0
+    frames = sample.frames or 1
+    lines = [
+        f"fps             {sample.frames / seconds:8.1f}",
+        f"restyles/s      {sample.restyles / seconds:8.1f}",
+        f"nodes styled/s  {sample.applies / seconds:8.1f}",
+        f"layouts/s       {sample.layouts / seconds:8.1f}",
+        f"layout ms/frame {sample.layout_seconds * 1000 / frames:8.2f}",
+        f"update ms/frame {sample.compositor_seconds * 1000 / frames:8.2f}",
+        "",
+        f"queued messages {sum(depths.values()):8}",
+    ]
+    lines += [
+        f"  {describe(node):<22} {depth:>5}" for node, depth in depths.most_common(top)
+    ]
+    lines += ["", "render ms/s"]
+    lines += [
+        f"  {describe(widget):<22} {elapsed * 1000 / seconds:>8.2f}"
+        for widget, elapsed in sample.render_seconds.most_common(top)
+    ]
+    return "\n".join(lines)
@@ -0,0 +1,133 @@
+"""Drag the Inspector's resize bar with a storm of mouse moves.
+
+The bar is dragged back and forth across the screen with `--moves` raw mouse
+moves, posted `--rate` per second like a terminal reporting a fast drag. Each
+mode is timed until the app has handled every move:
+
+    per move    the container is resized on every captured move
+    ghost       only a ghost of the bar moves, painted over the screen, and the
+                container is resized on mouse up
+
+"layouts" counts `Screen._refresh_layout` calls, each a relayout of the screen.
+Textual already folds the resizes of a frame into one layout, so the per move
+bar lays out about once a frame; the ghost lays out once, on mouse up.
+
+Run:
+    python resize_benchmark.py
+    python resize_benchmark.py --moves 5000 --rate 1000
+"""
+
+import asyncio
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+# the modules shared with the rest of the repository, such as patching, are at its root
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import _inspector
+from _inspector import Inspector
+from resizebar import ResizeBar
+from textual import events
+from textual.app import App, ComposeResult
+from textual.screen import Screen
+from textual.widgets import Label
+
+from patching import Patches
+
+
+class GhostResizeBar(ResizeBar):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, ghost=True, **kwargs)
+
+
+MODES = {
+    "per move": ResizeBar,
+    "ghost": GhostResizeBar,
+}
+
+
+class ResizeApp(App):
+    def compose(self) -> ComposeResult:
+        yield Label("Drag the inspector wider and narrower")
+        yield Inspector()
+
+    async def on_mount(self) -> None:
+        self.query_one(Inspector).visible = True
+
+
+def mouse(event_type: type[events.MouseEvent], x: int, y: int) -> events.MouseEvent:
+    return event_type(None, x, y, 0, 0, 1, False, False, False, x, y)
+
+
+async def drag(app: App, bar: ResizeBar, moves: int, rate: int) -> None:
+    """Press on `bar`, sweep it left and right `moves` times and release it."""
+    x, y = bar.region.x, bar.region.y + 1
+    width = app.screen.size.width
+    app.post_message(mouse(events.MouseDown, x, y))
+    started = time.perf_counter()
+    for n in range(moves):
+        # a triangle wave over the screen, past both of the bar's limits
+        step = n % (2 * width)
+        app.post_message(mouse(events.MouseMove, min(step, 2 * width - step), y))
+        wait = started + (n + 1) / rate - time.perf_counter()
+        if wait > 0:
+            await asyncio.sleep(wait)
+    app.post_message(mouse(events.MouseUp, x, y))
+
+
+async def settle(app: App) -> None:
+    while not (app._message_queue.empty() and app.screen._message_queue.empty()):
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.1)
+
+
+async def measure(mode: str, moves: int, rate: int) -> None:
+    _inspector.ResizeBar = MODES[mode]
+    layouts = 0
+    layout_seconds = 0.0
+
+    def timed_refresh_layout(
+        refresh_layout: Callable[..., None], screen: Screen, *args, **kwargs
+    ) -> None:
+        nonlocal layouts, layout_seconds
+        start = time.perf_counter()
+        refresh_layout(screen, *args, **kwargs)
+        layouts += 1
+        layout_seconds += time.perf_counter() - start
+
+    app = ResizeApp()
+    patches = Patches((Screen, "_refresh_layout", timed_refresh_layout))
+    try:
+        async with app.run_test(size=(160, 50)) as pilot:
+            await pilot.pause(0.5)
+            bar = app.query_one(".-horizontal", MODES[mode])
+            patches.start()
+            start = time.perf_counter()
+            await drag(app, bar, moves, rate)
+            await settle(app)
+            elapsed = time.perf_counter() - start
+            patches.stop()
+            print(
+                f"{mode:<10} {elapsed * 1000:>9.1f} ms {layouts:>7} layouts"
+                f" {layout_seconds * 1000:>9.1f} layout ms"
+            )
+    finally:
+        patches.stop()
+        _inspector.ResizeBar = ResizeBar
+
+
+async def main(moves: int, rate: int) -> None:
+    for mode in MODES:
+        await measure(mode, moves, rate)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspector resize bar benchmark")
+    parser.add_argument("--moves", type=int, default=2000, help="Mouse moves to drag")
+    parser.add_argument("--rate", type=int, default=1000, help="Moves per second")
+    args = parser.parse_args()
+    asyncio.run(main(args.moves, args.rate))
@@ -1,87 +1,184 @@
 # Thank you to edward-jazzhands for the HorizontalResizeBar implementation!
-# I simply modified it and added VerticalResizeBar as well.
+# I simply modified it and added a vertical axis as well.
+from typing import ClassVar, Literal
+
+from overlay import Overlay
+from rich.style import Style
 from textual import events
-from textual.geometry import clamp
+from textual.binding import Binding
+from textual.color import Color
+from textual.geometry import Offset, Size, clamp
 from textual.widget import Widget
 from textual.widgets import Static
 
 
-class HorizontalResizeBar(Static):
+class ResizeBar(Static, can_focus=True):
+    """A bar on the left or top edge of a container that resizes it.
+
+    Dragging the bar, or pressing the arrow keys while it has focus, sets the
+    container's width for a horizontal bar and its height for a vertical one.
+    The container grows away from the bar, to the left or upwards.
+
+    Every resize lays out the whole screen, which Textual does at most once a
+    frame. With `ghost=True` the container keeps its size until the mouse is
+    released, and a ghost of the bar, painted over the screen without any
+    layout, shows where its edge will be.
+    """
+
     DEFAULT_CSS = """
-    HorizontalResizeBar {
-        width: 1;
-        height: 1fr;
-        border-left: outer $border-blurred;
-        &:hover { border-left: outer $primary-darken-2; }
-        &.pressed {   border-left: outer $primary-lighten-1; }
+    ResizeBar {
+        &.-horizontal {
+            width: 1;
+            height: 1fr;
+            border-left: outer $border-blurred;
+            &:hover { border-left: outer $primary-darken-2; }
+            &.pressed, &:focus { border-left: outer $primary-lighten-1; }
+        }
+        &.-vertical {
+            height: 1;
+            width: 1fr;
+            border-top: outer $border-blurred;
+            &:hover { border-top: outer $primary-darken-2; }
+            &.pressed, &:focus { border-top: outer $primary-lighten-1; }
+        }
+        Tooltip {
+            offset: -10 0
+        }
     }
     """
 
+    BINDINGS = [
+        Binding("left", "move(-1, 0)", "Grow", show=False),
+        Binding("right", "move(1, 0)", "Shrink", show=False),
+        Binding("up", "move(0, -1)", "Grow", show=False),
+        Binding("down", "move(0, 1)", "Shrink", show=False),
+        Binding("shift+left", "move(-5, 0)", show=False),
+        Binding("shift+right", "move(5, 0)", show=False),
+        Binding("shift+up", "move(0, -5)", show=False),
+        Binding("shift+down", "move(0, 5)", show=False),
+    ]
+
+    saved_sizes: ClassVar[dict[str, int]] = {}
+    """The last size of each container with a `persist` key, kept for the session."""
+
     def __init__(
-        self, parent: Widget, id: str | None = None, classes: str | None = None
+        self,
+        container: Widget,
+        axis: Literal["horizontal", "vertical"] = "horizontal",
+        minimum: int = 5,
+        margin: int = 10,
+        snap: int = 1,
+        persist: str | None = None,
+        ghost: bool = False,
+        id: str | None = None,
+        classes: str | None = None,
     ) -> None:
+        """
+        Args:
+            container: The widget to resize.
+            axis: "horizontal" to resize its width, "vertical" its height.
+            minimum: The smallest size the container can have.
+            margin: How much of the screen the container always leaves free.
+            snap: Sizes are rounded to a multiple of this, and the arrow keys
+                move the bar this far.
+            persist: Restore the last size under this key whenever a bar with
+                the same key is mounted.
+            ghost: Resize only when a drag ends, showing a ghost meanwhile.
+        """
         super().__init__(id=id, classes=classes)
-        self.connected_container = parent
-        self.min_width = 20
-        self.max_width = 100
+        self.add_class(f"-{axis}")
+        self.connected_container = container
+        self.axis = axis
+        self.minimum = minimum
+        self.margin = margin
+        self.snap = max(1, snap)
+        self.persist = persist
+        self.ghost = Overlay() if ghost else None
+        self.ghost_style = Style()
+        # the size a ghosted drag has got to, applied on mouse up
+        self.ghost_size: int | None = None
+        # the bounds, and the screen size they were worked out for
+        self._bounds: tuple[Size, int, int] | None = None
 
-    def on_mouse_move(self, event: events.MouseMove) -> None:
-        # App.mouse_captured refers to the widget that is currently capturing mouse events.
-        if self.app.mouse_captured == self:
-            total_delta = event.screen_offset - self.position_on_down
-            new_size = self.size_on_down - total_delta
-            self.connected_container.styles.width = clamp(
-                new_size.width, self.min_width, self.max_width
-            )
+    def on_mount(self) -> None:
+        saved = self.saved_sizes.get(self.persist) if self.persist else None
+        if saved is not None:
+            self.set_size(saved)
 
-    def on_mouse_down(self, event: events.MouseDown) -> None:
-        self.max_width = self.app.screen.size.width - 10
-        self.position_on_down = event.screen_offset
-        self.size_on_down = self.connected_container.size
+    def on_unmount(self) -> None:
+        if self.ghost is not None:
+            self.ghost.clear()
 
-        self.add_class("pressed")  # this requires a "pressed" class to exist
-        self.capture_mouse()
+    def on_resize(self) -> None:
+        self._bounds = None
 
-    def on_mouse_up(self) -> None:
-        self.remove_class("pressed")
-        self.release_mouse()
+    @property
+    def bounds(self) -> tuple[int, int]:
+        """The smallest and largest size the container can have."""
+        screen_size = self.screen.size
+        # the bar only gets Resize when its own size changes, so check the screen too
+        if self._bounds is None or self._bounds[0] != screen_size:
+            largest = self.dimension(screen_size) - self.margin
+            self._bounds = (screen_size, self.minimum, max(self.minimum, largest))
+        return self._bounds[1:]
 
+    def dimension(self, size: tuple[int, int]) -> int:
+        """Pick the width or height of `size`, whichever this bar resizes.
 
-class VerticalResizeBar(Static):
-    DEFAULT_CSS = """
-    VerticalResizeBar {
-        height: 1;
-        width: 1fr;
-        border-top: outer $border-blurred;
-        &:hover { border-top: outer $primary-darken-2; }
-        &.pressed {   border-top: outer $primary-lighten-1; }
-        Tooltip {
-            offset: -10 0
-        }
-    }
-    """
+        Returns:
+            The width for a horizontal bar, the height for a vertical one.
+        """
+        return size[0] if self.axis == "horizontal" else size[1]
 
-    def __init__(
-        self, parent: Widget, id: str | None = None, classes: str | None = None
-    ) -> None:
-        super().__init__(id=id, classes=classes)
-        self.connected_container = parent
-        self.min_height = 5
-        self.max_height = 50
+    def fit(self, size: int) -> int:
+        """Snap `size` to the grid and clamp it to the bounds.
+
+        Returns:
+            `size` rounded to a multiple of `snap`, then clamped to `bounds`.
+        """
+        minimum, maximum = self.bounds
+        return clamp(round(size / self.snap) * self.snap, minimum, maximum)
+
+    def set_size(self, size: int) -> None:
+        """Give the container a new width or height, and remember it."""
+        if self.axis == "horizontal":
+            self.connected_container.styles.width = size
+        else:
+            self.connected_container.styles.height = size
+        if self.persist:
+            self.saved_sizes[self.persist] = size
+
+    def action_move(self, x: int, y: int) -> None:
+        """Move the bar by `x` or `y` snaps, whichever is along its axis."""
+        delta = self.dimension((x, y))
+        if not delta:
+            return
+        self.set_size(
+            self.fit(self.dimension(self.connected_container.size) - delta * self.snap)
+        )
 
     def on_mouse_move(self, event: events.MouseMove) -> None:
         # App.mouse_captured refers to the widget that is currently capturing mouse events.
-        if self.app.mouse_captured == self:
-            total_delta = event.screen_offset - self.position_on_down
-            new_size = self.size_on_down - total_delta
-            self.connected_container.styles.height = clamp(
-                new_size.height, self.min_height, self.max_height
-            )
+        if self.app.mouse_captured != self:
+            return
+        total_delta = event.screen_offset - self.position_on_down
+        size = self.fit(self.dimension(self.size_on_down - total_delta))
+        if self.ghost is None:
+            self.set_size(size)
+            return
+        self.ghost_size = size
+        # the container grows away from the bar, so the bar moves the other way
+        delta = self.dimension(self.size_on_down) - size
+        offset = Offset(delta, 0) if self.axis == "horizontal" else Offset(0, delta)
+        self.ghost.cover(self.screen, [self.region.translate(offset)], self.ghost_style)
 
     def on_mouse_down(self, event: events.MouseDown) -> None:
-        self.max_height = self.app.screen.size.height - 10
         self.position_on_down = event.screen_offset
         self.size_on_down = self.connected_container.size
+        self.ghost_size = None
+        if self.ghost is not None:
+            ghost_color = Color.parse(self.app.theme_variables["primary-lighten-1"])
+            self.ghost_style = Style(bgcolor=ghost_color.rich_color)
 
         self.add_class("pressed")  # this requires a "pressed" class to exist
         self.capture_mouse()
@@ -89,3 +186,9 @@ class VerticalResizeBar(Static):
     def on_mouse_up(self) -> None:
         self.remove_class("pressed")
         self.release_mouse()
+        if self.ghost is not None:
+            self.ghost.clear()
+        # the one resize a ghosted drag makes
+        if self.ghost_size is not None:
+            self.set_size(self.ghost_size)
+            self.ghost_size = None
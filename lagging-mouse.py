@@ -24,17 +24,24 @@ Reproduce:
     Move the mouse around the OptionList and watch the counter climb.
     python lagging-mouse.py --split
     and the counter stays at zero.
+    python lagging-mouse.py --guard
+    keeps the grouped rule, but only restyles when the widget under the
+    mouse changes (see restyle/mouse_over.py).
+    python lagging-mouse.py --profile restyles.json
+    writes per-widget restyle timings and a hover-style audit on quit.
 """
 
-import time
-
 from textual.app import App, ComposeResult
 from textual.containers import Horizontal
 from textual.css.query import NoMatches
-from textual.dom import DOMNode
 from textual.widgets import Button, Label, OptionList
 
+from restyle.mouse_over import GuardMouseOver
+from restyle.profiler import RestyleProfiler
+
 GROUPED = True  # False = identical styling, :hover in its own rule block
+GUARD = False  # True = run GuardedLaggingMouseApp
+PROFILE_PATH = ""
 
 HOVER_CSS_GROUPED = """
     #footer > *,
@@ -57,8 +64,12 @@ if __name__ == "__main__":
 
     parser = argparse.ArgumentParser(description="MRE for Textual hover style performance issue")
     parser.add_argument("--split", action="store_true", help="Use split CSS rules instead of grouped")
+    parser.add_argument("--guard", action="store_true", help="Only restyle when the widget under the mouse changes")
+    parser.add_argument("--profile", default="", metavar="PATH", help="Dump a restyle profile as JSON on quit")
     if (args := parser.parse_args()).split:
         GROUPED = False
+    GUARD = args.guard
+    PROFILE_PATH = args.profile
 
 
 class LaggingMouseApp(App):
@@ -76,38 +87,35 @@ class LaggingMouseApp(App):
             yield Label(id="status")
 
     def on_mount(self) -> None:
-        self.restyles = 0
-        self.restyle_seconds = 0.0
-        self.counting = False
-        original = DOMNode.update_node_styles
-        app = self
-
-        def counted(node: DOMNode, animate: bool = True) -> None:
-            start = time.perf_counter()
-            original(node, animate=animate)
-            if app.counting:
-                app.restyle_seconds += time.perf_counter() - start
-                app.restyles += 1
-                app.call_next(app.show_status)
-
-        DOMNode.update_node_styles = counted  # ty: ignore[invalid-assignment]
+        self.profiler = RestyleProfiler(on_record=lambda: self.call_next(self.show_status))
 
     def on_ready(self) -> None:
-        self.counting = True
+        self.profiler.start()
         self.show_status()
 
+    async def action_quit(self) -> None:
+        if PROFILE_PATH:
+            self.profiler.dump(PROFILE_PATH, self)
+        self.profiler.stop()
+        await super().action_quit()
+
     def show_status(self) -> None:
         try:
             option_list = self.query_one(OptionList)
         except NoMatches:
             return
-        avg_ms = self.restyle_seconds / self.restyles * 1000 if self.restyles else 0.0
+        restyles = self.profiler.restyles
+        avg_ms = self.profiler.seconds / restyles * 1000 if restyles else 0.0
         self.query_one("#status", Label).update(
-            f"GROUPED={GROUPED} | "
+            f"GROUPED={GROUPED} GUARD={isinstance(self, GuardMouseOver)} | "
             f"OptionList._has_hover_style={option_list._has_hover_style} | "
-            f"restyles: {self.restyles} ({avg_ms:.2f} ms avg)"
+            f"restyles: {restyles} ({avg_ms:.2f} ms avg)"
         )
 
 
+class GuardedLaggingMouseApp(GuardMouseOver, LaggingMouseApp):
+    pass
+
+
 if __name__ == "__main__":
-    LaggingMouseApp().run()
+    (GuardedLaggingMouseApp if GUARD else LaggingMouseApp)().run()
@@ -1,9 +1,19 @@
-from textual import events
+import heapq
+import re
+from array import array
+from collections.abc import Iterable, Sequence
+from itertools import accumulate, pairwise
+from typing import Self
+
+from textual import events, work
 from textual.app import App, ComposeResult
 from textual.containers import VerticalGroup
+from textual.geometry import Size
 from textual.screen import ModalScreen
 from textual.widgets import Button, Input, OptionList
+from textual.widgets._option_list import _LineCache
 from textual.widgets.option_list import Option
+from textual.worker import get_current_worker
 
 starlight = [
     "I see you through the clouds",
@@ -21,38 +31,464 @@ starlight = [
 ]
 
 
+def fuzzy_score(query: str, candidate: str) -> float:
+    """Score `candidate` against `query` like the command palette does.
+
+    Both are expected in lowercase. The letters of `query` have to appear in
+    `candidate` in order; matches at the start of words, in fewer runs or as a
+    whole substring score higher. Unlike the command palette, letters are
+    placed greedily instead of trying every placement.
+
+    Returns:
+        The score, 0 if `candidate` doesn't match.
+    """
+    if not query:
+        return 1.0
+    location = candidate.find(query)
+    if location != -1:
+        offsets: Sequence[int] = range(location, location + len(query))
+        boost = 2.0 if candidate == query else 1.5
+    else:
+        offsets = []
+        position = 0
+        for letter in query:
+            position = candidate.find(letter, position)
+            if position == -1:
+                return 0.0
+            offsets.append(position)
+            position += 1
+        boost = 1.0
+    word_starts = sum(
+        1 for offset in offsets if offset == 0 or not candidate[offset - 1].isalnum()
+    )
+    groups = 1 + sum(1 for last, offset in pairwise(offsets) if offset != last + 1)
+    normalized_groups = (len(offsets) - (groups - 1)) / len(offsets)
+    return (len(offsets) + word_starts) * (1 + normalized_groups**2) * boost
+
+
+def rank(
+    query: str, searched: Sequence[int], lowered: Sequence[str]
+) -> list[tuple[float, int]]:
+    """Score the prompts at `searched` indexes that fuzzily match `query`.
+
+    Returns:
+        `(score, index)` pairs of the matches, unsorted.
+    """
+    # let re find the letters in order, and only score what it finds
+    pattern = re.compile(".*?".join(map(re.escape, query)))
+    return [
+        (fuzzy_score(query, lowered[index]), index)
+        for index in searched
+        if pattern.search(lowered[index])
+    ]
+
+
+def best_first(match: tuple[float, int]) -> tuple[float, int]:
+    """Sort key putting higher scores first, and earlier options first on a tie.
+
+    Returns:
+        The key for a `(score, index)` pair.
+    """
+    return -match[0], match[1]
+
+
+class PromptArray(Sequence[str]):
+    """Strings packed into one, with the offset each of them starts at.
+
+    A million short prompts are one string and an array of ints, instead of a
+    million string objects.
+    """
+
+    def __init__(self, prompts: Sequence[str]) -> None:
+        self.text = "".join(prompts)
+        self.offsets = array("Q", accumulate(map(len, prompts), initial=0))
+
+    @classmethod
+    def packed(cls, text: str, offsets: array) -> Self:
+        """Wrap strings that are already packed.
+
+        Returns:
+            A PromptArray sharing `text` and `offsets`.
+        """
+        prompts = cls.__new__(cls)
+        prompts.text = text
+        prompts.offsets = offsets
+        return prompts
+
+    def lower(self) -> "PromptArray":
+        """The same prompts in lowercase.
+
+        Returns:
+            A PromptArray, sharing the offsets where lowercasing kept every length.
+        """
+        text = self.text.lower()
+        if len(text) == len(self.text):
+            return self.packed(text, self.offsets)
+        # a few characters lowercase to more than one, which moves the offsets
+        return PromptArray([prompt.lower() for prompt in self])
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:  # ty: ignore[invalid-method-override]
+        if not -len(self) <= index < len(self):
+            raise IndexError(index)
+        index %= len(self)
+        return self.text[self.offsets[index] : self.offsets[index + 1]]
+
+
+class Selection(Sequence[str]):
+    """The prompts at `indexes` of `prompts`, in that order, without copying them."""
+
+    def __init__(self, prompts: Sequence[str], indexes: Sequence[int]) -> None:
+        self.prompts = prompts
+        self.indexes = indexes
+
+    def __len__(self) -> int:
+        return len(self.indexes)
+
+    def __getitem__(self, index: int) -> str:  # ty: ignore[invalid-method-override]
+        return self.prompts[self.indexes[index]]
+
+
+class LazyOptions(Sequence[Option]):
+    """An Option for each prompt, made when it is first looked up.
+
+    Only the `keep` most recently looked up are kept, which covers the rows on
+    screen and the highlighted one many times over.
+    """
+
+    def __init__(self, prompts: Sequence[str], keep: int = 1000) -> None:
+        self.prompts = prompts
+        self.keep = keep
+        self.built: dict[int, Option] = {}
+        self.indexes: dict[Option, int] = {}
+        """The index of each Option that is kept, as OptionList needs for rendering."""
+
+    def __len__(self) -> int:
+        return len(self.prompts)
+
+    def __getitem__(self, index: int | slice) -> Option | Sequence[Option]:  # ty: ignore[invalid-method-override]
+        if isinstance(index, slice):
+            # OptionList's navigation walks slices, so they stay lazy too
+            return Selection(self, range(len(self))[index])  # ty: ignore[invalid-argument-type]
+        if not -len(self) <= index < len(self):
+            raise IndexError(index)
+        index %= len(self)
+        # moved to the end on every lookup, so the first one is the least recent
+        option = self.built.pop(index, None)
+        if option is None:
+            option = Option(self.prompts[index])
+            self.indexes[option] = index
+            if len(self.built) >= self.keep:
+                del self.indexes[self.built.pop(next(iter(self.built)))]
+        self.built[index] = option
+        return option
+
+
+class _AlwaysOne(dict):
+    def __missing__(self, key: int) -> int:
+        return 1
+
+
+class OneLinePerOption(Sequence[tuple[int, int]]):
+    """Stands in for OptionList's line cache when every option is one line high.
+
+    Line y is option y, so nothing has to be worked out or stored per option.
+    """
+
+    def __init__(self, count: int) -> None:
+        self.count = count
+        self.lines = self
+        self.index_to_line = range(count)
+        self.heights = _AlwaysOne()
+
+    def clear(self) -> None:
+        """Nothing to clear, the lines follow from the count."""
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, line: int) -> tuple[int, int]:  # ty: ignore[invalid-method-override]
+        return self.index_to_line[line], 0
+
+
+class VirtualOptionList(OptionList):
+    """An OptionList that can show a sequence of prompts without an Option for each.
+
+    After `set_prompts`, an Option is made only for a prompt that is shown,
+    highlighted or selected, and every option is one line high, so a list of
+    a million prompts costs no more to show than one of a hundred. Anything
+    beyond the first line of a prompt is cut off. `set_options`,
+    `add_options` and `clear_options` work as usual, going back to an Option
+    for every prompt.
+    """
+
+    virtual = False
+    """Whether the list is showing prompts from `set_prompts`."""
+
+    def __init__(self, prompts: Sequence[str] | None = None, **kwargs) -> None:
+        super().__init__(**kwargs)
+        if prompts is not None:
+            self.set_prompts(prompts)
+
+    def set_prompts(self, prompts: Sequence[str]) -> Self:
+        """Show `prompts`, making Options only for those that get looked at.
+
+        Returns:
+            The `VirtualOptionList` instance.
+        """
+        self._options = LazyOptions(prompts)  # ty: ignore[invalid-assignment]
+        self._option_to_index = self._options.indexes
+        self._id_to_option.clear()
+        self._option_render_cache.clear()
+        self._line_cache = OneLinePerOption(len(prompts))  # ty: ignore[invalid-assignment]
+        self.virtual = True
+        # a new list starts at its first option, as OptionList's do
+        self.highlighted = 0 if prompts else None
+        self.scroll_y = 0
+        if self.is_mounted:
+            self.refresh(layout=self.styles.auto_dimensions)
+            self._update_lines()
+        return self
+
+    def extend_prompts(self, prompts: Sequence[str]) -> Self:
+        """Swap in `prompts`, which start with those showing, keeping the highlight.
+
+        Returns:
+            The `VirtualOptionList` instance.
+        """
+        if not self.virtual:
+            return self.set_prompts(prompts)
+        self._options.prompts = prompts  # ty: ignore[invalid-assignment]
+        self._line_cache = OneLinePerOption(len(prompts))  # ty: ignore[invalid-assignment]
+        if self.is_mounted:
+            self.refresh(layout=self.styles.auto_dimensions)
+            self._update_lines()
+        return self
+
+    def _leave_virtual(self) -> None:
+        if self.virtual:
+            self.virtual = False
+            self._options = []
+            self._option_to_index = {}
+            self._line_cache = _LineCache()
+
+    def set_options(self, options: Iterable) -> Self:
+        self._leave_virtual()
+        return super().set_options(options)
+
+    def clear_options(self) -> Self:
+        self._leave_virtual()
+        return super().clear_options()
+
+    def add_options(self, new_options: Iterable) -> Self:
+        if self.virtual:
+            # the options added to have to exist first
+            self.set_options(list(self._options))
+        return super().add_options(new_options)
+
+    def _update_lines(self) -> None:
+        if not self.virtual:
+            super()._update_lines()
+            return
+        if not self.scrollable_content_region:
+            return
+        width = self.scrollable_content_region.width - self._get_left_gutter_width()
+        virtual_size = Size(width, len(self._options))
+        if virtual_size != self.virtual_size:
+            self.virtual_size = virtual_size
+            self._scroll_update(virtual_size)
+
+    def get_content_height(self, container: Size, viewport: Size, width: int) -> int:
+        if self.virtual:
+            return len(self._options)
+        return super().get_content_height(container, viewport, width)
+
+    def get_content_width(self, container: Size, viewport: Size) -> int:
+        if self.virtual:
+            # measuring every prompt is what virtual lists avoid, so fill the container
+            return container.width
+        return super().get_content_width(container, viewport)
+
+
 class NarrowOptionsWithInput(ModalScreen):
+    DEFAULT_CSS = """
+    NarrowOptionsWithInput {
+        #root {
+            max-height: 100%;
+        }
+        /* docked, so the list's max-height is what's left below it */
+        Input {
+            dock: top;
+        }
+        OptionList {
+            max-height: 100%;
+        }
+    }
+    """
+
+    THREAD_THRESHOLD = 5000
+    """Searches through more options than this are ranked in a thread."""
+    FIRST_BATCH = 50
+    """How many of the best matches a thread shows before sorting the rest."""
+    VIRTUAL_THRESHOLD = 10_000
+    """Lists of more strings than this are shown without an Option for each."""
+
     def __init__(
-        self, options: list = [], placeholder: str = "Don't drop your jaw!", **kwargs
+        self,
+        options: list = [],
+        placeholder: str = "Don't drop your jaw!",
+        virtual: bool | None = None,
+        **kwargs,
     ) -> None:
+        """
+        Args:
+            options: Strings or Options to pick from.
+            placeholder: Placeholder of the input.
+            virtual: Show the options through a VirtualOptionList, which only
+                works for strings. By default, lists of more than
+                `VIRTUAL_THRESHOLD` strings are.
+
+        Raises:
+            TypeError: If an option is neither a string nor an Option, or isn't
+                a string while `virtual` is True.
+        """
         super().__init__(**kwargs)
         self.placeholder = placeholder
         self.options = options
+        if virtual is None:
+            virtual = len(options) > self.VIRTUAL_THRESHOLD and all(
+                isinstance(option, str) for option in options
+            )
+        self.virtual = virtual
+        # every option as an Option, or packed prompts to make them from, and
+        # each prompt lowercased, made once
+        self.choices: list[Option] = []
+        self.prompts: Sequence[str] = []
+        self.lowered: Sequence[str] = []
+        if virtual:
+            if not all(isinstance(option, str) for option in options):
+                raise TypeError("Only strings can be shown virtually.")
+            self.prompts = PromptArray(options)
+            self.lowered = self.prompts.lower()
+        else:
+            lowered = []
+            for option in options:
+                if isinstance(option, Option):
+                    self.choices.append(option)
+                    lowered.append(str(option.prompt).lower())
+                elif isinstance(option, str):
+                    self.choices.append(Option(option))
+                    lowered.append(option.lower())
+                else:
+                    raise TypeError(f"Unexpected {type(option)} found.")
+            self.lowered = lowered
+        # the last query ranked in full, and the indexes of its matches, best first
+        self.last_query = ""
+        self.matches: Sequence[int] = range(len(self.lowered))
+        # the latest query typed, the one whose matches are showing, and whether
+        # all of them are or only the best few
+        self.typed = ""
+        self.shown_query = ""
+        self.shown_complete = True
 
     def compose(self) -> ComposeResult:
         with VerticalGroup(id="root"):
             yield Input(placeholder=self.placeholder)
-            yield OptionList(*self.options)
+            if self.virtual:
+                yield VirtualOptionList(self.prompts)
+            else:
+                yield OptionList(*self.choices)
 
     def on_mount(self) -> None:
         self.query_one(OptionList).can_focus = False
         self.query_one(Input).focus()
 
     def on_input_changed(self, event: Input.Changed) -> None:
-        value = event.value
+        value = self.typed = event.value.lower()
+        # a query containing the last one can only match what the last one did
+        searched = (
+            self.matches if self.last_query in value else range(len(self.lowered))
+        )
+        if len(searched) > self.THREAD_THRESHOLD:
+            self.rank_in_thread(value, searched)
+            return
+        self.workers.cancel_group(self, "rank")
+        matches = [
+            index
+            for _, index in sorted(rank(value, searched, self.lowered), key=best_first)
+        ]
+        self.show_matches(value, matches)
+
+    @work(thread=True, exclusive=True, group="rank")
+    def rank_in_thread(self, query: str, searched: Sequence[int]) -> None:
+        """Rank in chunks, giving up as soon as a newer query cancels this worker."""
+        worker = get_current_worker()
+        scored: list[tuple[float, int]] = []
+        for start in range(0, len(searched), 1000):
+            if worker.is_cancelled:
+                return
+            scored += rank(query, searched[start : start + 1000], self.lowered)
+        # the best few first, so the list updates before the sort of the rest
+        best = heapq.nsmallest(self.FIRST_BATCH, scored, key=best_first)
+        if worker.is_cancelled:
+            return
+        self.app.call_from_thread(
+            self.show_matches, query, [index for _, index in best], complete=False
+        )
+        scored.sort(key=best_first)
+        if worker.is_cancelled:
+            return
+        self.app.call_from_thread(
+            self.show_matches, query, [index for _, index in scored]
+        )
+
+    def show_matches(
+        self, query: str, matches: Sequence[int], complete: bool = True
+    ) -> None:
+        """Show the matches of `query`, unless a newer query was typed since.
+
+        Args:
+            query: The query the matches are for.
+            matches: Indexes of the options that match, best first.
+            complete: False if `matches` is only the best few, which a later
+                call with every match extends.
+        """
+        if query != self.typed:
+            return
         optionlist: OptionList = self.query_one(OptionList)
-        optionlist.clear_options()
-        for option in self.options:
-            if isinstance(option, Option):
-                if value.lower() in option.prompt.lower():
-                    optionlist.add_option(option)
-            elif isinstance(option, str):
-                if value.lower() in option.lower():
-                    optionlist.add_option(option)
-            else:
-                raise TypeError(f"Unexpected {type(option)} found.")
-        if optionlist.option_count == 0:
-            optionlist.add_option(Option("--no matches--", disabled=True))
+        if complete:
+            self.last_query = query
+            previous, self.matches = self.matches, matches
+            if self.shown_query == query and not self.shown_complete:
+                # the best few are showing already, add the rest after them
+                self.shown_complete = True
+                if isinstance(optionlist, VirtualOptionList) and optionlist.virtual:
+                    optionlist.extend_prompts(Selection(self.prompts, matches))
+                else:
+                    optionlist.add_options([
+                        self.choices[index]
+                        for index in matches[optionlist.option_count :]
+                    ])
+                return
+            if (
+                self.shown_complete
+                and matches == previous
+                and optionlist.option_count == len(matches)
+            ):
+                # same options as before, so leave the list as it is
+                self.shown_query = query
+                optionlist.highlighted = 0
+                return
+        self.shown_query = query
+        self.shown_complete = complete
+        if matches and isinstance(optionlist, VirtualOptionList):
+            optionlist.set_prompts(Selection(self.prompts, matches))
+        elif matches:
+            optionlist.set_options([self.choices[index] for index in matches])
+        else:
+            optionlist.set_options([Option("--no matches--", disabled=True)])
         optionlist.highlighted = 0
 
     def on_input_submitted(self, event: Input.Submitted) -> None:
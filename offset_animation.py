@@ -0,0 +1,115 @@
+"""Shake and nudge widgets by animating their offset on the animator's clock.
+
+A widget's offset moves it without moving anything else, where a margin would
+push its siblings around and may resize its parent. The animation runs a
+`progress` from 0 to 1 on the app's animator, once per frame, and a path turns
+it into a displacement in cells. The offset is only written when the rounded
+displacement changes, so a shake one cell wide costs a handful of relayouts of
+the widget's parent, however many frames it spans.
+
+Starting another animation on a widget that is still moving replaces the
+running one, from where the widget's own styles put it.
+
+    from offset_animation import nudge, shake
+
+    shake(self.query_one(Button))
+    nudge(self.query_one(Button), y=-1)
+"""
+
+from collections.abc import Callable
+from math import pi, sin
+from weakref import WeakKeyDictionary, ref
+
+from textual.css.scalar import ScalarOffset
+from textual.geometry import Offset
+from textual.widget import Widget
+
+Path = Callable[[float], tuple[float, float]]
+"""Displacement in cells at a progress from 0 to 1, which has to be (0, 0) at 1."""
+
+
+class OffsetAnimation:
+    """Moves a widget away from its offset along a path, as `progress` changes."""
+
+    def __init__(self, widget: Widget) -> None:
+        # weak, as it is the value of its widget's entry in `_animations`
+        self._widget = ref(widget)
+        self.path: Path = lambda progress: (0, 0)
+        self.origin: ScalarOffset = widget.styles.offset
+        """The offset the widget's styles gave it before it started moving."""
+        self.shown = Offset()
+        """The displacement last written to the widget's offset."""
+        self._progress = 1.0
+
+    @property
+    def widget(self) -> Widget | None:
+        """The widget being moved, or None once it is gone."""
+        return self._widget()
+
+    @property
+    def progress(self) -> float:
+        return self._progress
+
+    @progress.setter
+    def progress(self, progress: float) -> None:
+        self._progress = progress
+        widget = self.widget
+        x, y = self.path(progress)
+        shown = Offset(round(x), round(y))
+        if widget is None or shown == self.shown:
+            return
+        self.shown = shown
+        if not shown:
+            widget.styles.offset = self.origin
+            return
+        # resolved the way layout resolves it, against the parent's size
+        parent = widget.parent
+        viewport = widget.app.size
+        container = parent.size if isinstance(parent, Widget) else viewport
+        origin = self.origin.resolve(container, viewport)
+        widget.styles.offset = origin + shown
+
+    def start(self, path: Path, duration: float) -> None:
+        """Move along `path` for `duration` seconds, ending where the widget started."""
+        widget = self.widget
+        if widget is None:
+            return
+        if not self.shown:
+            # not moving, so its styles may have changed since the last animation
+            self.origin = widget.styles.offset
+        self.path = path
+        self.progress = 0.0
+        widget.app.animator.animate(
+            self, "progress", 1.0, duration=duration, easing="linear"
+        )
+
+
+_animations: WeakKeyDictionary[Widget, OffsetAnimation] = WeakKeyDictionary()
+
+
+def animate_offset(widget: Widget, path: Path, duration: float) -> None:
+    """Move `widget` along `path`, replacing any animation it is in the middle of."""
+    animation = _animations.get(widget)
+    if animation is None:
+        animation = _animations[widget] = OffsetAnimation(widget)
+    animation.start(path, duration)
+
+
+def shake(
+    widget: Widget, distance: int = 1, shakes: int = 3, duration: float = 0.6
+) -> None:
+    """Bump `widget` `distance` cells to the right and back, `shakes` times."""
+    animate_offset(
+        widget,
+        lambda progress: (distance * abs(sin(pi * shakes * progress)), 0),
+        duration,
+    )
+
+
+def nudge(widget: Widget, x: int = 1, y: int = 0, duration: float = 0.2) -> None:
+    """Move `widget` by `x` and `y` cells and back again."""
+    animate_offset(
+        widget,
+        lambda progress: (x * sin(pi * progress), y * sin(pi * progress)),
+        duration,
+    )
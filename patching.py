@@ -0,0 +1,112 @@
+"""Wrap methods of Textual's classes for counting and timing, any number of times over.
+
+`patch(owner, name, wrapper)` replaces `owner.name` with a function calling
+`wrapper(original, *args, **kwargs)`, and returns a function that takes it out
+again. Patches of the same attribute stack, and come off in any order: the
+attribute is rebuilt from the original with the wrappers that are left, and
+the original is put back once the last one is gone. So the Inspector's
+Performance tab and a `RestyleProfiler` can both count restyles, and stop in
+either order.
+
+It lives at the repository root, so the Inspector, `restyle` and the
+benchmarks all import it as `patching`.
+
+    with Patches((Screen, "_refresh_layout", timed_refresh_layout)):
+        ...
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+Wrapper = Callable[..., Any]
+"""Called with the wrapped function, then whatever the patched one was called with."""
+
+
+class _Stack:
+    """The wrappers of one patched attribute, innermost first."""
+
+    def __init__(self, original: Callable[..., object], owned: bool) -> None:
+        self.original = original
+        self.owned = owned
+        """Whether the original was set on the owner itself rather than inherited."""
+        self.wrappers: list[Wrapper] = []
+
+
+def _layer(wrapper: Wrapper, inner: Callable[..., object]) -> Callable[..., object]:
+    def patched(*args, **kwargs) -> object:
+        return wrapper(inner, *args, **kwargs)
+
+    return patched
+
+
+def _install(owner: object, name: str, stack: _Stack) -> None:
+    if not stack.wrappers:
+        if stack.owned:
+            setattr(owner, name, stack.original)
+        else:
+            delattr(owner, name)
+        return
+    function = stack.original
+    for wrapper in stack.wrappers:
+        function = _layer(wrapper, function)
+    function._patch_stack = stack
+    setattr(owner, name, function)
+
+
+def patch(owner: object, name: str, wrapper: Wrapper) -> Callable[[], None]:
+    """Wrap `owner.name` in `wrapper`, over any patches it already has.
+
+    Returns:
+        A function removing this patch, which does nothing if called again.
+    """
+    installed = vars(owner).get(name)
+    stack = getattr(installed, "_patch_stack", None)
+    if stack is None:
+        stack = _Stack(getattr(owner, name), installed is not None)
+    stack.wrappers.append(wrapper)
+    _install(owner, name, stack)
+    removed = False
+
+    def unpatch() -> None:
+        nonlocal removed
+        if not removed:
+            removed = True
+            stack.wrappers.remove(wrapper)
+            _install(owner, name, stack)
+
+    return unpatch
+
+
+class Patches:
+    """Several patches, made by `start()` and removed by `stop()`.
+
+    Args:
+        patches: The owner, attribute name and wrapper of each, as for `patch`.
+    """
+
+    def __init__(self, *patches: tuple[object, str, Wrapper]) -> None:
+        self.patches = patches
+        self._unpatch: list[Callable[[], None]] = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._unpatch)
+
+    def start(self) -> None:
+        """Make the patches, unless they are made already."""
+        if self._unpatch:
+            return
+        for owner, name, wrapper in self.patches:
+            self._unpatch.append(patch(owner, name, wrapper))
+
+    def stop(self) -> None:
+        """Remove the patches, leaving any made since by others in place."""
+        while self._unpatch:
+            self._unpatch.pop()()
+
+    def __enter__(self) -> "Patches":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
@@ -0,0 +1,412 @@
+"""Lint an app's stylesheets for rule groups that flag whole widget types for restyling.
+
+`Stylesheet.apply` flags a node `_has_hover_style` or `_has_focus_within` when
+ANY candidate rule group for its names uses the pseudo-class in ANY of its
+comma variants (see lagging-mouse.py). This works that out per widget type,
+without running the app: it loads the same `CSS_PATH`, `DEFAULT_CSS` and `CSS`
+sources the app would, as if every widget type the script names was mounted.
+
+A hover-flagged widget restyles itself and its children twice per MouseMove,
+so the cost per move is estimated as rule groups checked per node restyled.
+A focus-within-flagged widget restyles its whole subtree on every focus change.
+
+Only type names and `DEFAULT_CLASSES` are known statically, so flags that come
+from ids or classes added at runtime are missed; `RestyleProfiler` audits those
+on a running app.
+
+`--fix` splits grouped rules by the pseudo-classes their variants use, which
+styles exactly the same nodes: `.tcss` files are rewritten in place, inline CSS
+is printed as a diff to apply by hand.
+
+Run from the repository root:
+    python -m restyle.analyzer lagging-mouse.py
+    python -m restyle.analyzer lagging-mouse.py --fix
+"""
+
+import difflib
+import importlib.util
+import inspect
+import json
+import re
+import sys
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+from textual.app import App
+from textual.css.stylesheet import Stylesheet
+from textual.dom import DOMNode
+from textual.screen import Screen
+
+from restyle.profiler import pseudo_class_rules, rule_sources
+
+# pseudo-classes `Stylesheet.apply` turns into a per-node restyle flag
+TRACKED = ("hover", "focus-within")
+# full restyles of the hovered widget per MouseMove, see `App._set_mouse_over`
+RESTYLES_PER_MOVE = 2
+
+_PSEUDO_CLASS = re.compile(r":([\w-]+)")
+_TOKEN = re.compile(r"/\*.*?\*/|\"(?:\\.|[^\"\\])*\"|'(?:\\.|[^'\\])*'|[{};]", re.S)
+_TRIVIA = re.compile(r"(?:\s|/\*.*?\*/)*", re.S)
+
+
+def load_module(path: str | Path) -> ModuleType:
+    """Import a script without running its app.
+
+    The script is imported under its own name rather than `__main__`, so its
+    argument parsing is skipped, and `App.run` does nothing meanwhile for
+    scripts that start their app at module level.
+
+    Returns:
+        The imported module.
+
+    Raises:
+        ImportError: If `path` can't be imported as a Python module.
+    """
+    path = Path(path).resolve()
+    spec = importlib.util.spec_from_file_location(path.stem.replace("-", "_"), path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"can't import {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    # scripts in folders import their sibling modules
+    sys.path.insert(0, str(path.parent))
+    run = App.run
+    App.run = lambda *args, **kwargs: None  # ty: ignore[invalid-assignment]
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        App.run = run
+        sys.path.remove(str(path.parent))
+    return module
+
+
+def app_classes(module: ModuleType) -> list[type[App]]:
+    """The App subclasses a module defines.
+
+    Returns:
+        The classes, in definition order.
+    """
+    return [
+        value
+        for value in vars(module).values()
+        if isinstance(value, type)
+        and issubclass(value, App)
+        and value.__module__ == module.__name__
+    ]
+
+
+def node_types(module: ModuleType) -> list[type[DOMNode]]:
+    """Every widget and screen type a module names, defined or imported.
+
+    Returns:
+        `Screen` and the module's DOMNode subclasses, apps excluded.
+    """
+    found: dict[type[DOMNode], None] = {Screen: None}
+    for value in vars(module).values():
+        if (
+            isinstance(value, type)
+            and issubclass(value, DOMNode)
+            and not issubclass(value, App)
+        ):
+            found[value] = None
+    return list(found)
+
+
+def default_css(
+    node_type: type[DOMNode],
+) -> list[tuple[tuple[str, str], str, int, str]]:
+    """The `DEFAULT_CSS` sources a node type brings in, as `DOMNode._get_default_css` finds them.
+
+    Returns:
+        `(read_from, css, tie_breaker, scope)` for the type and its bases.
+    """
+    sources = []
+    for tie_breaker, base in enumerate(DOMNode._css_bases(node_type)):
+        css: str = base.__dict__.get("DEFAULT_CSS", "")
+        if not css:
+            continue
+        try:
+            path = inspect.getfile(base)
+        except (TypeError, OSError):
+            path = ""
+        scoped: bool = base.__dict__.get("SCOPED_CSS", True)
+        sources.append((
+            (path, f"{base.__name__}.DEFAULT_CSS"),
+            css,
+            -tie_breaker,
+            base._css_type_name if scoped else "",
+        ))
+    return sources
+
+
+def css_paths(owner: type[App] | type[Screen]) -> list[Path]:
+    """The `CSS_PATH` files of an app or screen class, resolved next to its module.
+
+    Returns:
+        Absolute paths.
+    """
+    if owner.CSS_PATH is None:
+        return []
+    paths = owner.CSS_PATH if isinstance(owner.CSS_PATH, list) else [owner.CSS_PATH]
+    base = Path(inspect.getfile(owner)).parent
+    return [(base / path).resolve() for path in paths]
+
+
+def build_stylesheet(
+    app_class: type[App], node_types: Iterable[type[DOMNode]]
+) -> Stylesheet:
+    """Load the sources the app would once all of `node_types` were mounted.
+
+    Returns:
+        The parsed stylesheet.
+    """
+    node_types = list(node_types)
+    screens = [
+        node_type
+        for node_type in node_types
+        if issubclass(node_type, Screen) and node_type is not Screen
+    ]
+    stylesheet = Stylesheet(variables=App().get_css_variables())
+    for owner in (app_class, *screens):
+        for path in css_paths(owner):
+            stylesheet.read(path)
+    for node_type in (app_class, *node_types):
+        for read_from, css, tie_breaker, scope in default_css(node_type):
+            stylesheet.add_source(
+                css,
+                read_from=read_from,
+                is_default_css=True,
+                tie_breaker=tie_breaker,
+                scope=scope,
+            )
+    for owner in (app_class, *screens):
+        if owner.CSS:
+            scoped = issubclass(owner, Screen) and owner.SCOPED_CSS
+            stylesheet.add_source(
+                owner.CSS,
+                read_from=(inspect.getfile(owner), f"{owner.__name__}.CSS"),
+                scope=owner._css_type_name if scoped else "",
+            )
+    stylesheet.parse()
+    return stylesheet
+
+
+def type_names(node_type: type[DOMNode]) -> frozenset[str]:
+    """The `_selector_names` every instance of a type has, whatever its id and classes.
+
+    Returns:
+        `"*"`, the type names of the class and its bases, and its default classes.
+    """
+    return frozenset({
+        "*",
+        *node_type._css_type_names,
+        *(f".{name}" for name in node_type.DEFAULT_CLASSES.split()),
+    })
+
+
+def analyze(
+    stylesheet: Stylesheet, node_types: Iterable[type[DOMNode]]
+) -> list[dict[str, Any]]:
+    """Work out which pseudo-class flags each node type gets, and what they cost.
+
+    Returns:
+        One JSON-serialisable entry per node type.
+    """
+    sources = rule_sources(stylesheet)
+    rules_map = stylesheet.rules_map
+    entries = []
+    for node_type in node_types:
+        names = type_names(node_type)
+        candidates = len({
+            rule for name in rules_map.keys() & names for rule in rules_map[name]
+        })
+        entry: dict[str, Any] = {"type": node_type.__name__, "candidates": candidates}
+        for pseudo_class in TRACKED:
+            entry[pseudo_class] = [
+                {
+                    "selectors": rule.selectors,
+                    "source": sources.get(rule, "?"),
+                    "grouped": grouped,
+                }
+                for rule, grouped in pseudo_class_rules(stylesheet, names, pseudo_class)
+            ]
+        entry["checks_per_move"] = (
+            RESTYLES_PER_MOVE * candidates if entry["hover"] else 0
+        )
+        entries.append(entry)
+    return entries
+
+
+def flag(rules: list[dict[str, Any]]) -> str:
+    """Summarise the rules behind one flag for the lint table.
+
+    Returns:
+        `-` for no flag, `grouped` if only grouped rules set it, else `yes`.
+    """
+    if not rules:
+        return "-"
+    return "grouped" if all(rule["grouped"] for rule in rules) else "yes"
+
+
+def _blocks(css: str) -> Iterator[tuple[int, int, int]]:
+    """Find the rule blocks at the top level of `css`, skipping comments and strings.
+
+    Yields:
+        `(prelude_start, open_brace, close_brace)` offsets.
+    """
+    start = depth = opened = 0
+    for match in _TOKEN.finditer(css):
+        token = match.group()
+        if token == "{":
+            if depth == 0:
+                opened = match.start()
+            depth += 1
+        elif token == "}" and depth:
+            depth -= 1
+            if depth == 0:
+                yield _TRIVIA.match(css, start).end(), opened, match.start()
+                start = match.end()
+        elif token == ";" and depth == 0:
+            start = match.end()
+
+
+def _split_prelude(prelude: str, pseudo_classes: frozenset[str]) -> list[str] | None:
+    """Group the comma variants of a selector list by the tracked pseudo-classes they use.
+
+    Returns:
+        The selector list of each group in order of appearance, or None if
+        every variant uses the same tracked pseudo-classes.
+    """
+    groups: dict[frozenset[str], list[str]] = {}
+    for variant in prelude.split(","):
+        used = pseudo_classes.intersection(_PSEUDO_CLASS.findall(variant))
+        groups.setdefault(frozenset(used), []).append(variant.strip())
+    if len(groups) < 2:
+        return None
+    indent = prelude[prelude.rfind("\n") + 1 :] if "\n" in prelude else ""
+    separator = f",\n{indent[: len(indent) - len(indent.lstrip())]}" if indent else ", "
+    return [separator.join(variants) for variants in groups.values()]
+
+
+def split_grouped(css: str, pseudo_classes: Iterable[str] = TRACKED) -> tuple[str, int]:
+    """Rewrite rule groups that mix variants with and without a tracked pseudo-class.
+
+    `#footer > *, Button:hover { ... }` becomes `#footer > * { ... }` followed by
+    `Button:hover { ... }`, the `HOVER_CSS_SPLIT` form. Both halves keep the
+    same declarations and nested rules, so each node gets the same styles;
+    only the pseudo-class flags stop spreading to the variants without it.
+
+    Returns:
+        The rewritten CSS and how many rule groups were split.
+    """
+    tracked = frozenset(pseudo_classes)
+    out = []
+    position = split = 0
+    for start, opened, closed in _blocks(css):
+        body, nested = split_grouped(css[opened + 1 : closed], tracked)
+        split += nested
+        prelude = css[start:opened]
+        groups = _split_prelude(prelude, tracked)
+        line_start = css.rfind("\n", 0, start) + 1
+        indent = css[line_start:start] if css[line_start:start].isspace() else ""
+        out.append(css[position:start])
+        if groups is None:
+            out.append(f"{prelude}{{{body}}}")
+        else:
+            split += 1
+            out.append(f"\n{indent}".join(f"{group} {{{body}}}" for group in groups))
+        position = closed + 1
+    out.append(css[position:])
+    return "".join(out), split
+
+
+def fix(stylesheet: Stylesheet, root: Path) -> int:
+    """Split grouped rules in every source under `root`, leaving Textual's own alone.
+
+    Returns:
+        How many rule groups were split.
+    """
+    total = 0
+    for (path, name), source in stylesheet.source.items():
+        if not path or not Path(path).resolve().is_relative_to(root):
+            continue
+        css, split = split_grouped(source.content)
+        if not split:
+            continue
+        total += split
+        if not name:
+            Path(path).write_text(css)
+            print(f"{path}: split {split} rule group(s)")
+            continue
+        sys.stdout.writelines(
+            difflib.unified_diff(
+                source.content.splitlines(keepends=True),
+                css.splitlines(keepends=True),
+                f"{path}:{name}",
+                f"{path}:{name} (split)",
+            )
+        )
+    return total
+
+
+def lint(path: str | Path, fix_rules: bool = False, json_path: str = "") -> int:
+    """Analyze every app in a script and print a table per app.
+
+    Returns:
+        The exit status: 1 if any widget type is flagged only by grouped rules.
+    """
+    module = load_module(path)
+    root = Path(path).resolve().parent
+    types = node_types(module)
+    status = 0
+    report = {}
+    for app_class in app_classes(module):
+        stylesheet = build_stylesheet(app_class, types)
+        entries = analyze(stylesheet, types)
+        report[app_class.__name__] = entries
+        print(f"{app_class.__name__} ({path})")
+        print(
+            f"  {'type':<24} {'hover':<8} {'focus-within':<13} {'rules':>5} {'checks/move':>11}"
+        )
+        for entry in entries:
+            print(
+                f"  {entry['type']:<24} {flag(entry['hover']):<8} "
+                f"{flag(entry['focus-within']):<13} {entry['candidates']:>5} "
+                f"{entry['checks_per_move']:>11}"
+            )
+        grouped: dict[tuple[str, str], list[str]] = {}
+        for entry in entries:
+            for pseudo_class in TRACKED:
+                for rule in entry[pseudo_class]:
+                    if rule["grouped"]:
+                        key = (rule["source"], rule["selectors"])
+                        grouped.setdefault(key, []).append(entry["type"])
+        for (source, selectors), flagged in grouped.items():
+            status = 1
+            print(f"  grouped: {selectors!r} in {source} flags {', '.join(flagged)}")
+        if fix_rules:
+            fix(stylesheet, root)
+    if json_path:
+        Path(json_path).write_text(json.dumps(report, indent=2))
+    return status
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Find rule groups that make widgets hover- or focus-styled"
+    )
+    parser.add_argument("script", help="Python script defining the app(s) to analyze")
+    parser.add_argument(
+        "--fix",
+        action="store_true",
+        help="Split grouped rules (.tcss in place, inline CSS as a diff)",
+    )
+    parser.add_argument(
+        "--json", default="", metavar="PATH", help="Also write the analysis as JSON"
+    )
+    args = parser.parse_args()
+    sys.exit(lint(args.script, args.fix, args.json))
@@ -0,0 +1,100 @@
+"""Compare lagging-mouse.py's grouped hover rule against its split forms.
+
+Raw MouseMove events are posted to the App over the OptionList, the same way
+the driver would, and the app's own `RestyleProfiler` counts what they cost.
+"fixed" is the grouped CSS after `split_grouped`, which should match "split",
+"guarded" keeps the grouped CSS but runs with `GuardMouseOver`.
+"est checks/move" is the analyzer's static estimate for the OptionList.
+
+Run from the repository root:
+    python -m restyle.benchmark
+    python -m restyle.benchmark --moves 5000
+"""
+
+import asyncio
+import time
+from pathlib import Path
+
+from textual import events
+from textual.app import App
+from textual.widgets import OptionList
+
+from restyle.analyzer import (
+    analyze,
+    build_stylesheet,
+    load_module,
+    node_types,
+    split_grouped,
+)
+
+SCRIPT = Path(__file__).parent.parent / "lagging-mouse.py"
+
+
+async def run(app: App, moves: int) -> dict[str, float]:
+    """Post `moves` MouseMoves over the OptionList and wait for them to be handled.
+
+    Returns:
+        Restyles, nodes restyled, time spent restyling and wall time.
+    """
+    async with app.run_test(size=(100, 30)) as pilot:
+        await pilot.pause()
+        region = app.query_one(OptionList).scrollable_content_region
+        y = region.y + region.height // 2
+        profiler = app.profiler
+        profiler.reset()
+        start = time.monotonic()
+        for n in range(moves):
+            x = region.x + 1 + n % (region.width - 2)
+            app.post_message(
+                events.MouseMove(None, x, y, 1, 0, 0, False, False, False, x, y)
+            )
+        await pilot.pause()
+        return {
+            "restyles": profiler.restyles,
+            "nodes": sum(profiler.applies.values()),
+            "restyle_ms": profiler.seconds * 1000,
+            "wall_s": time.monotonic() - start,
+        }
+
+
+async def main(moves: int) -> None:
+    module = load_module(SCRIPT)
+    grouped_css = module.LaggingMouseApp.CSS
+    fixed_css, _ = split_grouped(grouped_css)
+    split_css = grouped_css.replace(module.HOVER_CSS_GROUPED, module.HOVER_CSS_SPLIT)
+    types = node_types(module)
+    print(f"{moves} MouseMove over the OptionList")
+    print(
+        f"{'variant':<8} {'est checks/move':>15} {'restyles':>8} {'nodes':>7} "
+        f"{'restyle ms':>10} {'wall s':>7}"
+    )
+    for name, base, css in (
+        ("grouped", module.LaggingMouseApp, grouped_css),
+        ("split", module.LaggingMouseApp, split_css),
+        ("fixed", module.LaggingMouseApp, fixed_css),
+        ("guarded", module.GuardedLaggingMouseApp, grouped_css),
+    ):
+        app_class = type(base.__name__, (base,), {"CSS": css})
+        estimate = next(
+            entry["checks_per_move"]
+            for entry in analyze(build_stylesheet(app_class, types), types)
+            if entry["type"] == "OptionList"
+        )
+        result = await run(app_class(), moves)
+        print(
+            f"{name:<8} {estimate:>15} {result['restyles']:>8} {result['nodes']:>7} "
+            f"{result['restyle_ms']:>10.1f} {result['wall_s']:>7.2f}"
+        )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Grouped vs split hover rule benchmark"
+    )
+    parser.add_argument(
+        "--moves", type=int, default=2000, help="MouseMove events to post"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.moves))
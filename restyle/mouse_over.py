@@ -0,0 +1,65 @@
+"""Restyle hover-flagged widgets only when the widget under the mouse changes.
+
+`App._set_mouse_over` runs on every MouseMove and restyles the hovered widget
+twice whenever it is hover-flagged, even if the mouse never left it. This
+mixin skips calls that would not change `mouse_over` or `hover_over`, and
+defers the restyles of actual transitions to one flush after the next refresh,
+so a widget entered and left within one frame is only restyled once.
+
+Usage:
+    class MyApp(GuardMouseOver, App): ...
+"""
+
+from textual.dom import DOMNode
+from textual.widget import Widget
+
+
+class GuardMouseOver:
+    """App mixin adding an identity guard and per-frame batching to mouse-over restyles.
+
+    Only restyles requested by `_set_mouse_over` are deferred, every other
+    `update_styles` call still applies immediately.
+    """
+
+    mouse_over: Widget | None
+    hover_over: Widget | None
+
+    skipped_mouse_over: int = 0
+    """How many mouse-over updates were skipped because nothing changed."""
+
+    _deferring = False
+    # pending restyle roots, and whether any of their requests wanted animation
+    _pending_restyles: dict[DOMNode, bool] | None = None
+
+    def _set_mouse_over(
+        self, widget: Widget | None, hover_widget: Widget | None
+    ) -> None:
+        if widget is self.mouse_over and hover_widget is self.hover_over:
+            self.skipped_mouse_over += 1
+            return
+        self._deferring = True
+        try:
+            super()._set_mouse_over(widget, hover_widget)  # ty: ignore[unresolved-attribute]
+        finally:
+            self._deferring = False
+
+    def update_styles(self, node: DOMNode, animate: bool = True) -> None:
+        if not self._deferring or node is self:
+            super().update_styles(node, animate=animate)  # ty: ignore[unresolved-attribute]
+            return
+        pending = self._pending_restyles
+        if pending is None:
+            pending = self._pending_restyles = {}
+            self.call_after_refresh(self._flush_restyles)  # ty: ignore[unresolved-attribute]
+        pending[node] = pending.get(node, False) or animate
+
+    def _flush_restyles(self) -> None:
+        """Restyle each pending node once, skipping those inside another pending subtree."""
+        pending = self._pending_restyles or {}
+        self._pending_restyles = None
+        for node, animate in pending.items():
+            if not node.is_attached or any(
+                ancestor in pending for ancestor in node.ancestors
+            ):
+                continue
+            node.update_node_styles(animate=animate)
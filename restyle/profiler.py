@@ -0,0 +1,282 @@
+"""Find out what restyles cost, who pays for them, and why.
+
+Every `DOMNode.update_node_styles` call re-applies the stylesheet to a node and
+all of its descendants. `RestyleProfiler` times those calls per widget type,
+remembers which message was being handled when they happened, and can audit
+the app for widgets that are flagged `_has_hover_style` along with the rule
+groups that flagged them.
+
+Usage:
+    with RestyleProfiler() as profiler:
+        ...  # drive the app
+    profiler.dump("restyles.json", app)
+"""
+
+import json
+import time
+from collections import Counter, defaultdict
+from collections.abc import Awaitable, Callable, Iterable
+from collections.abc import Set as AbstractSet
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any
+
+from textual.app import App
+from textual.css.model import RuleSet, Selector, SelectorType
+from textual.css.stylesheet import Stylesheet
+from textual.dom import DOMNode
+from textual.message import Message
+from textual.message_pump import MessagePump
+
+from patching import Patches
+from selector_index import rule_locations
+
+# the message each message pump's task is currently dispatching
+_dispatching: ContextVar[Message | None] = ContextVar("dispatching", default=None)
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list.
+
+    Returns:
+        The value, or 0.0 for an empty list.
+    """
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class RestyleProfiler:
+    """Records every `update_node_styles` call while started.
+
+    Args:
+        on_record: Called after each recorded restyle, e.g. to refresh a status line.
+    """
+
+    def __init__(self, on_record: Callable[[], Any] | None = None) -> None:
+        self.on_record = on_record
+        self.durations: defaultdict[str, list[float]] = defaultdict(list)
+        self.applies: Counter[str] = Counter()
+        self.triggers: defaultdict[str, Counter[str]] = defaultdict(Counter)
+        self._patches: Patches | None = None
+
+    @property
+    def restyles(self) -> int:
+        """Total restyles recorded."""
+        return sum(len(durations) for durations in self.durations.values())
+
+    @property
+    def seconds(self) -> float:
+        """Total time spent restyling."""
+        return sum(sum(durations) for durations in self.durations.values())
+
+    def reset(self) -> None:
+        """Forget everything recorded so far."""
+        self.durations.clear()
+        self.applies.clear()
+        self.triggers.clear()
+
+    def start(self) -> "RestyleProfiler":
+        """Patch Textual so restyles get recorded.
+
+        Returns:
+            Self.
+        """
+        if self._patches is not None:
+            return self
+        profiler = self
+        applied = [0]
+
+        def recorded_update_node_styles(
+            update_node_styles: Callable[..., None], node: DOMNode, animate: bool = True
+        ) -> None:
+            applied[0] = 0
+            start = time.perf_counter()
+            update_node_styles(node, animate=animate)
+            elapsed = time.perf_counter() - start
+            if not applied[0]:
+                # deferred (see GuardMouseOver) or nothing attached to restyle
+                return
+            name = type(node).__name__
+            profiler.durations[name].append(elapsed)
+            profiler.applies[name] += applied[0]
+            message = _dispatching.get()
+            trigger = "<none>" if message is None else type(message).__name__
+            profiler.triggers[name][trigger] += 1
+            if profiler.on_record is not None:
+                profiler.on_record()
+
+        def counted_apply(
+            apply: Callable[..., None], stylesheet: Stylesheet, node: DOMNode, **kwargs
+        ) -> None:
+            applied[0] += 1
+            apply(stylesheet, node, **kwargs)
+
+        async def tracked_dispatch_message(
+            dispatch_message: Callable[..., Awaitable[None]],
+            pump: MessagePump,
+            message: Message,
+        ) -> None:
+            token = _dispatching.set(message)
+            try:
+                await dispatch_message(pump, message)
+            finally:
+                _dispatching.reset(token)
+
+        self._patches = Patches(
+            (DOMNode, "update_node_styles", recorded_update_node_styles),
+            (Stylesheet, "apply", counted_apply),
+            (MessagePump, "_dispatch_message", tracked_dispatch_message),
+        )
+        self._patches.start()
+        return self
+
+    def stop(self) -> None:
+        """Undo the patches from `start`, keeping what was recorded."""
+        if self._patches is not None:
+            self._patches.stop()
+            self._patches = None
+
+    def __enter__(self) -> "RestyleProfiler":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def report(self, app: App | None = None) -> dict[str, Any]:
+        """Summarise what was recorded, and audit `app` for hover-styled widgets.
+
+        Returns:
+            A JSON-serialisable dict.
+        """
+        widgets = {}
+        for name, durations in sorted(
+            self.durations.items(), key=lambda item: -sum(item[1])
+        ):
+            ordered = sorted(durations)
+            widgets[name] = {
+                "restyles": len(ordered),
+                "nodes_restyled": self.applies[name],
+                "total_ms": sum(ordered) * 1000,
+                "p50_ms": percentile(ordered, 0.50) * 1000,
+                "p95_ms": percentile(ordered, 0.95) * 1000,
+                "p99_ms": percentile(ordered, 0.99) * 1000,
+                "triggers": dict(self.triggers[name].most_common()),
+            }
+        report: dict[str, Any] = {
+            "restyles": self.restyles,
+            "total_ms": self.seconds * 1000,
+            "widgets": widgets,
+        }
+        if app is not None:
+            report["hover_styled"] = hover_audit(app)
+        return report
+
+    def dump(self, path: str | Path, app: App | None = None) -> None:
+        """Write `report(app)` to `path` as JSON."""
+        Path(path).write_text(json.dumps(self.report(app), indent=2))
+
+
+def rule_sources(stylesheet: Stylesheet) -> dict[RuleSet, str]:
+    """Map each parsed rule set to the CSS source it came from.
+
+    Returns:
+        `"path:ClassName.CSS"`-like locations, see `rule_locations`.
+    """
+    return {
+        rule: ":".join(part for part in read_from if part)
+        for rule, read_from in rule_locations(stylesheet).items()
+    }
+
+
+def hover_rules(stylesheet: Stylesheet, node: DOMNode) -> list[tuple[RuleSet, bool]]:
+    """The rule groups that set `node._has_hover_style`, the same way `Stylesheet.apply` does.
+
+    Returns:
+        `(rule_set, grouped)` pairs, see `pseudo_class_rules`.
+    """
+    return pseudo_class_rules(stylesheet, node._selector_names, "hover")
+
+
+def pseudo_class_rules(
+    stylesheet: Stylesheet, names: AbstractSet[str], pseudo_class: str
+) -> list[tuple[RuleSet, bool]]:
+    """The rule groups that flag a node with `names` as styled by `pseudo_class`.
+
+    Returns:
+        `(rule_set, grouped)` pairs, where `grouped` means no variant using the
+        pseudo-class could match the names on its own, so the node is only
+        flagged because the group shares pseudo-classes across its variants.
+    """
+    rules_map = stylesheet.rules_map
+    candidates = {rule for name in rules_map.keys() & names for rule in rules_map[name]}
+    found = []
+    for rule in stylesheet.rules:
+        if rule not in candidates or pseudo_class not in rule.pseudo_classes:
+            continue
+        grouped = True
+        for selector_set in rule.selector_set:
+            if not any(
+                pseudo_class in selector.pseudo_classes
+                for selector in selector_set.selectors
+            ):
+                continue
+            if indexed_name(selector_set.selectors[-1]) in names:
+                grouped = False
+                break
+        found.append((rule, grouped))
+    return found
+
+
+def indexed_name(selector: Selector) -> str:
+    """The name `RuleSet._post_parse` indexes a final selector under.
+
+    Returns:
+        `"*"`, `"Type"`, `".class"`, `"#id"`, or `""` for nesting selectors.
+    """
+    if selector.type == SelectorType.UNIVERSAL:
+        return "*"
+    if selector.type == SelectorType.TYPE:
+        return selector.name
+    if selector.type == SelectorType.CLASS:
+        return f".{selector.name}"
+    if selector.type == SelectorType.ID:
+        return f"#{selector.name}"
+    return ""
+
+
+def walk_app(app: App) -> Iterable[DOMNode]:
+    """Every node on every screen of the app's screen stack.
+
+    Yields:
+        Screens and their descendants.
+    """
+    for screen in app.screen_stack:
+        yield from screen.walk_children(with_self=True)
+
+
+def hover_audit(app: App) -> list[dict[str, Any]]:
+    """List the widgets flagged `_has_hover_style`, and the rule groups responsible.
+
+    Returns:
+        One entry per hover-styled node.
+    """
+    stylesheet = app.stylesheet
+    sources = rule_sources(stylesheet)
+    audit = []
+    for node in walk_app(app):
+        if not node._has_hover_style:
+            continue
+        audit.append({
+            "widget": repr(node),
+            "type": type(node).__name__,
+            "rules": [
+                {
+                    "selectors": rule.selectors,
+                    "source": sources.get(rule, "?"),
+                    "grouped": grouped,
+                }
+                for rule, grouped in hover_rules(stylesheet, node)
+            ],
+        })
+    return audit
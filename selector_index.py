@@ -0,0 +1,177 @@
+"""Find the rules of a stylesheet that apply to a DOMNode, for the Inspector's Rules tab.
+
+`SelectorIndex` files every selector of every rule set under the key selector
+Textual has to match against the node itself: the id, class or type in the
+last compound of the selector, or a bucket of its own for universal selectors.
+Looking a node up only checks the selectors filed under its id, classes and
+types, instead of every rule in the stylesheet.
+"""
+
+from pathlib import Path
+from typing import NamedTuple
+
+from textual.css.match import _check_selectors
+from textual.css.model import CombinatorType, RuleSet, SelectorSet, SelectorType
+from textual.css.stylesheet import Stylesheet
+from textual.css.types import CSSLocation
+from textual.dom import DOMNode
+
+SENSITIVE = frozenset({"hover", "focus", "focus-within"})
+"""Pseudo classes that restyle a node as the mouse or focus moves."""
+
+
+class Match(NamedTuple):
+    """A selector that matches a node, or could once its pseudo classes change."""
+
+    rule: RuleSet
+    selector_set: SelectorSet
+    source: str
+    """Where the rule was read from, such as `app.py MyApp.CSS`."""
+    order: int
+    """Position of the rule in the stylesheet, later rules win ties."""
+    matched: bool
+    """Whether it applies to the node right now."""
+
+    @property
+    def sensitive(self) -> set[str]:
+        """The hover and focus pseudo classes the selector depends on."""
+        return {
+            pseudo_class
+            for selector in self.selector_set.selectors
+            for pseudo_class in selector.pseudo_classes
+            if pseudo_class in SENSITIVE
+        }
+
+    @property
+    def cascade_key(self) -> tuple[bool, int, tuple[int, int, int], int]:
+        """Sorts matches the way Textual resolves them, the winning rule last."""
+        return (
+            not self.rule.is_default_rules,
+            self.rule.tie_breaker,
+            self.selector_set.specificity,
+            self.order,
+        )
+
+
+def rule_locations(stylesheet: Stylesheet) -> dict[RuleSet, CSSLocation]:
+    """Map each of a parsed stylesheet's rule sets to where its CSS was read from.
+
+    `Stylesheet.parse` adds the rules of each source in `stylesheet.source` in
+    turn, skipping invalid CSS, so the rules are split into runs the same way.
+    Only how many rules each source has is used, so sources whose rules fell
+    out of the stylesheet's parse cache are still found.
+
+    Returns:
+        The path and name of the source of every rule set in `stylesheet.rules`.
+    """
+    rules = stylesheet.rules
+    locations: dict[RuleSet, CSSLocation] = {}
+    start = 0
+    for read_from, (css, is_default, tie_breaker, scope) in stylesheet.source.items():
+        if css in stylesheet._invalid_css:
+            continue
+        count = len(
+            stylesheet._parse_rules(css, read_from, is_default, tie_breaker, scope)
+        )
+        for rule in rules[start : start + count]:
+            locations[rule] = read_from
+        start += count
+    return locations
+
+
+# the rule set and one of its selectors, with the rule's position in the stylesheet
+Entry = tuple[int, RuleSet, SelectorSet]
+
+
+class SelectorIndex:
+    """Selectors of a stylesheet's rules, bucketed by the id, class or type they end in.
+
+    Args:
+        stylesheet: The stylesheet to index, usually `app.stylesheet`.
+    """
+
+    def __init__(self, stylesheet: Stylesheet) -> None:
+        self.rules = stylesheet.rules
+        self.ids: dict[str, list[Entry]] = {}
+        self.classes: dict[str, list[Entry]] = {}
+        self.types: dict[str, list[Entry]] = {}
+        self.universal: list[Entry] = []
+        self.sources = self.find_sources(stylesheet)
+        for order, rule in enumerate(self.rules):
+            for selector_set in rule.selector_set:
+                self.file((order, rule, selector_set))
+
+    def is_current(self, stylesheet: Stylesheet) -> bool:
+        """Whether the stylesheet was parsed again since it was indexed.
+
+        Returns:
+            True if the index still describes `stylesheet`.
+        """
+        return stylesheet.rules is self.rules
+
+    @staticmethod
+    def find_sources(stylesheet: Stylesheet) -> dict[RuleSet, str]:
+        """Map each rule set to the CSS it was parsed from.
+
+        Returns:
+            A description of the source of each rule set, see `rule_locations`.
+        """
+        return {
+            rule: f"{Path(path).name} {name}".strip()
+            for rule, (path, name) in rule_locations(stylesheet).items()
+        }
+
+    def file(self, entry: Entry) -> None:
+        """Add a selector to the bucket of its key selector."""
+        selectors = entry[2].selectors
+        # the last compound selector, e.g. `Label.title:hover` in `Screen > Label.title:hover`
+        compound = [selectors[-1]]
+        for selector in reversed(selectors[:-1]):
+            if compound[-1].combinator != CombinatorType.SAME:
+                break
+            compound.append(selector)
+        for selector_type, buckets in (
+            (SelectorType.ID, self.ids),
+            (SelectorType.CLASS, self.classes),
+            (SelectorType.TYPE, self.types),
+        ):
+            for selector in compound:
+                if selector.type == selector_type:
+                    buckets.setdefault(selector.name, []).append(entry)
+                    return
+        self.universal.append(entry)
+
+    def candidates(self, node: DOMNode) -> list[Entry]:
+        """Selectors whose key selector matches `node`, in stylesheet order.
+
+        Returns:
+            Every selector that could apply to `node`, depending on its ancestors
+            and pseudo classes.
+        """
+        entries = list(self.universal)
+        if node.id is not None:
+            entries += self.ids.get(node.id, ())
+        for class_name in node.classes:
+            entries += self.classes.get(class_name, ())
+        for type_name in node._css_types:
+            entries += self.types.get(type_name, ())
+        entries.sort(key=lambda entry: entry[0])
+        return entries
+
+    def matches(self, node: DOMNode) -> list[Match]:
+        """The selectors that apply to `node`, and those that would on hover or focus.
+
+        Returns:
+            Matches in cascade order, the winning rule last.
+        """
+        css_path_nodes = node.css_path_nodes
+        matches = []
+        for order, rule, selector_set in self.candidates(node):
+            matched = _check_selectors(selector_set.selectors, css_path_nodes)
+            match = Match(
+                rule, selector_set, self.sources.get(rule, "?"), order, matched
+            )
+            if matched or match.sensitive:
+                matches.append(match)
+        matches.sort(key=lambda match: match.cascade_key)
+        return matches
@@ -1,9 +1,8 @@
-from asyncio import sleep
-
-from textual import work
 from textual.app import App, ComposeResult
 from textual.widgets import Button
 
+from offset_animation import shake
+
 
 class Application(App):
     CSS = """
@@ -15,15 +14,8 @@ class Application(App):
     def compose(self) -> ComposeResult:
         yield Button("Shake me!")
 
-    @work
-    async def on_button_pressed(self, event: Button.Pressed):
-        self.query_one(Button).styles.margin = (0, 0, 0, 11)
-        await sleep(0.1)
-        self.query_one(Button).styles.margin = (0, 0, 0, 10)
-        await sleep(0.1)
-        self.query_one(Button).styles.margin = (0, 0, 0, 11)
-        await sleep(0.1)
-        self.query_one(Button).styles.margin = (0, 0, 0, 10)
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        shake(event.button)
 
 
 Application().run()
@@ -0,0 +1,148 @@
+"""Drive a synthetic mouse stream through each MouseArea variant and compare.
+
+Raw MouseMove events are posted to the App at a fixed rate, the same way the
+driver would, so they go through the Screen's hit test and forwarding before
+reaching `MouseArea.on_mouse_move`.
+
+"handled ms" is how long after the last move a handler saw its position,
+"visible ms" is when the screen refresh showing that handler's output finished.
+
+Run:
+    python benchmark.py
+    python benchmark.py --rate 2000 --seconds 2
+"""
+
+import asyncio
+import inspect
+import time
+from collections.abc import Callable, Iterable
+from functools import partial
+
+import coalesced
+import no_throttle
+import throttled
+from stats import count, counters
+from textual import events
+from textual.app import App, ComposeResult
+from textual.widget import Widget
+from throttle import LeadingTrailing, PerFrame, Policy, throttle
+
+
+def throttled_app(policy: Policy) -> App:
+    """Build throttled.py's app with its handler throttled by `policy` instead.
+
+    Returns:
+        The app, not yet running.
+    """
+    body = inspect.unwrap(throttled.MouseArea.on_mouse_move)
+    mouse_area = type(
+        "MouseArea",
+        (Widget,),
+        {
+            "DEFAULT_CSS": throttled.MouseArea.DEFAULT_CSS,
+            "on_mouse_move": count("events")(
+                throttle(policy=policy)(count("calls")(body))
+            ),
+        },
+    )
+
+    class Apple(throttled.Apple):
+        def compose(self) -> ComposeResult:
+            widgets: Iterable[Widget] = super().compose()
+            for widget in widgets:
+                yield (
+                    mouse_area() if isinstance(widget, throttled.MouseArea) else widget
+                )
+
+    return Apple()
+
+
+VARIANTS: dict[str, Callable[[], App]] = {
+    "no-throttle": no_throttle.Apple,
+    "throttled": partial(throttled_app, LeadingTrailing(throttled.THROTTLE_DELAY)),
+    "per-frame": partial(throttled_app, PerFrame()),
+    "coalesced": coalesced.Apple,
+}
+
+
+async def run(app: App, rate: int, seconds: float) -> dict[str, float]:
+    """Stream `rate` moves per second for `seconds` over the app's MouseArea.
+
+    Returns:
+        Counts, wall time and the latencies of the last position.
+    """
+    async with app.run_test(size=(120, 40)) as pilot:
+        screen = app.screen
+        paints: list[float] = []
+        compositor_refresh = screen._compositor_refresh
+
+        def timed_refresh() -> None:
+            compositor_refresh()
+            paints.append(time.monotonic())
+
+        screen._compositor_refresh = timed_refresh
+
+        region = app.query_one("MouseArea").region
+        y = region.y + region.height // 2
+        width = region.width - 2
+        counters.events = counters.calls = 0
+        counters.last = None
+        total = int(rate * seconds)
+        start = time.monotonic()
+        for n in range(total):
+            x = region.x + 1 + n % width
+            app.post_message(
+                events.MouseMove(None, x, y, 1, 0, 0, False, False, False, x, y)
+            )
+            posted = time.monotonic()
+            wait = start + (n + 1) / rate - posted
+            if wait > 0:
+                await asyncio.sleep(wait)
+        handled = visible = float("nan")
+        while time.monotonic() - posted < 10:
+            last = counters.last
+            if isinstance(last, events.MouseMove) and last.screen_x == x:
+                handled = (counters.last_at - posted) * 1000
+                break
+            await asyncio.sleep(0.001)
+        await pilot.pause(0.1)
+        for painted in paints:
+            if painted >= counters.last_at:
+                visible = (painted - posted) * 1000
+                break
+        return {
+            "posted": total,
+            "delivered": counters.events,
+            "calls": counters.calls,
+            "wall_s": time.monotonic() - start,
+            "handled_ms": handled,
+            "visible_ms": visible,
+        }
+
+
+async def main(rate: int, seconds: float) -> None:
+    print(f"{rate} MouseMove/s for {seconds}s")
+    print(
+        f"{'variant':<12} {'posted':>7} {'delivered':>9} {'calls':>6} "
+        f"{'wall s':>7} {'handled ms':>10} {'visible ms':>10}"
+    )
+    for name, make_app in VARIANTS.items():
+        result = await run(make_app(), rate, seconds)
+        print(
+            f"{name:<12} {result['posted']:>7} {result['delivered']:>9} {result['calls']:>6} "
+            f"{result['wall_s']:>7.2f} {result['handled_ms']:>10.1f} {result['visible_ms']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="MouseMove storm benchmark")
+    parser.add_argument(
+        "--rate", type=int, default=2000, help="MouseMove events per second"
+    )
+    parser.add_argument(
+        "--seconds", type=float, default=2, help="How long to stream for"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.rate, args.seconds))
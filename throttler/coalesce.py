@@ -0,0 +1,63 @@
+import threading
+
+from textual import events
+from textual.message import Message
+
+
+def fold_mouse_move(into: events.MouseMove, event: events.MouseMove) -> None:
+    """Move `into` to the position of `event`, keeping the deltas of both."""
+    into._x = event._x
+    into._y = event._y
+    into._screen_x = event._screen_x
+    into._screen_y = event._screen_y
+    into._delta_x += event._delta_x
+    into._delta_y += event._delta_y
+    into.button = event.button
+    into.shift = event.shift
+    into.meta = event.meta
+    into.ctrl = event.ctrl
+    into._style = event._style
+    into.time = event.time
+
+
+class CoalesceMouseMove:
+    """Mixin that folds MouseMove messages waiting in a widget's queue into one.
+
+    While a MouseMove is queued and nothing else has been posted after it, any
+    newer MouseMove for the same widget updates that queued message instead of
+    being queued itself. The handler then sees the latest position, with
+    `delta_x`/`delta_y` summed over every folded move, so a busy widget handles
+    at most one move per trip through its queue instead of one per mouse report.
+
+    Put it before the widget class in the bases:
+
+        class MouseArea(CoalesceMouseMove, Widget): ...
+    """
+
+    _queued_move: events.MouseMove | None = None
+    coalesced_moves: int = 0
+    """How many MouseMove messages were folded into an earlier one."""
+
+    def post_message(self, message: Message) -> bool:
+        if threading.get_ident() != self._thread_id:
+            # posts from other threads reach the queue later, via
+            # call_soon_threadsafe, so they can't be ordered against a fold
+            self._queued_move = None
+            return super().post_message(message)
+        if type(message) is events.MouseMove:
+            queued = self._queued_move
+            if queued is not None and queued.widget is message.widget:
+                fold_mouse_move(queued, message)
+                self.coalesced_moves += 1
+                return True
+            posted = super().post_message(message)
+            self._queued_move = message if posted else None
+            return posted
+        # anything queued after the move must not be overtaken by later moves
+        self._queued_move = None
+        return super().post_message(message)
+
+    async def on_event(self, event: events.Event) -> None:
+        if event is self._queued_move:
+            self._queued_move = None
+        await super().on_event(event)
@@ -0,0 +1,66 @@
+import datetime
+
+from coalesce import CoalesceMouseMove
+from stats import RateMeter, count
+from textual import events
+from textual.app import App, ComposeResult
+from textual.widget import Widget
+from textual.widgets import Footer, Label, RichLog
+
+SHOW_STATS = False
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="MouseMove handler with queued moves coalesced"
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Show events, calls, timers and tasks per second",
+    )
+    SHOW_STATS = parser.parse_args().stats
+
+
+class MouseArea(CoalesceMouseMove, Widget):
+    DEFAULT_CSS = """
+    MouseArea {
+        height: 1fr;
+        border: solid $warning;
+        content-align: center middle;
+    }
+    """
+
+    @count("events")
+    @count("calls")
+    async def on_mouse_move(self, event: events.MouseMove) -> None:
+        ts = datetime.datetime.now().strftime("%H:%M:%S.%f")[:-3]
+        self.app.query_one(RichLog).write(
+            f"[dim]{ts}[/]  [yellow]MouseMove[/]  "
+            f"x=[cyan]{event.x:3}[/]  y=[cyan]{event.y:3}[/]"
+        )
+
+
+class Apple(App):
+    CSS = """
+    Screen {
+        layout: vertical;
+    }
+    RichLog {
+        height: 1fr;
+        border: solid $primary;
+    }
+    """
+
+    def compose(self) -> ComposeResult:
+        yield Label("Move your mouse in the area below - queued events coalesced")
+        yield MouseArea()
+        yield RichLog(highlight=True, markup=True)
+        if SHOW_STATS:
+            yield RateMeter()
+        yield Footer()
+
+
+if __name__ == "__main__":
+    Apple().run()
@@ -1,10 +1,24 @@
 import datetime
 
+from stats import RateMeter, count
 from textual import events
 from textual.app import App, ComposeResult
 from textual.widget import Widget
 from textual.widgets import Footer, Label, RichLog
 
+SHOW_STATS = False
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Unthrottled MouseMove handler")
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Show events, calls, timers and tasks per second",
+    )
+    SHOW_STATS = parser.parse_args().stats
+
 
 class MouseArea(Widget):
     DEFAULT_CSS = """
@@ -15,6 +29,8 @@ class MouseArea(Widget):
     }
     """
 
+    @count("events")
+    @count("calls")
     async def on_mouse_move(self, event: events.MouseMove) -> None:
         ts = datetime.datetime.now().strftime("%H:%M:%S.%f")[:-3]
         self.app.query_one(RichLog).write(
@@ -38,6 +54,8 @@ class Apple(App):
         yield Label("Move your mouse in the area below - events not debounced")
         yield MouseArea()
         yield RichLog(highlight=True, markup=True)
+        if SHOW_STATS:
+            yield RateMeter()
         yield Footer()
 
 
@@ -0,0 +1,154 @@
+import asyncio
+import sys
+import time
+from collections.abc import Callable, Coroutine
+from functools import wraps
+from inspect import iscoroutinefunction
+from pathlib import Path
+from typing import Any
+
+# patching is shared with the rest of the repository, at its root
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from textual.dom import DOMNode
+from textual.timer import Timer
+from textual.widgets import Label
+from throttle import throttle_stats
+
+from patching import patch
+
+
+class Counters:
+    __slots__ = ("events", "calls", "timers", "tasks", "last", "last_at")
+
+    def __init__(self) -> None:
+        self.events = 0
+        self.calls = 0
+        self.timers = 0
+        self.tasks = 0
+        # event of the last completed call, and when it completed
+        self.last: object = None
+        self.last_at = 0.0
+
+
+counters = Counters()
+
+
+def count(field: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Count every call of a handler into `counters.<field>`.
+
+    Counting "calls" also records the event and completion time of each call
+    in `counters.last`/`counters.last_at`.
+
+    Returns:
+        A decorator for sync or async handlers.
+    """
+
+    track = field == "calls"
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        if iscoroutinefunction(func):
+
+            @wraps(func)
+            async def wrapper(*args) -> object:
+                setattr(counters, field, getattr(counters, field) + 1)
+                result = await func(*args)
+                if track:
+                    counters.last, counters.last_at = args[-1], time.monotonic()
+                return result
+
+        else:
+
+            @wraps(func)
+            def wrapper(*args) -> object:
+                setattr(counters, field, getattr(counters, field) + 1)
+                result = func(*args)
+                if track:
+                    counters.last, counters.last_at = args[-1], time.monotonic()
+                return result
+
+        return wrapper
+
+    return decorator
+
+
+def install() -> Callable[[], None]:
+    """Count every Timer and asyncio task created until the counting is taken out.
+
+    Returns:
+        A function taking the counting out again.
+    """
+
+    def counted_init(init: Callable[..., None], timer: Timer, *args, **kwargs) -> None:
+        counters.timers += 1
+        init(timer, *args, **kwargs)
+
+    unpatch = patch(Timer, "__init__", counted_init)
+
+    loop = asyncio.get_running_loop()
+    previous = loop.get_task_factory()
+
+    def task_factory(
+        loop: asyncio.AbstractEventLoop,
+        coro: Coroutine[object, object, object],
+        **kwargs,
+    ) -> asyncio.Future[object]:
+        counters.tasks += 1
+        if previous is None:
+            return asyncio.Task(coro, loop=loop, **kwargs)
+        return previous(loop, coro, **kwargs)
+
+    loop.set_task_factory(task_factory)
+
+    def uninstall() -> None:
+        unpatch()
+        # unless another factory was set over this one since
+        if loop.get_task_factory() is task_factory:
+            loop.set_task_factory(previous)
+
+    return uninstall
+
+
+class RateMeter(Label):
+    """Shows, once a second, how much work the last second of mouse movement cost.
+
+    `Δblocks` is the growth in live allocator blocks, so short-lived garbage that
+    was already freed does not show up there, but timers and tasks always do.
+    When given a widget, the running totals of its throttled handlers follow.
+    """
+
+    DEFAULT_CSS = """
+    RateMeter {
+        width: 1fr;
+        background: $boost;
+        padding: 0 1;
+    }
+    """
+
+    def __init__(self, throttled: DOMNode | None = None) -> None:
+        super().__init__()
+        self.throttled = throttled
+
+    def on_mount(self) -> None:
+        self.uninstall = install()
+        self.blocks = sys.getallocatedblocks()
+        self.update("stats: waiting for mouse movement")
+        self.set_interval(1, self.tick)
+
+    def on_unmount(self) -> None:
+        self.uninstall()
+
+    def tick(self) -> None:
+        blocks = sys.getallocatedblocks()
+        text = (
+            f"events/s: {counters.events}  calls/s: {counters.calls}  "
+            f"timers/s: {counters.timers}  tasks/s: {counters.tasks}  "
+            f"Δblocks/s: {blocks - self.blocks:+}"
+        )
+        if self.throttled is not None:
+            for name, stats in throttle_stats(self.throttled).items():
+                totals = " ".join(f"{key}={value}" for key, value in stats.items())
+                text += f"\n{name}: {totals}"
+        self.update(text)
+        self.blocks = blocks
+        counters.events = counters.calls = counters.timers = counters.tasks = 0
@@ -1,91 +1,427 @@
 import time
+from abc import ABC, abstractmethod
+from asyncio import sleep
 from collections.abc import Callable
-from functools import wraps
-from inspect import isawaitable, iscoroutinefunction
+from functools import partial, wraps
+from inspect import iscoroutinefunction
 from typing import Any
 
+from textual import constants
 from textual.dom import DOMNode
 from textual.message import Message
+from textual.message_pump import MessagePump
+from textual.timer import EventTargetGone, Timer
+from textual.worker import Worker
 
+NEVER = float("-inf")
+STATE_PREFIX = "_throttle_"
 
-def throttle(delay: float) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
-    """Leading-edge throttle with trailing-edge debounce for Textual message handlers.
 
-    The first event in a burst passes immediately. Events within `delay` seconds
-    are blocked. The last blocked event fires after `delay` seconds from the last allowed event.
+class _ThrottleState:
+    """Rate-limiter bookkeeping for one (instance, handler) pair.
+
+    Created once on the first event and kept on the instance, so the per-event
+    path is a dict lookup, a few float compares and at most one slot write.
+    """
+
+    __slots__ = (
+        "node",
+        "func",
+        "policy",
+        "timer",
+        "armed",
+        "pending",
+        "last",
+        "since",
+        "opened",
+        "count",
+        "tokens",
+        "seen",
+        "calls",
+        "worker",
+        "running",
+        "cancelled",
+        "completed",
+    )
+
+    def __init__(
+        self,
+        node: DOMNode,
+        func: Callable[..., Any],
+        policy: "Policy",
+        worker: bool = False,
+    ) -> None:
+        self.node = node
+        self.func = func
+        self.policy = policy
+        self.timer: _TrailingTimer | None = None
+        self.armed = False
+        # latest blocked event, waiting for the trailing edge
+        self.pending: Message | None = None
+        # time of the last call that went through
+        self.last = NEVER
+        # time the current pending burst started
+        self.since = NEVER
+        # window start (FixedWindow) or last refill (TokenBucket)
+        self.opened = NEVER
+        self.count = 0
+        self.tokens = float("inf")
+        self.seen = 0
+        self.calls = 0
+        # run async handlers as exclusive workers instead of awaiting them
+        self.worker = worker
+        self.running: Worker | None = None
+        self.cancelled = 0
+        self.completed = 0
+
+    def offer(self, event: Message) -> bool:
+        """Decide what to do with an incoming event.
+
+        Returns:
+            True if the handler should run now with `event`, otherwise the event
+            was either stored for the trailing edge or dropped.
+        """
+        self.seen += 1
+        now = time.monotonic()
+        # while a trailing call is queued, newer events only replace it, so
+        # calls can never run out of order
+        if self.pending is None and self.policy.admit(self, now):
+            self.last = now
+            self.calls += 1
+            return True
+        if self.policy.trailing:
+            if self.pending is None:
+                self.since = now
+            self.pending = event
+            self.arm()
+        return False
+
+    def arm(self) -> None:
+        """Schedule the trailing flush, unless it already is."""
+        if self.armed:
+            return
+        self.armed = True
+        self.policy.schedule(self)
+
+    def flush_at(self, deadline: float) -> None:
+        """Schedule the trailing flush on the one timer this state owns."""
+        if self.timer is None:
+            self.timer = _TrailingTimer(
+                self.node, partial(self.node.call_next, self.flush)
+            )
+            self.node._timers.add(self.timer)
+            self.timer._start()
+        self.timer.schedule(deadline)
+
+    def flush(self) -> object:
+        """Run the handler with the pending event, if the policy allows it yet.
+
+        Returns:
+            Whatever the handler returned (an awaitable for async handlers).
+        """
+        self.armed = False
+        event = self.pending
+        if event is None:
+            return None
+        now = time.monotonic()
+        if not self.policy.release(self, now):
+            self.arm()
+            return None
+        self.pending = None
+        self.last = now
+        self.calls += 1
+        if self.worker:
+            self.dispatch(event)
+            return None
+        return self.func(self.node, event)
+
+    def dispatch(self, event: Message) -> None:
+        """Run the handler in a worker, cancelling the previous run if it is still going."""
+        running = self.running
+        if running is not None and not running.is_finished:
+            self.cancelled += 1
+        name = self.func.__name__
+        self.running = self.node.run_worker(
+            self.run(event), name=name, group=f"throttle_{name}", exclusive=True
+        )
+
+    async def run(self, event: Message) -> None:
+        """Await the handler inside the worker, counting it if it completes."""
+        await self.func(self.node, event)
+        self.completed += 1
+
+    def stats(self) -> dict[str, int]:
+        """Counters for profiling, `cancelled` and `completed` only count workers.
+
+        Returns:
+            Events seen, handler calls, events dropped for good, worker runs
+            cancelled by a newer one and worker runs that completed.
+        """
+        return {
+            "seen": self.seen,
+            "calls": self.calls,
+            "dropped": self.seen - self.calls - (self.pending is not None),
+            "cancelled": self.cancelled,
+            "completed": self.completed,
+        }
+
+
+class _TrailingTimer(Timer):
+    """A timer that can be re-armed for a new deadline without a new task.
+
+    `set_timer` builds a Timer and an asyncio task per call; this keeps one task
+    per state that sleeps until `deadline` whenever it is armed.
+    """
+
+    def __init__(self, target: MessagePump, callback: Callable[[], Any]) -> None:
+        super().__init__(target, 0, name="throttle", callback=callback, pause=True)
+        self.deadline = 0.0
+
+    def schedule(self, deadline: float) -> None:
+        """Fire once at `deadline` (a `time.monotonic()` value)."""
+        self.deadline = deadline
+        self._active.set()
+
+    async def _run(self) -> None:
+        while True:
+            await self._active.wait()
+            remaining = self.deadline - time.monotonic()
+            if remaining > 0:
+                # the deadline may have moved while sleeping, so check again
+                await sleep(remaining)
+                continue
+            self._active.clear()
+            try:
+                await self._tick(next_timer=self.deadline, count=0)
+            except EventTargetGone:
+                break
+
+
+class Policy(ABC):
+    """Decides when a throttled handler may run.
+
+    Attributes:
+        trailing: Whether blocked events are kept (latest wins) and delivered later.
+    """
+
+    __slots__ = ()
+
+    trailing = True
+
+    @abstractmethod
+    def admit(self, state: _ThrottleState, now: float) -> bool:
+        """Whether an incoming event may run the handler right away.
+
+        Returns:
+            True to run the handler now.
+        """
+
+    def release(self, state: _ThrottleState, now: float) -> bool:
+        """Whether the pending event may run now that its deadline was reached.
+
+        Returns:
+            True to run the handler now, False to re-arm for a later deadline.
+        """
+        return self.admit(state, now)
+
+    @abstractmethod
+    def deadline(self, state: _ThrottleState) -> float:
+        """When the pending event should next be offered to `release`.
+
+        Returns:
+            A `time.monotonic()` deadline.
+        """
+
+    def schedule(self, state: _ThrottleState) -> None:
+        """Arrange for `state.flush` to run once the pending event is due."""
+        state.flush_at(self.deadline(state))
+
+
+class Leading(Policy):
+    """Run the first event, then drop everything for `delay` seconds."""
+
+    __slots__ = ("delay",)
+
+    trailing = False
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+
+    def admit(self, state: _ThrottleState, now: float) -> bool:
+        return now - state.last >= self.delay
+
+    def deadline(self, state: _ThrottleState) -> float:
+        return state.last + self.delay
+
+
+class LeadingTrailing(Leading):
+    """Run the first event, then the latest blocked one once `delay` has passed."""
+
+    __slots__ = ()
+
+    trailing = True
+
+
+class Trailing(Policy):
+    """Hold every event and run the latest one `delay` seconds after a burst starts."""
+
+    __slots__ = ("delay",)
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+
+    def admit(self, state: _ThrottleState, now: float) -> bool:
+        return False
+
+    def release(self, state: _ThrottleState, now: float) -> bool:
+        return True
+
+    def deadline(self, state: _ThrottleState) -> float:
+        return state.since + self.delay
+
+
+class FixedWindow(Policy):
+    """Allow `limit` calls per `window` seconds, the latest blocked one runs when it reopens."""
+
+    __slots__ = ("limit", "window")
+
+    def __init__(self, limit: int, window: float) -> None:
+        self.limit = limit
+        self.window = window
+
+    def admit(self, state: _ThrottleState, now: float) -> bool:
+        if now - state.opened >= self.window:
+            state.opened = now
+            state.count = 0
+        if state.count < self.limit:
+            state.count += 1
+            return True
+        return False
+
+    def deadline(self, state: _ThrottleState) -> float:
+        return state.opened + self.window
+
+
+class TokenBucket(Policy):
+    """Refill `rate` tokens per second up to `burst`, each call spends one."""
+
+    __slots__ = ("rate", "burst")
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        self.rate = rate
+        self.burst = burst
+
+    def admit(self, state: _ThrottleState, now: float) -> bool:
+        state.tokens = min(self.burst, state.tokens + (now - state.opened) * self.rate)
+        state.opened = now
+        if state.tokens >= 1:
+            state.tokens -= 1
+            return True
+        return False
+
+    def deadline(self, state: _ThrottleState) -> float:
+        return state.opened + (1 - state.tokens) / self.rate
+
+
+class PerFrame(LeadingTrailing):
+    """Run at most once per frame, the latest blocked event once the next one is due.
+
+    A frame is the period of the screen's update timer, `1 / MAX_FPS` seconds
+    (`TEXTUAL_FPS`, 60 by default), and no screen is painted more often than
+    that, so calls any closer together would only paint over each other.
+    """
+
+    __slots__ = ()
+
+    def __init__(self) -> None:
+        super().__init__(1 / constants.MAX_FPS)
+
+
+def throttle(
+    delay: float | None = None,
+    *,
+    policy: Policy | None = None,
+    per_frame: bool = False,
+    worker: bool = False,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Rate-limit a Textual message handler.
+
+    By default this is a leading-edge throttle with a trailing call: the first
+    event in a burst passes immediately, events within `delay` seconds are
+    blocked, and the last blocked event fires `delay` seconds after the last
+    allowed one. Pass a `policy` for other behaviours.
+
+    Args:
+        delay: Seconds between calls, shorthand for `policy=LeadingTrailing(delay)`.
+        policy: How events are admitted, held and released.
+        per_frame: Shorthand for `policy=PerFrame()`, capping calls at the frame rate.
+        worker: Run an async handler as an exclusive worker instead of awaiting it,
+            so a slow handler never holds up the widget's message queue. A newer
+            call cancels the run still in flight.
 
     Returns:
-        A decorator that wraps a Textual message handler (sync or async) with debounce logic.
+        A decorator that wraps a Textual message handler (sync or async).
+
+    Raises:
+        TypeError: If neither `delay`, `policy` nor `per_frame` was given, or
+            `worker` was asked for on a sync handler.
     """
+    if per_frame:
+        policy = PerFrame()
+    if policy is None:
+        if delay is None:
+            raise TypeError("throttle() needs a delay, a policy or per_frame=True")
+        policy = LeadingTrailing(delay)
 
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
-        attr_last = f"_deb_last_{func.__name__}"
-        attr_timer = f"_deb_timer_{func.__name__}"
+        attr = f"{STATE_PREFIX}{func.__name__}"
+        is_async = iscoroutinefunction(func)
+        if worker and not is_async:
+            raise TypeError(
+                f"throttle(worker=True) needs an async handler, got {func!r}"
+            )
+
+        def get_state(self: DOMNode) -> _ThrottleState:
+            state = self.__dict__.get(attr)
+            if state is None:
+                state = self.__dict__[attr] = _ThrottleState(self, func, policy, worker)
+            return state
+
+        if worker:
 
-        if iscoroutinefunction(func):
             @wraps(func)
-            async def wrapper(self: DOMNode, event: Message, *args, **kwargs) -> None:
-                now = time.monotonic()
-                last_passed = getattr(self, attr_last, 0.0)
-                trailing_timer = getattr(self, attr_timer, None)
-
-                if now - last_passed >= delay:
-                    # run func
-                    if trailing_timer is not None:
-                        trailing_timer.stop()
-                        setattr(self, attr_timer, None)
-                    setattr(self, attr_last, now)
-                    # not sure how workers are handled
-                    obj = func(self, event, *args, **kwargs)
-                    if isawaitable(obj):
-                        await obj
-                else:
-                    if trailing_timer is not None:
-                        trailing_timer.stop()
-
-                    captured = event
-
-                    async def trailing() -> None:
-                        setattr(self, attr_timer, None)
-                        setattr(self, attr_last, time.monotonic())
-                        await func(self, captured, *args, **kwargs)
-
-                    # Calculate remaining time until next allowed event
-                    time_since_last = now - last_passed
-                    remaining_delay = delay - time_since_last
-                    setattr(self, attr_timer, self.set_timer(remaining_delay, trailing))
-
-            return wrapper
+            def wrapper(self: DOMNode, event: Message) -> None:
+                state = get_state(self)
+                if state.offer(event):
+                    state.dispatch(event)
+
+        elif is_async:
+
+            @wraps(func)
+            async def wrapper(self: DOMNode, event: Message) -> None:
+                if get_state(self).offer(event):
+                    await func(self, event)
+
         else:
+
             @wraps(func)
-            def wrapper(self: DOMNode, event: Message, *args, **kwargs) -> None:
-                now = time.monotonic()
-                last_passed = getattr(self, attr_last, 0.0)
-                trailing_timer = getattr(self, attr_timer, None)
-
-                if now - last_passed >= delay:
-                    # run func
-                    if trailing_timer is not None:
-                        trailing_timer.stop()
-                        setattr(self, attr_timer, None)
-                    setattr(self, attr_last, now)
-                    func(self, event, *args, **kwargs)
-                else:
-                    if trailing_timer is not None:
-                        trailing_timer.stop()
-
-                    captured = event
-
-                    def trailing() -> None:
-                        setattr(self, attr_timer, None)
-                        setattr(self, attr_last, time.monotonic())
-                        func(self, captured, *args, **kwargs)
-
-                    # Calculate remaining time until next allowed event
-                    time_since_last = now - last_passed
-                    remaining_delay = delay - time_since_last
-                    setattr(self, attr_timer, self.set_timer(remaining_delay, trailing))
-
-            return wrapper
+            def wrapper(self: DOMNode, event: Message) -> None:
+                if get_state(self).offer(event):
+                    func(self, event)
+
+        return wrapper
 
     return decorator
+
+
+def throttle_stats(node: DOMNode) -> dict[str, dict[str, int]]:
+    """Profiling counters for every throttled handler that has seen an event on `node`.
+
+    Returns:
+        A mapping of handler name to its `_ThrottleState.stats()`.
+    """
+    return {
+        name.removeprefix(STATE_PREFIX): state.stats()
+        for name, state in node.__dict__.items()
+        if name.startswith(STATE_PREFIX) and isinstance(state, _ThrottleState)
+    }
@@ -1,3 +1,4 @@
+import asyncio
 import datetime
 
 from textual import events
@@ -5,9 +6,58 @@ from textual.app import App, ComposeResult
 from textual.widget import Widget
 from textual.widgets import Footer, Label, RichLog
 
-from throttle import throttle
+from stats import RateMeter, count
+from throttle import (
+    FixedWindow,
+    Leading,
+    LeadingTrailing,
+    PerFrame,
+    Policy,
+    TokenBucket,
+    Trailing,
+    throttle,
+)
 
 THROTTLE_DELAY = 0.1
+SHOW_STATS = False
+WORKER = False
+SLOW = 0.0  # seconds of fake work per handler call
+
+POLICIES: dict[str, Policy] = {
+    "leading": Leading(THROTTLE_DELAY),
+    "trailing": Trailing(THROTTLE_DELAY),
+    "both": LeadingTrailing(THROTTLE_DELAY),
+    "window": FixedWindow(3, THROTTLE_DELAY * 3),
+    "bucket": TokenBucket(1 / THROTTLE_DELAY, burst=3),
+    "frame": PerFrame(),
+}
+POLICY = "both"
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Throttled MouseMove handler")
+    parser.add_argument(
+        "--policy", choices=POLICIES, default=POLICY, help="Rate limiting policy"
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Show events, calls, timers and tasks per second",
+    )
+    parser.add_argument(
+        "--worker",
+        action="store_true",
+        help="Run the handler as an exclusive worker instead of awaiting it",
+    )
+    parser.add_argument(
+        "--slow", type=float, default=SLOW, help="Seconds of fake work per call"
+    )
+    args = parser.parse_args()
+    POLICY = args.policy
+    SHOW_STATS = args.stats
+    WORKER = args.worker
+    SLOW = args.slow
 
 
 class MouseArea(Widget):
@@ -19,8 +69,12 @@ class MouseArea(Widget):
     }
     """
 
-    @throttle(THROTTLE_DELAY)
+    @count("events")
+    @throttle(policy=POLICIES[POLICY], worker=WORKER)
+    @count("calls")
     async def on_mouse_move(self, event: events.MouseMove) -> None:
+        if SLOW:
+            await asyncio.sleep(SLOW)
         ts = datetime.datetime.now().strftime("%H:%M:%S.%f")[:-3]
         self.app.query_one(RichLog).write(
             f"[dim]{ts}[/]  [yellow]MouseMove[/]  "
@@ -41,10 +95,12 @@ class Apple(App):
 
     def compose(self) -> ComposeResult:
         yield Label(
-            f"move your mouse in the area below - events debounced to {THROTTLE_DELAY * 1000:.0f} ms "
+            f"move your mouse in the area below - events throttled to {THROTTLE_DELAY * 1000:.0f} ms ({POLICY})"
         )
-        yield MouseArea()
+        yield (mouse_area := MouseArea())
         yield RichLog(highlight=True, markup=True)
+        if SHOW_STATS:
+            yield RateMeter(mouse_area)
         yield Footer()
 
 